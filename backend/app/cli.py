@@ -0,0 +1,103 @@
+"""
+Maintenance commands. Run from the backend directory:
+
+    python -m app.cli migrate
+    python -m app.cli rebuild-aggregates
+    python -m app.cli replay-ratings --period-days 7
+    python -m app.cli rebuild-search
+"""
+
+import argparse
+import time
+
+from app.core.database import SessionLocal, init_engines
+from app.models.search import rebuild_search_index
+from app.services.standings import rebuild_aggregates
+
+
+def migrate_command(args: argparse.Namespace) -> None:
+    # Alembic is only needed here
+    from app.core.migrations import BASELINE_REVISION, upgrade_database
+
+    engine, _ = init_engines()
+    result = upgrade_database(engine)
+    if result.stamped:
+        print(f"Marked the existing database as revision {result.before}")
+    if result.before == result.after:
+        print(f"Database at revision {result.after}, nothing to migrate")
+    else:
+        print(f"Migrated the database from {result.before or 'empty'} to revision {result.after}")
+    if result.before == BASELINE_REVISION and result.after != BASELINE_REVISION:
+        print(
+            "Standings, player stats and ratings start empty: run rebuild-aggregates "
+            "and replay-ratings to compute them from the matches already played"
+        )
+
+
+def rebuild_aggregates_command(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        standings, player_stats = rebuild_aggregates(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt {standings} standings rows and {player_stats} player stats rows")
+
+
+def replay_ratings_command(args: argparse.Namespace) -> None:
+    # Keep NumPy out of the other commands' startup
+    from app.services.rating_replay import replay_ratings
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        count = replay_ratings(db, args.period_days)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Replayed {count} ratings in {time.perf_counter() - started:.1f}s")
+
+
+def rebuild_search_command(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    engine, _ = init_engines()
+    with engine.begin() as connection:
+        rebuild_search_index(connection)
+    print(f"Rebuilt the search index in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tournament API maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser(
+        "migrate", help="create the database or bring its schema up to date"
+    )
+    migrate.set_defaults(run=migrate_command)
+
+    rebuild = commands.add_parser(
+        "rebuild-aggregates",
+        help="recompute standings and player stats from the match history",
+    )
+    rebuild.set_defaults(run=rebuild_aggregates_command)
+
+    replay = commands.add_parser(
+        "replay-ratings", help="recompute every rating from the match history"
+    )
+    replay.add_argument(
+        "--period-days", type=float, default=7, help="length of a rating period"
+    )
+    replay.set_defaults(run=replay_ratings_command)
+
+    search = commands.add_parser(
+        "rebuild-search", help="refill the full-text search index from the tables"
+    )
+    search.set_defaults(run=rebuild_search_command)
+
+    args = parser.parse_args()
+    init_engines()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
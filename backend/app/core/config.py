@@ -0,0 +1,104 @@
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    """
+    Application settings, read from environment variables once at import.
+
+    Every value has a default suitable for local development with SQLite.
+    """
+
+    def __init__(self):
+        # Database
+        self.database_url = os.getenv("DATABASE_URL", "sqlite:///./tournament.db")
+        self.db_echo = _env_bool("DB_ECHO", False)
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.db_pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+        # Seconds before a pooled connection is replaced (-1 disables)
+        self.db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.db_pool_pre_ping = _env_bool("DB_POOL_PRE_PING", True)
+
+        # SQLite tuning, applied to every new connection
+        self.sqlite_wal = _env_bool("SQLITE_WAL", True)
+        self.sqlite_synchronous = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+        self.sqlite_busy_timeout_ms = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+        self.sqlite_mmap_size = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+        self.sqlite_cache_size_kib = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+
+        # Authenticated users are cached by id for this long, so most
+        # requests resolve the token without touching the database
+        self.user_cache_ttl_seconds = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+        self.user_cache_max_entries = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+        # Refresh tokens rotate on every use and expire after this many days
+        self.refresh_token_expire_days = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+        # Revoked access tokens the bloom filter is sized for before it is rebuilt
+        self.revocation_filter_capacity = int(
+            os.getenv("REVOCATION_FILTER_CAPACITY", "100000")
+        )
+        # Seconds between reads of tokens revoked by other workers
+        self.revocation_refresh_seconds = float(
+            os.getenv("REVOCATION_REFRESH_SECONDS", "30")
+        )
+
+        # Live updates: broker backend (see utils/broker.py) and the messages
+        # a subscriber may fall behind by before it is disconnected
+        self.event_broker = os.getenv("EVENT_BROKER", "memory")
+        self.event_queue_size = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+
+        # Deadline scheduler (services/scheduler.py): one worker at a time holds
+        # the lease and acts on registration deadlines, start dates and
+        # overdue matches. Timers are reloaded every poll interval, which
+        # must be well under the lease duration.
+        self.scheduler_enabled = _env_bool("SCHEDULER_ENABLED", True)
+        self.scheduler_poll_seconds = float(os.getenv("SCHEDULER_POLL_SECONDS", "30"))
+        self.scheduler_lease_seconds = float(os.getenv("SCHEDULER_LEASE_SECONDS", "90"))
+        # A pending match is flagged this long after its scheduled time
+        self.match_overdue_grace_minutes = float(
+            os.getenv("MATCH_OVERDUE_GRACE_MINUTES", "15")
+        )
+
+        # Largest upload accepted by the bulk participant import
+        self.bulk_import_max_bytes = int(
+            os.getenv("BULK_IMPORT_MAX_BYTES", str(16 * 1024 * 1024))
+        )
+
+        # Instrumentation (utils/instrumentation.py): per-request timings, query
+        # counts and DB time, exported as Prometheus histograms at /metrics
+        self.metrics_enabled = _env_bool("METRICS_ENABLED", True)
+        # Sampling profiler for requests sent with the PROFILE_HEADER header.
+        # It samples every thread of the worker, so only enable it on an
+        # instance you are investigating; profiles are written to PROFILE_DIR.
+        self.profiling_enabled = _env_bool("PROFILING_ENABLED", False)
+        self.profile_header = os.getenv("PROFILE_HEADER", "X-Profile")
+        self.profile_dir = os.getenv("PROFILE_DIR", "./profiles")
+        self.profile_interval_ms = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+
+        # Password hashing. The first scheme hashes new passwords; hashes in
+        # the others (or with other parameters) are upgraded on login.
+        # argon2 needs the argon2-cffi package.
+        self.password_schemes = [
+            scheme.strip()
+            for scheme in os.getenv("PASSWORD_SCHEMES", "bcrypt").split(",")
+            if scheme.strip()
+        ]
+        self.bcrypt_rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+        # Processes hashing passwords; 0 hashes on threads instead
+        self.password_hash_workers = int(
+            os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+        # Hashes queued or running at once before new logins wait their turn
+        self.password_hash_max_pending = int(
+            os.getenv("PASSWORD_HASH_MAX_PENDING", "64")
+        )
+
+
+settings = Settings()
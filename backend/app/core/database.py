@@ -1,21 +1,311 @@
-from sqlalchemy import create_engine
+from datetime import datetime, timezone
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, Table, bindparam, create_engine, event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.types import TypeDecorator
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./tournament.db"
+from app.core.config import Settings, settings
+
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+# INSERT constructs supporting ON CONFLICT, per backend
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+# Async drivers used for each backend by the async engine
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its async counterpart."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS[parsed.get_backend_name()]
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return make_url(url).database in (None, "", ":memory:")
+
+
+def engine_options(url: str, config: Settings = settings) -> dict:
+    """Keyword arguments for create_engine / create_async_engine."""
+    options = {"echo": config.db_echo, "pool_pre_ping": config.db_pool_pre_ping}
+
+    if is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+        # An in-memory database lives and dies with its connection, so it
+        # keeps SQLAlchemy's default single-connection pool
+        if _is_memory_sqlite(url):
+            return options
+
+    options.update(
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+    )
+    return options
+
+
+def apply_sqlite_pragmas(engine: Engine, config: Settings = settings) -> None:
+    """
+    Tune every new SQLite connection of `engine`.
+
+    WAL lets readers run alongside the single writer, busy_timeout makes a
+    writer wait for the lock instead of failing with "database is locked",
+    and synchronous=NORMAL is safe under WAL while avoiding an fsync per
+    commit.
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout = {config.sqlite_busy_timeout_ms}",
+        f"PRAGMA synchronous = {config.sqlite_synchronous}",
+        f"PRAGMA cache_size = -{config.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size = {config.sqlite_mmap_size}",
+    ]
+    if config.sqlite_wal:
+        pragmas.insert(0, "PRAGMA journal_mode = WAL")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, config: Settings = settings):
+    """Build the sync engine for `url` from settings."""
+    engine = create_engine(url, **engine_options(url, config))
+    if is_sqlite(url):
+        apply_sqlite_pragmas(engine, config)
+    return engine
+
+
+def create_async_db_engine(
+    url: str = SQLALCHEMY_DATABASE_URL, config: Settings = settings
+):
+    """Build the async engine for `url` (driver swapped for its async one)."""
+    async_url = to_async_url(url)
+    engine = create_async_engine(async_url, **engine_options(async_url, config))
+    if is_sqlite(url):
+        apply_sqlite_pragmas(engine.sync_engine, config)
+    return engine
+
+
+# The engines are created by init_engines() (the app's lifespan, the CLI),
+# not at import, so importing the app opens no database. The session
+# factories are bound to them then.
+engine: Optional[Engine] = None
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Async stack used by the read-heavy endpoints, so waiting on the database
+# does not hold a threadpool worker
+async_engine: Optional[AsyncEngine] = None
+
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def init_engines(
+    url: str = SQLALCHEMY_DATABASE_URL, config: Settings = settings
+) -> Tuple[Engine, AsyncEngine]:
+    """Create the sync and async engines and bind the session factories; idempotent."""
+    global engine, async_engine
+    if engine is None:
+        engine = create_db_engine(url, config)
+        async_engine = create_async_db_engine(url, config)
+        SessionLocal.configure(bind=engine)
+        AsyncSessionLocal.configure(bind=async_engine)
+    return engine, async_engine
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection; init_engines() creates new engines."""
+    global engine, async_engine
+    if engine is not None:
+        await async_engine.dispose()
+        engine.dispose()
+    engine = async_engine = None
 
 Base = declarative_base()
 
 
+class UTCDateTime(TypeDecorator):
+    """
+    DateTime(timezone=True) that converts aware values to UTC before they
+    are stored or compared. SQLite keeps no offset and would otherwise store
+    the wall-clock time of whatever zone the client sent. Naive values are
+    taken to be UTC already.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(timezone=True)
+
+    def process_bind_param(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def utc_timestamp(value: datetime) -> float:
+    """
+    POSIX timestamp of a UTCDateTime column value. PostgreSQL returns them
+    aware; SQLite returns them naive, and they are UTC because UTCDateTime
+    converted them before storing.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def bulk_insert(
+    db: Session, table: Table, rows: Sequence[Mapping[str, Any]], **constants: Any
+) -> None:
+    """
+    Insert many rows with a single driver-level executemany, in db's transaction.
+
+    Values shared by every row are passed as keyword arguments and converted
+    to their database form once. Per-row values only go through a type
+    conversion for columns that need one (enums, datetimes), which skips the
+    per-row parameter bookkeeping of a Core executemany. Every row must have
+    the same keys.
+    """
+    if not rows:
+        return
+
+    conn = db.connection()
+    dialect = conn.dialect
+
+    def processor(name):
+        return table.c[name].type.dialect_impl(dialect).bind_processor(dialect)
+
+    # Columns left out fall back to their scalar Python-side defaults, which
+    # a driver-level executemany would otherwise skip
+    row_names = list(rows[0].keys())
+    for column in table.columns:
+        default = column.default
+        if (
+            column.name not in constants
+            and column.name not in row_names
+            and default is not None
+            and default.is_scalar
+        ):
+            constants[column.name] = default.arg
+
+    fixed = {}
+    for name, value in constants.items():
+        process = processor(name)
+        fixed[name] = process(value) if process and value is not None else value
+
+    row_processors = [(name, processor(name)) for name in row_names]
+    if any(process is not None for _, process in row_processors):
+        rows = [dict(row) for row in rows]
+        for name, process in row_processors:
+            if process is None:
+                continue
+            for row in rows:
+                if row[name] is not None:
+                    row[name] = process(row[name])
+
+    compiled = (
+        insert(table)
+        .values({name: bindparam(name) for name in [*row_names, *constants]})
+        .compile(dialect=dialect)
+    )
+
+    if compiled.positional:
+        order = compiled.positiontup
+        params = [
+            tuple(row[name] if name in row else fixed[name] for name in order)
+            for row in rows
+        ]
+    else:
+        params = [{**row, **fixed} for row in rows]
+
+    conn.exec_driver_sql(compiled.string, params)
+
+
+def increment_rows(
+    db: Session,
+    table: Table,
+    key_columns: Sequence[str],
+    rows: Sequence[Mapping[str, Any]],
+) -> None:
+    """
+    Add each row's values to the existing row with the same key, inserting
+    rows that do not exist yet, in one executemany (INSERT ... ON CONFLICT
+    DO UPDATE). Every column of a row other than the keys is a counter. Keys
+    must be unique within `rows`.
+    """
+    if not rows:
+        return
+
+    statement = UPSERT_INSERTS[db.get_bind().dialect.name](table)
+    counters = [name for name in rows[0] if name not in key_columns]
+    statement = statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={name: table.c[name] + statement.excluded[name] for name in counters},
+    )
+    db.execute(statement, list(rows))
+
+
+def upsert_rows(
+    db: Session,
+    table: Table,
+    key_columns: Sequence[str],
+    rows: Sequence[Mapping[str, Any]],
+) -> None:
+    """
+    Insert rows, replacing the other columns of rows whose key already
+    exists, in one executemany. Keys must be unique within `rows`.
+    """
+    if not rows:
+        return
+
+    statement = UPSERT_INSERTS[db.get_bind().dialect.name](table)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={
+            name: statement.excluded[name] for name in rows[0] if name not in key_columns
+        },
+    )
+    db.execute(statement, list(rows))
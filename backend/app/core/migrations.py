@@ -0,0 +1,91 @@
+"""
+Running the schema migrations in backend/migrations.
+
+The app never creates or alters tables by itself; python -m app.cli migrate
+calls upgrade_database(). A database created by create_all() before
+migrations existed has tables but no alembic_version. If its schema is
+already the models' (create_all of this release) it is stamped with the
+latest revision and given the search index if it lacks it; otherwise it is
+taken to be the first release's schema, stamped with the baseline revision
+and upgraded from there.
+
+Only the CLI imports this module, so the API process never loads Alembic.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+import app.models  # noqa: F401  (registers every table)
+from app.core.database import Base
+from app.models.search import SEARCH_TABLE, TITLE_TABLE, install_search_index
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The first revision: the schema of the first release, built by create_all()
+BASELINE_REVISION = "0001"
+
+# FTS5 names its shadow tables after its own (search_index_data, ...); on
+# PostgreSQL the index is search_vector columns and their ix_*_search_vector
+SEARCH_OBJECTS = (SEARCH_TABLE, TITLE_TABLE, "search_vector")
+
+
+def _is_search_object(name: str) -> bool:
+    return name.startswith(SEARCH_OBJECTS) or name.endswith("_search_vector")
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Leave the search index, created by raw DDL, out of schema comparisons."""
+    return not (reflected and compare_to is None and _is_search_object(name))
+
+
+def alembic_config(connection: Connection) -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.attributes["connection"] = connection
+    # Leave the caller's logging alone
+    config.attributes["configure_logging"] = False
+    return config
+
+
+@dataclass
+class MigrationResult:
+    before: Optional[str]
+    after: Optional[str]
+    # The database predates migrations and was stamped with the revision
+    # its schema matched
+    stamped: bool = False
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def matches_models(connection: Connection) -> bool:
+    """Whether the database's tables are exactly those of the current models."""
+    context = MigrationContext.configure(connection, opts={"include_object": include_object})
+    return not compare_metadata(context, Base.metadata)
+
+
+def upgrade_database(engine: Engine) -> MigrationResult:
+    """Migrate the database behind `engine` to the latest revision, in one transaction."""
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        result = MigrationResult(current_revision(connection), None)
+        if result.before is None and inspect(connection).has_table("users"):
+            if matches_models(connection):
+                command.stamp(config, "head")
+                install_search_index(connection)
+            else:
+                command.stamp(config, BASELINE_REVISION)
+            result.before, result.stamped = current_revision(connection), True
+        command.upgrade(config, "head")
+        result.after = current_revision(connection)
+        return result
@@ -1,45 +1,144 @@
-from fastapi import FastAPI
+"""
+The API application.
+
+create_app() builds it without touching the database: the engines are
+created by the lifespan when a server starts, and the schema is managed
+by migrations (python -m app.cli migrate), never at import. `app` is the
+instance uvicorn serves (uvicorn app.main:app).
+"""
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core.database import engine, Base
+from app.core.config import settings
+from app.core.database import SessionLocal, dispose_engines, init_engines
+from app.utils.security import shutdown_password_hashing
+from app.utils.deps import revocation_store, user_cache
+from app.utils.revocation import load_revocations, poll_revocations
+from app.utils import metrics
+from app.utils.instrumentation import HISTOGRAMS, InstrumentationMiddleware, instrument_engines
+from app.utils.profiling import ProfilingMiddleware
+from app.services.bracket_view import bracket_cache
+from app.services.live import broker
+from app.services.scheduler import scheduler
 from app.routers.auth import router as auth_router
 from app.routers.user import router as user_router
 from app.routers.tournament import router as tournament_router
 from app.routers.match import router as match_router
+from app.routers.live import router as live_router
+from app.routers.leaderboard import router as leaderboard_router
+from app.routers.search import router as search_router
 
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="Gaming Tournament API",
-    description="API for managing gaming tournaments",
-    version="0.1.0",
-)
-
-# Allow frontend to make requests
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://192.168.68.69:5173",
-        "http://localhost:5173",
-        "http://192.168.68.69:8000/api",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    engine, async_engine = init_engines()
+    if settings.metrics_enabled:
+        instrument_engines(engine, async_engine.sync_engine)
+    db = SessionLocal()
+    try:
+        load_revocations(db, revocation_store)
+    finally:
+        db.close()
+    # Picks up tokens revoked through other workers
+    revocations = asyncio.create_task(
+        poll_revocations(SessionLocal, revocation_store, settings.revocation_refresh_seconds)
+    )
+    if settings.scheduler_enabled:
+        scheduler.start()
+    yield
+    revocations.cancel()
+    with suppress(asyncio.CancelledError):
+        await revocations
+    await scheduler.stop()
+    shutdown_password_hashing()
+    await dispose_engines()
 
-app.include_router(auth_router, prefix="/api")
-app.include_router(user_router, prefix="/api")
-app.include_router(tournament_router, prefix="/api")
-app.include_router(match_router, prefix="/api")
 
-
-@app.get("/")
 def root():
     return {"message": "Welcome to the Gaming Tournament API"}
 
 
-@app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+def cache_stats():
+    """Hit rates of this worker's in-memory caches."""
+    return {"users": user_cache.stats(), "brackets": bracket_cache.stats()}
+
+
+def scheduler_stats():
+    """Whether this worker runs the deadline scheduler, and its pending timers."""
+    return scheduler.stats()
+
+
+def prometheus_metrics():
+    """This worker's request histograms and cache, broker and scheduler stats."""
+    body = metrics.render(
+        [
+            *(histogram.render() for histogram in HISTOGRAMS),
+            metrics.gauges(
+                "cache",
+                "In-memory cache",
+                "cache",
+                {"users": user_cache.stats(), "brackets": bracket_cache.stats()},
+            ),
+            metrics.gauges(
+                "broker", "Live update broker", "broker", {settings.event_broker: broker.stats()}
+            ),
+            metrics.gauges(
+                "scheduler", "Deadline scheduler", "scheduler", {"deadlines": scheduler.stats()}
+            ),
+        ]
+    )
+    return Response(content=body, media_type=metrics.CONTENT_TYPE)
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="Gaming Tournament API",
+        description="API for managing gaming tournaments",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+
+    # Allow frontend to make requests
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://192.168.68.69:5173",
+            "http://localhost:5173",
+            "http://192.168.68.69:8000/api",
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Added last so they wrap CORS and time the whole request
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
+    if settings.metrics_enabled:
+        app.add_middleware(InstrumentationMiddleware)
+
+    app.include_router(auth_router, prefix="/api")
+    app.include_router(user_router, prefix="/api")
+    app.include_router(tournament_router, prefix="/api")
+    app.include_router(match_router, prefix="/api")
+    app.include_router(leaderboard_router, prefix="/api")
+    app.include_router(search_router, prefix="/api")
+    app.include_router(live_router)
+
+    app.get("/")(root)
+    app.get("/health")(health_check)
+    app.get("/health/caches")(cache_stats)
+    app.get("/health/scheduler")(scheduler_stats)
+    app.get("/metrics", include_in_schema=False)(prometheus_metrics)
+    return app
+
+
+app = create_app()
@@ -1,4 +1,10 @@
 from app.models.user import User
 from app.models.tournament import Tournament, TournamentStatus, TournamentFormat
 from app.models.participant import Participant
-from app.models.match import Match, MatchStatus
+from app.models.match import Match, MatchBracket, MatchStatus
+from app.models.token import RefreshToken, RevokedToken
+from app.models.stats import PlayerStats, Standing
+from app.models.rating import PlayerRating
+from app.models.swiss import SwissState
+from app.models.lease import Lease
+from app.models.search import install_search_index, rebuild_search_index
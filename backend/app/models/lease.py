@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String
+
+from app.core.database import Base, UTCDateTime
+
+
+class Lease(Base):
+    """
+    A named lock held by one worker process until it expires.
+
+    The holder renews it well before `expires_at`; any other worker may take
+    it over once it has expired (see services/scheduler.py).
+    """
+
+    __tablename__ = "leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(UTCDateTime, nullable=False)
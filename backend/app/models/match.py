@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Boolean, Enum
-from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, ForeignKey, Boolean, Enum, Index
+from sqlalchemy.sql import false, func
+from sqlalchemy.orm import joinedload, relationship
 import enum
+from typing import Optional
 
 
-from app.core.database import Base
+from app.core.database import Base, UTCDateTime
+from app.models.participant import Participant
+from app.models.user import User
 
 
 class MatchStatus(enum.Enum):
@@ -13,11 +16,22 @@ class MatchStatus(enum.Enum):
     COMPLETED = "completed"
 
 
+class MatchBracket(enum.Enum):
+    MAIN = "main"
+    LOSERS = "losers"
+    GRAND_FINAL = "grand_final"
+
+
 class Match(Base):
     __tablename__ = "matches"
+    # Scanned by the scheduler for pending matches past their time
+    __table_args__ = (
+        Index("ix_matches_status_overdue_scheduled_at", "status", "overdue", "scheduled_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tournament_id = Column(Integer, ForeignKey("tournaments.id"))
+    bracket = Column(Enum(MatchBracket), default=MatchBracket.MAIN, nullable=False)
     round = Column(Integer, nullable=False)
     match_number = Column(Integer, nullable=False)
     player1_id = Column(Integer, ForeignKey("participants.id"), nullable=True)
@@ -26,11 +40,36 @@ class Match(Base):
     player2_score = Column(Integer, nullable=True)
     winner_id = Column(Integer, ForeignKey("participants.id"), nullable=True)
     status = Column(Enum(MatchStatus), default=MatchStatus.PENDING)
-    scheduled_at = Column(DateTime(timezone=True), nullable=False)
-    completed_at = Column(DateTime(timezone=True))
+    scheduled_at = Column(UTCDateTime, nullable=False)
+    completed_at = Column(UTCDateTime)
+    # Set by the scheduler once a pending match is past scheduled_at (plus a
+    # grace period); cleared when the match is rescheduled
+    overdue = Column(Boolean, nullable=False, default=False, server_default=false())
+    # Where the winner / loser go next (slot 1 = player1, 2 = player2),
+    # precomputed when the bracket is generated
+    next_match_id = Column(Integer, ForeignKey("matches.id"), nullable=True)
+    next_match_slot = Column(Integer, nullable=True)
+    loser_next_match_id = Column(Integer, ForeignKey("matches.id"), nullable=True)
+    loser_next_match_slot = Column(Integer, nullable=True)
 
     # Relationships
     tournament = relationship("Tournament", back_populates="matches")
     player1 = relationship("Participant", foreign_keys=[player1_id])
     player2 = relationship("Participant", foreign_keys=[player2_id])
     winner = relationship("Participant", foreign_keys=[winner_id])
+
+    @property
+    def player1_name(self) -> Optional[str]:
+        return self.player1.display_name if self.player1 is not None else None
+
+    @property
+    def player2_name(self) -> Optional[str]:
+        return self.player2.display_name if self.player2 is not None else None
+
+
+def with_player_names():
+    """Loader options for MatchResponse, which embeds both players' display names."""
+    return tuple(
+        joinedload(player).joinedload(Participant.user).load_only(User.display_name)
+        for player in (Match.player1, Match.player2)
+    )
@@ -1,19 +1,32 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, Boolean, UniqueConstraint
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import joinedload, relationship
 
-from app.core.database import Base
+from app.core.database import Base, UTCDateTime
+from app.models.user import User
 
 
 class Participant(Base):
     __tablename__ = "participants"
+    __table_args__ = (
+        UniqueConstraint("tournament_id", "user_id", name="uq_participants_tournament_user"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     seed = Column(Integer, nullable=True)
     checked_in = Column(Boolean, default=False)
-    joined_at = Column(DateTime(timezone=True), server_default=func.now())
+    joined_at = Column(UTCDateTime, server_default=func.now())
 
     tournament = relationship("Tournament", back_populates="participants")
     user = relationship("User", back_populates="tournament_participations")
+
+    @property
+    def display_name(self) -> str:
+        return self.user.display_name
+
+
+def with_display_name():
+    """Loader option for responses embedding the display name: no extra query."""
+    return joinedload(Participant.user).load_only(User.display_name)
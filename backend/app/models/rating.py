@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey
+
+from app.core.database import Base
+
+
+class PlayerRating(Base):
+    """
+    A user's Glicko-2 rating in one game.
+
+    Updated by services/ratings.py as matches complete;
+    `python -m app.cli replay-ratings` recomputes it from the match history.
+    """
+
+    __tablename__ = "player_ratings"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    game = Column(String, primary_key=True)
+    rating = Column(Float, nullable=False)
+    rd = Column(Float, nullable=False)
+    volatility = Column(Float, nullable=False)
+    rated_matches = Column(Integer, nullable=False, default=0)
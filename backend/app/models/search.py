@@ -0,0 +1,219 @@
+"""
+Full-text search index over tournaments and users (services/search.py).
+
+SQLite: two contentless FTS5 tables hold the indexed words of both kinds.
+search_titles has a tournament's name or a user's display name, and
+search_index has those plus a tournament's game and description. A
+tournament is document id * 2 and a user id * 2 + 1, so one MATCH covers
+both kinds and a hit maps back to its row without a lookup table. The
+kind column holds "tournament" or "user" so a search can be narrowed to
+one kind inside the MATCH. Prefix indexes up to six characters let a prefix
+query read one doclist instead of merging every word it expands to.
+Contentless means no second copy of the text: hits are presented from the
+rows themselves.
+
+Triggers on tournaments and users keep both tables in step. The update
+triggers only fire when an indexed column changes, so the frequent version
+and count updates cost nothing.
+
+PostgreSQL: a tsvector column generated from the same columns, with the
+name or display name weighted A, and a GIN index, on each of the two
+tables. The database keeps a generated column in step, so no triggers are
+needed there.
+
+A migration creates the index from search_index_ddl().
+install_search_index() runs after every metadata.create_all() (the
+benchmarks' scratch databases) and is idempotent. Both fill the index from
+the existing rows when they create it.
+"""
+
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+
+from app.core.database import Base
+
+SEARCH_TABLE = "search_index"
+TITLE_TABLE = "search_titles"
+TOURNAMENT, USER = 0, 1
+
+_FTS_OPTIONS = """
+    content = '',
+    prefix = '2 3 4 5 6',
+    tokenize = 'unicode61 remove_diacritics 2'
+"""
+
+_SQLITE_TABLES = {
+    SEARCH_TABLE: f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+    f"kind, title, game, description, {_FTS_OPTIONS})",
+    TITLE_TABLE: f"CREATE VIRTUAL TABLE {TITLE_TABLE} USING fts5(kind, title, {_FTS_OPTIONS})",
+}
+
+# Per source table: the columns whose updates reindex a row, and the values
+# of search_index and of search_titles for a row of it
+_SOURCES = {
+    "tournaments": (
+        "name, game, description",
+        "'tournament', {row}.id * 2, {row}.name, {row}.game, {row}.description",
+        "'tournament', {row}.id * 2, {row}.name",
+    ),
+    "users": (
+        "display_name",
+        "'user', {row}.id * 2 + 1, {row}.display_name, NULL, NULL",
+        "'user', {row}.id * 2 + 1, {row}.display_name",
+    ),
+}
+_COLUMNS = {
+    SEARCH_TABLE: "kind, rowid, title, game, description",
+    TITLE_TABLE: "kind, rowid, title",
+}
+
+
+def _insert(table: str, values: str, delete: bool = False) -> str:
+    columns = _COLUMNS[table]
+    if delete:
+        # A contentless table is told the old values of a document to remove it
+        columns, values = f"{table}, {columns}", f"'delete', {values}"
+    return f"INSERT INTO {table} ({columns}) SELECT {values}"
+
+
+def _fill(source: str) -> list:
+    _, index_values, title_values = _SOURCES[source]
+    return [
+        f"{_insert(SEARCH_TABLE, index_values.format(row=source))} FROM {source}",
+        f"{_insert(TITLE_TABLE, title_values.format(row=source))} FROM {source}",
+    ]
+
+
+def _triggers(source: str) -> dict:
+    columns, index_values, title_values = _SOURCES[source]
+
+    def statements(row: str, delete: bool = False) -> str:
+        return (
+            f"{_insert(SEARCH_TABLE, index_values.format(row=row), delete)}; "
+            f"{_insert(TITLE_TABLE, title_values.format(row=row), delete)};"
+        )
+
+    add, remove = statements("new"), statements("old", delete=True)
+    return {
+        f"{source}_search_insert": f"AFTER INSERT ON {source} BEGIN {add} END",
+        f"{source}_search_update": (
+            f"AFTER UPDATE OF {columns} ON {source} BEGIN {remove} {add} END"
+        ),
+        f"{source}_search_delete": f"AFTER DELETE ON {source} BEGIN {remove} END",
+    }
+
+
+_SQLITE_TRIGGERS = {**_triggers("tournaments"), **_triggers("users")}
+
+# 'simple' skips stemming and stop words: names and games are not prose
+_POSTGRES_VECTORS = {
+    "tournaments": (
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(game, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+    ),
+    "users": "setweight(to_tsvector('simple', coalesce(display_name, '')), 'A')",
+}
+
+
+def _fill_sqlite(connection: Connection) -> None:
+    for source in _SOURCES:
+        for statement in _fill(source):
+            connection.exec_driver_sql(statement)
+
+
+def _install_sqlite(connection: Connection) -> None:
+    existing = {
+        name
+        for (name,) in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE name IN (?, ?)", tuple(_SQLITE_TABLES)
+        )
+    }
+    if len(existing) < len(_SQLITE_TABLES):
+        for name in existing:
+            connection.exec_driver_sql(f"DROP TABLE {name}")
+        for statement in _SQLITE_TABLES.values():
+            connection.exec_driver_sql(statement)
+        _fill_sqlite(connection)
+    for name, body in _SQLITE_TRIGGERS.items():
+        connection.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def _postgresql_statements() -> List[str]:
+    statements = []
+    for table, vector in _POSTGRES_VECTORS.items():
+        statements += [
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({vector}) STORED",
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+            f"ON {table} USING gin (search_vector)",
+        ]
+    return statements
+
+
+def _install_postgresql(connection: Connection) -> None:
+    for statement in _postgresql_statements():
+        connection.exec_driver_sql(statement)
+
+
+INSTALLERS = {
+    "sqlite": _install_sqlite,
+    "postgresql": _install_postgresql,
+}
+
+
+def search_index_ddl(dialect: str) -> List[str]:
+    """
+    The statements creating the search index in a database without one and
+    indexing its rows, for migrations, which may only render them.
+    """
+    if dialect == "sqlite":
+        return [
+            *_SQLITE_TABLES.values(),
+            *(statement for source in _SOURCES for statement in _fill(source)),
+            *(f"CREATE TRIGGER {name} {body}" for name, body in _SQLITE_TRIGGERS.items()),
+        ]
+    if dialect == "postgresql":
+        return _postgresql_statements()
+    return []
+
+
+def drop_search_index_ddl(dialect: str) -> List[str]:
+    """The statements removing the search index, triggers first on SQLite."""
+    if dialect == "sqlite":
+        return [
+            *(f"DROP TRIGGER IF EXISTS {name}" for name in _SQLITE_TRIGGERS),
+            *(f"DROP TABLE IF EXISTS {name}" for name in _SQLITE_TABLES),
+        ]
+    if dialect == "postgresql":
+        statements = []
+        for table in _POSTGRES_VECTORS:
+            statements += [
+                f"DROP INDEX IF EXISTS ix_{table}_search_vector",
+                f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector",
+            ]
+        return statements
+    return []
+
+
+def install_search_index(connection: Connection) -> None:
+    """Create the search index for this backend if it is missing."""
+    install = INSTALLERS.get(connection.dialect.name)
+    if install is not None:
+        install(connection)
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Refill the SQLite index from the rows; PostgreSQL's never drifts."""
+    install_search_index(connection)
+    if connection.dialect.name == "sqlite":
+        for name in _SQLITE_TABLES:
+            connection.exec_driver_sql(f"INSERT INTO {name} ({name}) VALUES ('delete-all')")
+        _fill_sqlite(connection)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(target, connection, **kw):
+    install_search_index(connection)
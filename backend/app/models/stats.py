@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+
+from app.core.database import Base
+
+
+class PlayerStats(Base):
+    """
+    A user's results in one game, across all tournaments.
+
+    Maintained incrementally by services/standings.py whenever a match
+    result changes; `python -m app.cli rebuild-aggregates` recomputes it.
+    """
+
+    __tablename__ = "player_stats"
+    # Leaderboard pages are a backward range scan of this index
+    __table_args__ = (
+        Index("ix_player_stats_leaderboard", "game", "points", "score_diff", "user_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    game = Column(String, primary_key=True)
+    played = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+    draws = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    score_for = Column(Integer, nullable=False, default=0)
+    score_against = Column(Integer, nullable=False, default=0)
+    score_diff = Column(Integer, nullable=False, default=0)
+
+
+class Standing(Base):
+    """A participant's record within one tournament, maintained like PlayerStats."""
+
+    __tablename__ = "standings"
+    __table_args__ = (
+        Index("ix_standings_table", "tournament_id", "points", "score_diff"),
+    )
+
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"), primary_key=True)
+    participant_id = Column(Integer, ForeignKey("participants.id"), primary_key=True)
+    played = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+    draws = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    score_for = Column(Integer, nullable=False, default=0)
+    score_against = Column(Integer, nullable=False, default=0)
+    score_diff = Column(Integer, nullable=False, default=0)
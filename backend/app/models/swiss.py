@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, ForeignKey, LargeBinary
+
+from app.core.database import Base
+
+
+class SwissState(Base):
+    """
+    Pairing history of a Swiss tournament, as packed numpy arrays.
+
+    Players are numbered by their index in `participant_ids` (seed order);
+    `opponents` and `sides` are (players, rounds) arrays, row-major. Written
+    by services/swiss.py each time a round is paired, so pairing the next
+    round never reads the match history. Scores come from the standings.
+    """
+
+    __tablename__ = "swiss_states"
+
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"), primary_key=True)
+    # Last round paired so far, out of `rounds`
+    round = Column(Integer, nullable=False)
+    rounds = Column(Integer, nullable=False)
+    # int32 participant ids
+    participant_ids = Column(LargeBinary, nullable=False)
+    # int32 opponent index per round, -1 for a bye or an unplayed round
+    opponents = Column(LargeBinary, nullable=False)
+    # int8 side per round: 1 = player1, -1 = player2, 0 = no game
+    sides = Column(LargeBinary, nullable=False)
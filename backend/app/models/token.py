@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base, UTCDateTime
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Only a SHA-256 of the token is stored
+    token_hash = Column(String, unique=True, index=True, nullable=False)
+    expires_at = Column(UTCDateTime, nullable=False)
+    revoked = Column(Boolean, default=False, nullable=False)
+    created_at = Column(UTCDateTime, server_default=func.now())
+
+    user = relationship("User")
+
+
+class RevokedToken(Base):
+    """Access tokens revoked before expiry, identified by their jti claim."""
+
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String, unique=True, index=True, nullable=False)
+    expires_at = Column(UTCDateTime, nullable=False, index=True)
@@ -1,14 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, UTCDateTime
 
 
 class TournamentStatus(enum.Enum):
     DRAFT = "draft"
     OPEN = "open"
+    # Past the registration deadline, waiting for the start date
+    REGISTRATION_CLOSED = "registration_closed"
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
@@ -18,10 +20,25 @@ class TournamentFormat(enum.Enum):
     SINGLE_ELIMINATION = "single_elimination"
     DOUBLE_ELIMINATION = "double_elimination"
     ROUND_ROBIN = "round_robin"
+    SWISS = "swiss"
 
 
 class Tournament(Base):
     __tablename__ = "tournaments"
+    # Composite indexes backing the keyset-paginated listing: every filter
+    # column is followed by the (start_date, id) sort key so a filtered page
+    # is a single index range scan.
+    __table_args__ = (
+        Index("ix_tournaments_start_date_id", "start_date", "id"),
+        Index("ix_tournaments_game_start_date_id", "game", "start_date", "id"),
+        Index("ix_tournaments_status_start_date_id", "status", "start_date", "id"),
+        Index("ix_tournaments_format_start_date_id", "format", "start_date", "id"),
+        # Deadline scans of the scheduler (services/deadlines.py); auto-start
+        # uses the status/start_date index above
+        Index(
+            "ix_tournaments_status_registration_deadline", "status", "registration_deadline"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -29,11 +46,19 @@ class Tournament(Base):
     game = Column(String, nullable=False)
     format = Column(Enum(TournamentFormat), default=TournamentFormat.SINGLE_ELIMINATION)
     max_participants = Column(Integer, default=16)
+    # Number of rounds of a Swiss tournament; null means ceil(log2(participants))
+    rounds = Column(Integer, nullable=True)
+    # Denormalized count of participants, kept in step by services/registration.py
+    participant_count = Column(Integer, nullable=False, default=0, server_default="0")
     status = Column(Enum(TournamentStatus), default=TournamentStatus.DRAFT)
     organizer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    registration_deadline = Column(DateTime(timezone=True), nullable=False)
-    start_date = Column(DateTime(timezone=True), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    registration_deadline = Column(UTCDateTime, nullable=False)
+    start_date = Column(UTCDateTime, nullable=False)
+    created_at = Column(UTCDateTime, server_default=func.now())
+    # Bumped by every write to the tournament, its matches or participants
+    # (services/versioning.py); read endpoints derive their ETag from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(UTCDateTime, server_default=func.now())
 
     # Relationships
     organizer = relationship("User", back_populates="tournaments_organized")
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
-from app.core.database import Base
+from app.core.database import Base, UTCDateTime
 
 
 class User(Base):
@@ -14,7 +14,9 @@ class User(Base):
     display_name = Column(String, index=True, nullable=False)
     avatar_url = Column(String, nullable=True)
     bio = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(UTCDateTime, server_default=func.now())
+    # Bumped on every profile change; the ETag of GET /users/{id}
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     tournaments_organized = relationship("Tournament", back_populates="organizer")
@@ -1,13 +1,25 @@
+from datetime import datetime, timezone
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.utils.security import verify_password, get_password_hash, create_access_token
-from app.utils.deps import get_current_user
+from app.core.database import get_async_db
+from app.utils.security import (
+    create_access_token,
+    create_refresh_token,
+    hash_password_async,
+    hash_refresh_token,
+    verify_password_async,
+)
+from app.utils.deps import get_current_user, get_token_payload, revocation_store
 from app.models.user import User
+from app.models.token import RefreshToken, RevokedToken
 from app.schemas.user import UserCreate, UserResponse
-from app.schemas.auth import AuthResponse
+from app.schemas.auth import AuthResponse, LogoutRequest, RefreshRequest
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -15,7 +27,7 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user account.
 
@@ -23,9 +35,9 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     - **display_name**: Must be unique across all users
     - **password**: Will be securely hashed before storage
     """
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
-    existing_user = (
-        db.query(User).filter(User.display_name == user_data.display_name).first()
+    existing_email = await db.scalar(select(User).where(User.email == user_data.email))
+    existing_user = await db.scalar(
+        select(User).where(User.display_name == user_data.display_name)
     )
 
     if existing_email:
@@ -39,7 +51,10 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST, detail="Display name already taken"
         )
 
-    hashed_password = get_password_hash(user_data.password)
+    # Give the connection back to the pool while the password is hashed
+    # in the worker pool, so a registration burst cannot exhaust it
+    await db.close()
+    hashed_password = await hash_password_async(user_data.password)
 
     # create user
     new_user = User(
@@ -48,29 +63,140 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         password_hash=hashed_password,
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent registration took the email while the password hashed
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already has an account",
+        )
+    await db.refresh(new_user)
     return new_user
 
 
+async def _issue_tokens(db: AsyncSession, user_id: int) -> dict:
+    """Store a new refresh token for the user and commit; returns the token pair."""
+    refresh_token, token_hash, expires_at = create_refresh_token()
+    db.add(RefreshToken(user_id=user_id, token_hash=token_hash, expires_at=expires_at))
+    await db.commit()
+
+    return {
+        "access_token": create_access_token(data={"sub": str(user_id)}),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
 @router.post("/login", response_model=AuthResponse)
-def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Authenticate user and return access token.
+    Authenticate user and return an access token and a refresh token.
     Uses OAuth2 password flow - 'username' field contains the email.
     """
 
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    # Release the connection during the (slow) hash check; user stays loaded
+    await db.close()
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_password_async(
+            form_data.password, user.password_hash
+        )
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(data={"sub": user.email})
+    # Hashing settings changed since this password was stored: upgrade it
+    if new_hash is not None:
+        await db.execute(
+            update(User).where(User.id == user.id).values(password_hash=new_hash)
+        )
+
+    return await _issue_tokens(db, user.id)
+
+
+@router.post("/refresh", response_model=AuthResponse)
+async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    The old refresh token stops working; presenting it again revokes every
+    refresh token of the user.
+
+    - **refresh_token**: Token from login or the previous refresh
+    """
+    invalid_token = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    stored = await db.scalar(
+        select(RefreshToken).where(
+            RefreshToken.token_hash == hash_refresh_token(body.refresh_token),
+            RefreshToken.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    if stored is None:
+        raise invalid_token
+
+    # Claim the token with a conditional update so two requests racing
+    # with the same token cannot both rotate it
+    claimed = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == stored.id, RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+    )
+    if claimed.rowcount == 0:
+        # A rotated token was replayed, so it may have been stolen
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == stored.user_id)
+            .values(revoked=True)
+        )
+        await db.commit()
+        raise invalid_token
+
+    return await _issue_tokens(db, stored.user_id)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: Optional[LogoutRequest] = None,
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Revoke the access token used for this request.
+    Requires authentication.
+
+    - **refresh_token**: Optional refresh token to revoke as well
+    """
+    jti = payload.get("jti")
+    if jti is not None:
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+        db.add(RevokedToken(jti=jti, expires_at=expires_at))
+
+    if body is not None and body.refresh_token is not None:
+        await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == hash_refresh_token(body.refresh_token),
+                RefreshToken.user_id == int(payload["sub"]),
+            )
+            .values(revoked=True)
+        )
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    await db.commit()
+    # Only once the revocation is durable
+    if jti is not None:
+        revocation_store.add(jti, payload["exp"])
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.database import get_async_db
+from app.models.stats import PlayerStats
+from app.models.user import User
+from app.schemas.stats import LeaderboardPage
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_int_cursor,
+    encode_int_cursor,
+)
+
+router = APIRouter(prefix="/leaderboards", tags=["Leaderboards"])
+
+
+# Get the leaderboard of a game
+@router.get("/{game}", response_model=LeaderboardPage)
+async def get_leaderboard(
+    game: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get a page of the players of a game, best first.
+
+    No authentication required. Ranked by points, then score difference.
+
+    - **cursor**: The `next_cursor` from the previous page
+    - **limit**: Page size (max 100)
+    """
+    query = (
+        select(*PlayerStats.__table__.columns, User.display_name)
+        .join(User, User.id == PlayerStats.user_id)
+        .where(PlayerStats.game == game)
+    )
+
+    # Keyset pagination over the leaderboard index, walked backwards
+    after = decode_int_cursor(cursor, 3)
+    if after is not None:
+        query = query.where(
+            tuple_(PlayerStats.points, PlayerStats.score_diff, PlayerStats.user_id)
+            < after
+        )
+
+    result = await db.execute(
+        query.order_by(
+            PlayerStats.points.desc(),
+            PlayerStats.score_diff.desc(),
+            PlayerStats.user_id.desc(),
+        ).limit(limit + 1)
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_int_cursor(last.points, last.score_diff, last.user_id)
+
+    return {"items": rows, "next_cursor": next_cursor}
@@ -0,0 +1,61 @@
+import asyncio
+
+from fastapi import APIRouter, WebSocket, status
+
+from app.core.database import AsyncSessionLocal
+from app.models.tournament import Tournament
+from app.services.live import broker, tournament_channel
+from app.utils.broker import Subscription
+
+router = APIRouter(prefix="/ws", tags=["Live"])
+
+
+async def _forward(websocket: WebSocket, subscription: Subscription) -> None:
+    async for message in subscription:
+        await websocket.send_text(message)
+    # Only reached when the broker dropped this slow subscriber
+    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # Client messages are ignored; receiving is how a disconnect is noticed
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+# Websocket tournament {id}: live match and participant updates
+@router.websocket("/tournaments/{tournament_id}")
+async def tournament_updates(websocket: WebSocket, tournament_id: int):
+    """
+    Push updates of a tournament as they are committed.
+
+    No authentication required. Each message is a JSON object with a `type`:
+
+    - `matches`: the changed fields of each changed match
+    - `participant_joined`: the new participant, with their display name
+    - `participant_left`: the `user_id` of the player who left
+    - `participants_imported`: how many players a CSV import `added`
+    - `round_paired`: the number of the Swiss `round` just paired
+    - `bracket_created`: the bracket was (re)generated
+
+    A client that cannot keep up is closed with code 1013 and should
+    reconnect and refetch.
+    """
+    # A short-lived session, so idle spectators do not hold pool connections
+    async with AsyncSessionLocal() as db:
+        exists = await db.get(Tournament, tournament_id) is not None
+    if not exists:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    async with broker.subscribe(tournament_channel(tournament_id)) as subscription:
+        tasks = {
+            asyncio.create_task(_forward(websocket, subscription)),
+            asyncio.create_task(_wait_for_disconnect(websocket)),
+        }
+        _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
@@ -1,32 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.utils.deps import get_current_user
 from app.models.user import User
-from app.models.match import Match
+from app.models.match import Match, with_player_names
 from app.models.tournament import Tournament
 from app.schemas.match import MatchResponse, MatchUpdate
+from app.services.advancement import AdvancementError, advance, placements
+from app.services.live import publish_match_changes, publish_round_paired
+from app.services.ratings import record_ratings
+from app.services.standings import record_results, snapshot
+from app.services.swiss import advance_round
+from app.services.versioning import bump_version
+from app.utils.conditional import Validators
 
 router = APIRouter(prefix="/matches", tags=["Matches"])
 
 
 @router.get("/{match_id}", response_model=MatchResponse)
-def get_match(match_id: int, db: Session = Depends(get_db)):
+async def get_match(
+    match_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get match details of a specific match by ID
 
-    Does not require authentication
+    Does not require authentication. Sends an ETag; repeat the request with
+    If-None-Match to get 304 Not Modified while the tournament is unchanged.
     """
+    # The match, its players' names and its tournament's version in one query
+    row = (
+        await db.execute(
+            select(Match, Tournament.version, Tournament.updated_at)
+            .join(Tournament, Tournament.id == Match.tournament_id)
+            .where(Match.id == match_id)
+            .options(*with_player_names())
+        )
+    ).first()
 
-    db_match = db.query(Match).filter(Match.id == match_id).first()
-
-    if db_match is None:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Match not found"
         )
 
-    return db_match
+    validators = Validators.for_version("m", match_id, row.version, row.updated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+
+    return row.Match
 
 
 @router.put("/{match_id}", response_model=MatchResponse)
@@ -39,7 +66,9 @@ def update_match(
     """
     Update match details of a specific match ID
 
-    Require authentication
+    Require authentication. Completing a match with a winner moves the
+    winner (and loser, in double elimination) into their next matches;
+    completing the last match of a Swiss round pairs the next round.
     """
 
     match = db.query(Match).filter(Match.id == match_id).first()
@@ -58,11 +87,41 @@ def update_match(
         )
 
     update_data = match_update.model_dump(exclude_unset=True)
+    if "scheduled_at" in update_data:
+        # Rescheduled: the scheduler checks the new time again
+        update_data["overdue"] = False
+    before = snapshot(match)
 
     for field, value in update_data.items():
         setattr(match, field, value)
 
+    try:
+        advance(db, match)
+    except AdvancementError as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    # The session does not autoflush, and advance_round counts the round's
+    # unfinished matches in SQL: this one must already read as completed
+    db.flush()
+
+    record_results(db, tournament, [(before, match)])
+    record_ratings(db, tournament, [(before, match)])
+    paired_round = advance_round(db, tournament)
+
+    bump_version(db, match.tournament_id)
     db.commit()
-    db.refresh(match)
+    match = db.scalars(
+        select(Match).where(Match.id == match_id).options(*with_player_names())
+    ).one()
+    publish_match_changes(
+        match.tournament_id,
+        [{"id": match.id, **update_data}]
+        + [
+            {"id": next_id, f"player{slot}_id": participant_id}
+            for next_id, slot, participant_id in placements(match)
+        ],
+    )
+    if paired_round is not None:
+        publish_round_paired(match.tournament_id, paired_round)
 
     return match
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.database import get_async_db
+from app.schemas.search import SearchKind, SearchPage
+from app.services.search import search as run_search
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_int_cursor,
+    encode_int_cursor,
+)
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+# Search tournaments and players by name
+@router.get("", response_model=SearchPage)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[SearchKind] = Query(None, alias="type"),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Search tournaments (name, game, description) and players (display name).
+
+    No authentication required. Every word of `q` must match, as the start
+    of a word ("sum cup" finds "Summer Cup"). Hits whose name holds every
+    word come first, then the rest; newest first within each.
+
+    - **type**: Optional `tournament` or `user` to search only one kind
+    - **cursor**: The `next_cursor` from the previous page
+    - **limit**: Page size (max 100)
+    """
+    after = decode_int_cursor(cursor, 2)
+
+    # Fetch one extra hit to know whether another page exists
+    hits = await run_search(db, q, kind, after, limit + 1)
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_int_cursor(hits[-1]["tier"], hits[-1]["document"])
+
+    return {"items": hits, "next_cursor": next_cursor}
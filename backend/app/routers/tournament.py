@@ -1,25 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import codecs
+from datetime import datetime
+from operator import itemgetter
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
 from app.utils.deps import get_current_user
 from app.models.user import User
 from app.models.tournament import Tournament
-from app.models.participant import Participant
+from app.models.participant import Participant, with_display_name
 from app.models.match import Match
-from app.schemas.match import MatchResponse
+from app.models.stats import Standing
+from app.schemas.match import MatchBatchItem, MatchBatchResult, MatchResponse
 from app.schemas.tournament import (
     TournamentCreate,
+    TournamentFormat,
+    TournamentPage,
     TournamentResponse,
     TournamentStatus,
     TournamentUpdate,
+    SeedingMethod,
+)
+from app.schemas.participant import ParticipantImportResult, ParticipantResponse
+from app.schemas.bracket import BracketResponse
+from app.schemas.stats import StandingResponse
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+)
+from app.utils.conditional import Validators
+from app.utils.serialization import RowSerializer, dumps, json_response
+from app.utils.streaming import ndjson_response
+from app.services.tournament_start import start_tournament as generate_bracket
+from app.services.bracket_view import get_bracket_json
+from app.services.match_results import apply_results
+from app.services.swiss import advance_round
+from app.services.versioning import bump_version, tournament_validators
+from app.services.live import (
+    publish_bracket_created,
+    publish_match_changes,
+    publish_participant_joined,
+    publish_participant_left,
+    publish_participants_imported,
+    publish_round_paired,
+)
+from app.services.participant_import import (
+    CsvRecords,
+    ImportConflictError,
+    ImportResult,
+    ImportRow,
+    import_participants as add_participants,
+    json_records,
+)
+from app.services.registration import (
+    NotParticipantError,
+    RegistrationError,
+    TournamentNotFoundError,
+    join_tournament as add_participant,
+    leave_tournament as remove_participant,
 )
-from app.schemas.participant import ParticipantResponse
 
 
 router = APIRouter(prefix="/tournaments", tags=["Tournaments"])
 
+# List endpoints encode column rows straight to JSON (see utils/serialization.py).
+# Display names are joined in, so a list costs one query whatever its length.
+tournament_rows = RowSerializer(TournamentResponse, Tournament.__table__)
+
+_matches, _participants, _users = Match.__table__, Participant.__table__, User.__table__
+_player1, _player2 = _participants.alias("player1"), _participants.alias("player2")
+_user1, _user2 = _users.alias("user1"), _users.alias("user2")
+match_rows = RowSerializer(
+    MatchResponse,
+    _matches,
+    columns={
+        "player1_name": _user1.c.display_name,
+        "player2_name": _user2.c.display_name,
+    },
+    from_clause=_matches.outerjoin(_player1, _player1.c.id == _matches.c.player1_id)
+    .outerjoin(_user1, _user1.c.id == _player1.c.user_id)
+    .outerjoin(_player2, _player2.c.id == _matches.c.player2_id)
+    .outerjoin(_user2, _user2.c.id == _player2.c.user_id),
+)
+participant_rows = RowSerializer(
+    ParticipantResponse,
+    _participants,
+    columns={"display_name": _users.c.display_name},
+    from_clause=_participants.join(_users, _users.c.id == _participants.c.user_id),
+)
+
 
 # Post tournament (create)
 @router.post(
@@ -42,6 +119,7 @@ def create_tournament(
         game=tournament_data.game,
         format=tournament_data.format,
         max_participants=tournament_data.max_participants,
+        rounds=tournament_data.rounds,
         registration_deadline=tournament_data.registration_deadline,
         start_date=tournament_data.start_date,
         organizer_id=current_user.id,
@@ -54,34 +132,97 @@ def create_tournament(
     return new_tournament
 
 
-# Get tournaments (list all tournaments)
-@router.get("/", response_model=List[TournamentResponse])
-def get_tournaments(db: Session = Depends(get_db)):
+# Get tournaments (paginated, filtered list of tournaments)
+@router.get("/", response_model=TournamentPage)
+async def get_tournaments(
+    game: Optional[str] = None,
+    tournament_status: Optional[TournamentStatus] = Query(None, alias="status"),
+    tournament_format: Optional[TournamentFormat] = Query(None, alias="format"),
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Get a list of all tournaments.
+    Get a page of tournaments ordered by start date.
 
     No authentication required.
+
+    - **game** / **status** / **format**: Optional exact-match filters
+    - **start_from** / **start_to**: Optional start date range (inclusive)
+    - **cursor**: The `next_cursor` from the previous page
+    - **limit**: Page size (max 100)
     """
-    tournaments = db.query(Tournament).all()
+    query = tournament_rows.select()
+
+    if game is not None:
+        query = query.where(Tournament.game == game)
+    if tournament_status is not None:
+        query = query.where(Tournament.status == tournament_status)
+    if tournament_format is not None:
+        query = query.where(Tournament.format == tournament_format)
+    if start_from is not None:
+        query = query.where(Tournament.start_date >= start_from)
+    if start_to is not None:
+        query = query.where(Tournament.start_date <= start_to)
+
+    # Keyset pagination: continue strictly after the last (start_date, id) seen,
+    # so every page is an index range scan no matter how deep the client goes.
+    after = decode_cursor(cursor)
+    if after is not None:
+        after_start, after_id = after
+        query = query.where(
+            tuple_(Tournament.start_date, Tournament.id) > (after_start, after_id)
+        )
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(
+        query.order_by(Tournament.start_date, Tournament.id).limit(limit + 1)
+    )
+    tournaments = result.all()
+
+    next_cursor = None
+    if len(tournaments) > limit:
+        tournaments = tournaments[:limit]
+        last = tournaments[-1]
+        next_cursor = encode_cursor(last.start_date, last.id)
 
-    return tournaments
+    return json_response(
+        dumps(
+            {"items": tournament_rows.to_dicts(tournaments), "next_cursor": next_cursor}
+        )
+    )
 
 
 # Get tournament {id} details
 @router.get("/{tournament_id}", response_model=TournamentResponse)
-def get_tournament_id(tournament_id: int, db: Session = Depends(get_db)):
+async def get_tournament_id(
+    tournament_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get details of a specific tournament by ID.
 
-    No authentication required.
+    No authentication required. Sends ETag and Last-Modified; conditional
+    requests get 304 Not Modified while the tournament is unchanged.
     """
-    db_tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+    db_tournament = await db.get(Tournament, tournament_id)
 
     if db_tournament is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
         )
 
+    validators = Validators.for_version(
+        "t", tournament_id, db_tournament.version, db_tournament.updated_at
+    )
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+
     return db_tournament
 
 
@@ -117,6 +258,7 @@ def update_tournament(
 
     for field, value in update_data.items():
         setattr(current_tournament, field, value)
+    bump_version(db, tournament_id)
 
     # Save to database
     db.commit()
@@ -172,52 +314,119 @@ def join_tournament(
     Join a tournament as a participant.
 
     Requires authentication. Users cannot join the same tournament twice.
+    Capacity is enforced by the database, so concurrent joins never overfill
+    a tournament.
     """
-    tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
-    if tournament is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
-        )
+    try:
+        new_participant = add_participant(db, tournament_id, current_user.id)
+    except TournamentNotFoundError as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except RegistrationError as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    participant_id = new_participant.id
+    db.commit()
+    new_participant = db.scalars(
+        select(Participant)
+        .where(Participant.id == participant_id)
+        .options(with_display_name())
+    ).one()
+    publish_participant_joined(new_participant)
+
+    return new_participant
+
 
-    if tournament.status != TournamentStatus.OPEN:
+async def _read_import(request: Request, result: ImportResult) -> List[ImportRow]:
+    # CSV is parsed as it arrives; JSON needs the whole array first
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in ("text/csv", "application/json"):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Tournament is not open for registration",
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload text/csv or application/json",
         )
 
-    # Check if tournament has full participation
+    records = CsvRecords(result) if content_type == "text/csv" else None
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    body = bytearray()
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.bulk_import_max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Uploads are limited to {settings.bulk_import_max_bytes} bytes",
+                )
+            if records is None:
+                body += chunk
+            else:
+                records.feed(decoder.decode(chunk))
+        if records is None:
+            return json_records(orjson.loads(body), result)
+        records.feed(decoder.decode(b"", final=True))
+        return records.close()
+    except ValueError as exc:
+        # Also undecodable text and malformed JSON
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+# Post tournament {id} participants:bulk import participants (organizer only)
+@router.post("/{tournament_id}/participants:bulk", response_model=ParticipantImportResult)
+async def import_participants(
+    tournament_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Import participants in bulk, e.g. the qualifiers of an earlier event.
+
+    Only the tournament organizer can import, until the tournament starts.
+    Requires authentication.
 
-    participant_count = (
-        db.query(Participant).filter(Participant.tournament_id == tournament_id).count()
+    The body is either CSV (`text/csv`) whose header names a `user_id` or
+    `email` column and optionally `seed`, or a JSON array (`application/json`)
+    of objects with those keys. Each row names one user, by id or email.
+    Users not yet in the tournament are added in upload order until it is
+    full; for users already in it, a given seed replaces theirs. Rows that
+    cannot be imported are listed in `errors` by row number (from 1, not
+    counting the CSV header) and the others are still imported, all in one
+    transaction.
+    """
+    organizer_id = await db.scalar(
+        select(Tournament.organizer_id).where(Tournament.id == tournament_id)
     )
-
-    if participant_count >= tournament.max_participants:
+    if organizer_id is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Tournament is full"
-        )
-
-    existing = (
-        db.query(Participant)
-        .filter(
-            Participant.tournament_id == tournament_id,
-            Participant.user_id == current_user.id,
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
         )
-        .first()
-    )
-
-    if existing:
+    if organizer_id != current_user.id:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Already joined this tournament",
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not the organizer"
         )
 
-    new_participant = Participant(tournament_id=tournament_id, user_id=current_user.id)
+    result = ImportResult()
+    rows = await _read_import(request, result)
+    try:
+        await db.run_sync(add_participants, tournament_id, rows, result)
+    except TournamentNotFoundError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except ImportConflictError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    except RegistrationError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
-    db.add(new_participant)
-    db.commit()
-    db.refresh(new_participant)
+    await db.commit()
+    if result.added or result.seeded:
+        publish_participants_imported(tournament_id, result.added)
 
-    return new_participant
+    result.errors.sort(key=itemgetter("row"))
+    return result
 
 
 # Delete tournament {id} leave a tournament (get_current_user)
@@ -230,48 +439,237 @@ def leave_tournament(
     """
     Leave a tournament you have joined.
 
-    Requires authentication. You must be a participant to leave.
+    Requires authentication. You must be a participant to leave, and the
+    tournament must not have started: its matches refer to its players.
     """
-    participant = (
-        db.query(Participant)
-        .filter(
-            Participant.tournament_id == tournament_id,
-            Participant.user_id == current_user.id,
+    try:
+        remove_participant(db, tournament_id, current_user.id)
+    except (TournamentNotFoundError, NotParticipantError) as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except RegistrationError as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    db.commit()
+    publish_participant_left(tournament_id, current_user.id)
+
+    return None
+
+
+# Post tournament {id} start the tournament and generate its bracket (organizer only)
+@router.post("/{tournament_id}/start", response_model=TournamentResponse)
+def start_tournament(
+    tournament_id: int,
+    seeding: SeedingMethod = SeedingMethod.MANUAL,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Start a tournament and generate all of its matches.
+
+    Only the tournament organizer can start. Requires authentication.
+    The whole bracket is written in one transaction.
+
+    - **seeding**: `manual` orders by participant seed (then join order),
+      `random` shuffles the participants, `rating` orders by the players'
+      rating in the tournament's game
+
+    A Swiss tournament starts with its first round only; each later round
+    is paired when the previous one is complete.
+    """
+    tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+    if tournament is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
         )
-        .first()
-    )
 
-    if participant is None:
+    if current_user.id != tournament.organizer_id:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="You are not in this tournament",
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not the organizer"
         )
 
-    db.delete(participant)
+    try:
+        generate_bracket(db, tournament, seeding)
+    except ValueError as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
     db.commit()
+    db.refresh(tournament)
+    publish_bracket_created(tournament_id)
 
-    return None
+    return tournament
+
+
+# Get the bracket of a tournament
+@router.get("/{tournament_id}/bracket", response_model=BracketResponse)
+async def get_bracket(tournament_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the full bracket of a tournament, round by round, with player names.
+
+    No authentication required. Served from an in-memory cache keyed by the
+    tournament's version, so any change to the tournament is seen at once.
+    """
+    body = await get_bracket_json(db, tournament_id)
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
+        )
+
+    return Response(content=body, media_type="application/json")
 
 
 # Get matches in a tournament
 @router.get("/{tournament_id}/matches", response_model=List[MatchResponse])
-def get_matches(tournament_id: int, db: Session = Depends(get_db)):
+async def get_matches(
+    tournament_id: int,
+    request: Request,
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get all matches in tournament
+
+    Sends ETag and Last-Modified; while nothing in the tournament changed,
+    conditional requests get 304 Not Modified without any match being read.
+
+    - **stream**: Return newline-delimited JSON, one match per line, read from
+      the database in batches. Use this for very large tournaments.
     """
-    matches = db.query(Match).filter(Match.tournament_id == tournament_id).all()
+    validators = await tournament_validators(db, tournament_id)
+    if validators is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
+        )
+    if validators.is_fresh(request):
+        return validators.not_modified()
+
+    query = (
+        match_rows.select()
+        .where(Match.tournament_id == tournament_id)
+        .order_by(Match.id)
+    )
+    if stream:
+        return validators.apply(ndjson_response(query, match_rows))
+
+    result = await db.execute(query)
 
-    return matches
+    return validators.apply(json_response(match_rows.dumps(result)))
+
+
+# Patch matches in a tournament (organizer only): report many results at once
+@router.patch("/{tournament_id}/matches", response_model=List[MatchBatchResult])
+def update_matches(
+    tournament_id: int,
+    updates: List[MatchBatchItem],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Update many matches of a tournament in one request.
+
+    Only the tournament organizer can update. Requires authentication.
+    Items are applied in order and each gets its own result; an item that
+    fails (unknown match, invalid winner, next match already played) is
+    skipped without affecting the others. Completing the current round of a
+    Swiss tournament pairs the next one.
+
+    - **id**: Match to update; other fields are as for `PUT /matches/{id}`
+    """
+    tournament = db.get(Tournament, tournament_id)
+    if tournament is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
+        )
+
+    if current_user.id != tournament.organizer_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not the organizer"
+        )
+
+    results, changes = apply_results(db, tournament, updates)
+    paired_round = advance_round(db, tournament) if changes else None
+    db.commit()
+    if changes:
+        publish_match_changes(tournament_id, changes)
+    if paired_round is not None:
+        publish_round_paired(tournament_id, paired_round)
+
+    return results
+
+
+# Get standings of a tournament
+@router.get("/{tournament_id}/standings", response_model=List[StandingResponse])
+async def get_standings(
+    tournament_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get the standings table of a tournament: points, then score difference.
+
+    No authentication required. Participants without a completed match are
+    not listed. Sends ETag and Last-Modified, like the matches.
+    """
+    validators = await tournament_validators(db, tournament_id)
+    if validators is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
+        )
+    if validators.is_fresh(request):
+        return validators.not_modified()
+
+    result = await db.execute(
+        select(*Standing.__table__.columns, Participant.user_id, User.display_name)
+        .join(Participant, Participant.id == Standing.participant_id)
+        .join(User, User.id == Participant.user_id)
+        .where(Standing.tournament_id == tournament_id)
+        .order_by(
+            Standing.points.desc(),
+            Standing.score_diff.desc(),
+            Standing.score_for.desc(),
+            Standing.participant_id,
+        )
+    )
+    validators.apply(response)
+
+    return result.all()
 
 
 # Get participants in a tournament
 @router.get("/{tournament_id}/participants", response_model=List[ParticipantResponse])
-def get_participants(tournament_id: int, db: Session = Depends(get_db)):
+async def get_participants(
+    tournament_id: int,
+    request: Request,
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get all participants in tournament
+
+    Sends ETag and Last-Modified for conditional requests, like the matches.
+
+    - **stream**: Return newline-delimited JSON, one participant per line,
+      read from the database in batches.
     """
-    participants = (
-        db.query(Participant).filter(Participant.tournament_id == tournament_id).all()
+    validators = await tournament_validators(db, tournament_id)
+    if validators is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found"
+        )
+    if validators.is_fresh(request):
+        return validators.not_modified()
+
+    query = (
+        participant_rows.select()
+        .where(Participant.tournament_id == tournament_id)
+        .order_by(Participant.id)
     )
+    if stream:
+        return validators.apply(ndjson_response(query, participant_rows))
+
+    result = await db.execute(query)
 
-    return participants
+    return validators.apply(json_response(participant_rows.dumps(result)))
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.models.user import User
+from app.models.stats import PlayerStats
 from app.schemas.user import UserResponse, UserUpdate, UserPrivateResponse
-from app.utils.deps import get_current_user
+from app.schemas.stats import PlayerStatsResponse
+from app.services.versioning import bump_player_versions
+from app.utils.conditional import Validators
+from app.utils.deps import get_current_user, invalidate_cached_user
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -36,32 +43,74 @@ def update_current_user_profile(
     - **bio**: Optional user biography
     """
 
+    # current_user may be a cached copy, so update the database row itself
+    db_user = db.get(User, current_user.id)
+
     # Get only the fields that were actually sent (not None)
     update_data = user_update.model_dump(exclude_unset=True)
 
+    # Tournaments embed the name, so a rename changes their cached views
+    renamed = update_data.get("display_name", db_user.display_name) != db_user.display_name
+
     # Loop through and apply each field to the user
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(db_user, field, value)
+    db_user.version = User.version + 1
+    if renamed:
+        bump_player_versions(db, db_user.id)
 
     # Save to database
     db.commit()
-    db.refresh(current_user)  # Refresh to get any DB-generated values
+    db.refresh(db_user)  # Refresh to get any DB-generated values
+    invalidate_cached_user(db_user.id)
 
-    return current_user
+    return db_user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get a user's public profile by their ID.
 
     Returns public profile data (no email). No authentication required.
+    Sends an ETag for conditional requests.
     """
-    db_user = db.query(User).filter(User.id == user_id).first()
+    db_user = await db.get(User, user_id)
 
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
+    validators = Validators.for_version("u", user_id, db_user.version)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    validators.apply(response)
+
     return db_user
+
+
+@router.get("/{user_id}/stats", response_model=List[PlayerStatsResponse])
+async def get_user_stats(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get a user's results per game across all tournaments.
+
+    No authentication required.
+    """
+    result = await db.scalars(
+        select(PlayerStats).where(PlayerStats.user_id == user_id).order_by(PlayerStats.game)
+    )
+    stats = result.all()
+
+    # Only look the user up when there is nothing to show
+    if not stats and await db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    return stats
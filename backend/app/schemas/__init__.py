@@ -1,7 +1,32 @@
-from app.schemas.match import MatchResponse, MatchUpdate
-from app.schemas.participant import ParticipantResponse, ParticipantUpdate
+from app.schemas.bracket import (
+    BracketMatch,
+    BracketPlayer,
+    BracketResponse,
+    BracketRound,
+)
+from app.schemas.match import (
+    MatchBatchItem,
+    MatchBatchResult,
+    MatchResponse,
+    MatchUpdate,
+)
+from app.schemas.participant import (
+    ParticipantImportError,
+    ParticipantImportResult,
+    ParticipantResponse,
+    ParticipantUpdate,
+)
+from app.schemas.search import SearchHit, SearchKind, SearchPage
+from app.schemas.stats import (
+    LeaderboardEntry,
+    LeaderboardPage,
+    PlayerStatsResponse,
+    StandingResponse,
+)
 from app.schemas.tournament import (
+    SeedingMethod,
     TournamentCreate,
+    TournamentPage,
     TournamentResponse,
     TournamentUpdate,
 )
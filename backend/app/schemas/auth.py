@@ -1,9 +1,20 @@
 from pydantic import BaseModel, EmailStr
+from typing import Optional
 
 
 class AuthResponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    # Also revoke this refresh token; the access token used is always revoked
+    refresh_token: Optional[str] = None
 
 
 class AuthLogin(BaseModel):
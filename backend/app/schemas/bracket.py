@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+from app.models.match import MatchBracket, MatchStatus
+from app.models.tournament import TournamentFormat, TournamentStatus
+
+
+class BracketPlayer(BaseModel):
+    participant_id: int
+    user_id: int
+    display_name: str
+    seed: Optional[int] = None
+
+
+class BracketMatch(BaseModel):
+    id: int
+    match_number: int
+    status: MatchStatus
+    player1: Optional[BracketPlayer] = None
+    player2: Optional[BracketPlayer] = None
+    player1_score: Optional[int] = None
+    player2_score: Optional[int] = None
+    winner_id: Optional[int] = None
+    next_match_id: Optional[int] = None
+    loser_next_match_id: Optional[int] = None
+
+
+class BracketRound(BaseModel):
+    bracket: MatchBracket
+    round: int
+    matches: List[BracketMatch]
+
+
+class BracketResponse(BaseModel):
+    tournament_id: int
+    format: TournamentFormat
+    status: TournamentStatus
+    rounds: List[BracketRound]
@@ -2,7 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 
-from app.models.match import MatchStatus
+from app.models.match import MatchBracket, MatchStatus
 
 
 class MatchUpdate(BaseModel):
@@ -19,16 +19,35 @@ class MatchUpdate(BaseModel):
 class MatchResponse(BaseModel):
     id: int
     tournament_id: int
+    bracket: MatchBracket = MatchBracket.MAIN
     match_number: int
     round: int
     player1_id: Optional[int] = None
     player2_id: Optional[int] = None
+    player1_name: Optional[str] = None
+    player2_name: Optional[str] = None
     player1_score: Optional[int] = None
     player2_score: Optional[int] = None
     winner_id: Optional[int] = None
     status: MatchStatus
     scheduled_at: datetime
     completed_at: Optional[datetime] = None
+    overdue: bool = False
+    next_match_id: Optional[int] = None
+    next_match_slot: Optional[int] = None
+    loser_next_match_id: Optional[int] = None
+    loser_next_match_slot: Optional[int] = None
 
     class Config:
         from_attributes = True
+
+
+class MatchBatchItem(MatchUpdate):
+    id: int
+
+
+class MatchBatchResult(BaseModel):
+    id: int
+    ok: bool
+    error: Optional[str] = None
+    match: Optional[MatchResponse] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class ParticipantUpdate(BaseModel):
@@ -11,6 +11,7 @@ class ParticipantUpdate(BaseModel):
 class ParticipantResponse(BaseModel):
     tournament_id: int
     user_id: int
+    display_name: str
     id: int
     seed: Optional[int] = (
         None  ## Is optional as it may return null as the user has an option to keep empty
@@ -20,3 +21,14 @@ class ParticipantResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ParticipantImportError(BaseModel):
+    row: int  # Counting from 1, excluding a CSV header
+    error: str
+
+
+class ParticipantImportResult(BaseModel):
+    added: int
+    seeded: int  # Existing participants whose seed was set
+    errors: List[ParticipantImportError]
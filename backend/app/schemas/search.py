@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+import enum
+from typing import List, Optional
+
+
+class SearchKind(enum.Enum):
+    TOURNAMENT = "tournament"
+    USER = "user"
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    # Tournament or user id, depending on kind
+    id: int
+    # Tournament name or user display name
+    title: str
+    game: Optional[str] = None  # Tournaments only
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    # Pass as `cursor` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
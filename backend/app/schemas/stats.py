@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class RecordResponse(BaseModel):
+    played: int
+    wins: int
+    losses: int
+    draws: int
+    points: int
+    score_for: int
+    score_against: int
+    score_diff: int
+
+    class Config:
+        from_attributes = True
+
+
+class PlayerStatsResponse(RecordResponse):
+    game: str
+
+
+class LeaderboardEntry(RecordResponse):
+    user_id: int
+    display_name: str
+
+
+class LeaderboardPage(BaseModel):
+    items: List[LeaderboardEntry]
+    # Pass as `cursor` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class StandingResponse(RecordResponse):
+    participant_id: int
+    user_id: int
+    display_name: str
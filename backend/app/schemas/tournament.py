@@ -1,15 +1,23 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+import enum
+from typing import List, Optional
 from app.models.tournament import TournamentFormat, TournamentStatus
 
 
+class SeedingMethod(enum.Enum):
+    MANUAL = "manual"
+    RANDOM = "random"
+    RATING = "rating"
+
+
 class TournamentBase(BaseModel):
     name: str
     description: Optional[str] = None
     game: str
     format: TournamentFormat = TournamentFormat.SINGLE_ELIMINATION
     max_participants: int = 16
+    rounds: Optional[int] = None
 
 
 class TournamentCreate(TournamentBase):
@@ -23,6 +31,7 @@ class TournamentUpdate(BaseModel):
     game: Optional[str] = None
     format: Optional[TournamentFormat] = None
     max_participants: Optional[int] = None
+    rounds: Optional[int] = None
     status: Optional[TournamentStatus] = None
     registration_deadline: Optional[datetime] = None
     start_date: Optional[datetime] = None
@@ -35,6 +44,13 @@ class TournamentResponse(TournamentBase):
     registration_deadline: datetime
     start_date: datetime
     created_at: datetime
+    participant_count: int = 0
 
     class Config:
         from_attributes = True
+
+
+class TournamentPage(BaseModel):
+    items: List[TournamentResponse]
+    # Opaque cursor for the next page, null when this is the last page
+    next_cursor: Optional[str] = None
@@ -0,0 +1,103 @@
+"""
+Bracket advancement.
+
+When a match is completed its winner (and, in double elimination, its
+loser) are written straight into the successor slots recorded on the match
+at generation time. Each report touches at most two other rows by primary
+key, so the cost does not depend on the size of the bracket.
+
+Every match is created scheduled at the tournament's start date. A later
+match becomes playable only when its second player arrives, so that is
+when it is scheduled: the scheduler's overdue check counts from there
+(unless the organizer already scheduled it later).
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, case
+from sqlalchemy.orm import Session
+
+from app.models.match import Match, MatchStatus
+
+
+class AdvancementError(ValueError):
+    """The result cannot be applied to the bracket."""
+
+
+def _place(
+    db: Session, match_id: Optional[int], slot: Optional[int], participant_id: int, now: datetime
+):
+    if match_id is None:
+        return
+
+    column, other = (
+        (Match.player1_id, Match.player2_id) if slot == 1 else (Match.player2_id, Match.player1_id)
+    )
+    ready = and_(other.is_not(None), Match.scheduled_at < now)
+    # Only fill the slot while the successor is still unplayed; a completed
+    # successor means the result was changed too late.
+    updated = (
+        db.query(Match)
+        .filter(Match.id == match_id, Match.status != MatchStatus.COMPLETED)
+        .update(
+            {
+                column: participant_id,
+                Match.scheduled_at: case((ready, now), else_=Match.scheduled_at),
+                Match.overdue: case((ready, False), else_=Match.overdue),
+            },
+            synchronize_session=False,
+        )
+    )
+    if updated == 0:
+        raise AdvancementError("The next match has already been played")
+
+
+def schedule_if_ready(match, now: datetime) -> None:
+    """
+    In-memory counterpart of _place's scheduling, for a Match-like `match`
+    whose slot was just filled: scheduled now once both players are in.
+    """
+    if match.player1_id is None or match.player2_id is None:
+        return
+    scheduled_at = match.scheduled_at
+    if scheduled_at.tzinfo is None:
+        scheduled_at = scheduled_at.replace(tzinfo=timezone.utc)
+    if scheduled_at < now:
+        match.scheduled_at = now
+        match.overdue = False
+
+
+def placements(match) -> List[Tuple[int, int, int]]:
+    """
+    The (match id, slot, participant id) moves a match result causes.
+
+    `match` is a Match or any object with the same attributes. Empty unless
+    the match is completed with a winner.
+    """
+    if match.status != MatchStatus.COMPLETED or match.winner_id is None:
+        return []
+
+    players = {match.player1_id, match.player2_id}
+    if match.winner_id not in players:
+        raise AdvancementError("Winner must be one of the match's players")
+
+    moves = []
+    if match.next_match_id is not None:
+        moves.append((match.next_match_id, match.next_match_slot, match.winner_id))
+
+    loser_id = (players - {match.winner_id}).pop() if len(players) == 2 else None
+    if loser_id is not None and match.loser_next_match_id is not None:
+        moves.append((match.loser_next_match_id, match.loser_next_match_slot, loser_id))
+    return moves
+
+
+def advance(db: Session, match: Match) -> None:
+    """
+    Move the players of a completed match into their next matches.
+
+    Does nothing unless the match is completed with a winner. Does not commit.
+    """
+    now = datetime.now(timezone.utc)
+    for match_id, slot, participant_id in placements(match):
+        _place(db, match_id, slot, participant_id, now)
@@ -0,0 +1,285 @@
+"""
+Bracket generation engine.
+
+Pure Python: takes participant ids in seed order and returns the planned
+matches for a tournament format. Nothing here touches the database, so the
+router can write the whole plan in a single bulk insert.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.models.match import MatchBracket
+from app.models.tournament import TournamentFormat
+
+# Where a match sends a player: (index of the target match in the plan, slot 1 or 2)
+SlotRef = Tuple[int, int]
+
+
+@dataclass
+class PlannedMatch:
+    bracket: MatchBracket
+    round: int
+    match_number: int
+    player1_id: Optional[int] = None
+    player2_id: Optional[int] = None
+    # Successor slots for the winner and (double elimination only) the loser
+    next_match: Optional[SlotRef] = None
+    loser_next_match: Optional[SlotRef] = None
+
+
+def seed_positions(size: int) -> List[int]:
+    """
+    Standard bracket order of 1-based seeds for a power-of-two bracket.
+
+    Adjacent pairs are round-one matches, and seeds 1 and 2 can only meet in
+    the final: seed_positions(8) == [1, 8, 4, 5, 2, 7, 3, 6].
+    """
+    positions = [1]
+    while len(positions) < size:
+        total = len(positions) * 2 + 1
+        positions = [p for seed in positions for p in (seed, total - seed)]
+    return positions
+
+
+def _bracket_size(count: int) -> int:
+    size = 1
+    while size < count:
+        size *= 2
+    return size
+
+
+def _winners_bracket(
+    participant_ids: Sequence[int], bracket_size: int
+) -> Tuple[List[PlannedMatch], List[List[int]]]:
+    """Build a full single-elimination tree, returning the plan and match indices per round."""
+    seeded: List[Optional[int]] = [
+        participant_ids[seed - 1] if seed <= len(participant_ids) else None
+        for seed in seed_positions(bracket_size)
+    ]
+
+    plan: List[PlannedMatch] = []
+    rounds: List[List[int]] = []
+    round_number = 1
+    count = bracket_size // 2
+    while count >= 1:
+        indices = []
+        for number in range(count):
+            match = PlannedMatch(MatchBracket.MAIN, round_number, number + 1)
+            if round_number == 1:
+                match.player1_id = seeded[2 * number]
+                match.player2_id = seeded[2 * number + 1]
+            indices.append(len(plan))
+            plan.append(match)
+        if rounds:
+            for number, index in enumerate(rounds[-1]):
+                plan[index].next_match = (indices[number // 2], number % 2 + 1)
+        rounds.append(indices)
+        round_number += 1
+        count //= 2
+    return plan, rounds
+
+
+def _losers_bracket(plan: List[PlannedMatch], winners_rounds: List[List[int]]) -> List[int]:
+    """
+    Append the losers bracket to `plan` and return the index of its final.
+
+    Odd losers rounds pair up survivors of the previous losers round (round
+    one pairs up the losers of winners round one). Even losers round 2k sets
+    those survivors against the losers dropping from winners round k + 1, in
+    alternating order so early opponents do not meet again straight away.
+    """
+    losers_round = 1
+    previous: List[int] = []
+
+    def add_round(count: int) -> List[int]:
+        indices = []
+        for number in range(count):
+            indices.append(len(plan))
+            plan.append(PlannedMatch(MatchBracket.LOSERS, losers_round, number + 1))
+        return indices
+
+    # Round one: losers of winners round one, two at a time
+    first = winners_rounds[0]
+    previous = add_round(len(first) // 2)
+    for number, index in enumerate(first):
+        plan[index].loser_next_match = (previous[number // 2], number % 2 + 1)
+
+    for k, dropping in enumerate(winners_rounds[1:], start=1):
+        # Even round: survivors (slot 1) against players dropping from the winners bracket
+        losers_round += 1
+        current = add_round(len(dropping))
+        for number, index in enumerate(previous):
+            plan[index].next_match = (current[number], 1)
+        order = dropping if k % 2 == 0 else list(reversed(dropping))
+        for number, index in enumerate(order):
+            plan[index].loser_next_match = (current[number], 2)
+        previous = current
+
+        if len(current) > 1:
+            # Odd round: survivors play each other
+            losers_round += 1
+            current = add_round(len(previous) // 2)
+            for number, index in enumerate(previous):
+                plan[index].next_match = (current[number // 2], number % 2 + 1)
+            previous = current
+
+    return previous
+
+
+def _resolve_byes(plan: List[PlannedMatch]) -> List[PlannedMatch]:
+    """
+    Drop every match that can have at most one entrant.
+
+    A seeded player facing a bye moves straight into the successor slot, and
+    a match fed by only one other match is bypassed by pointing that feeder
+    at the successor instead. Plans are built so feeders always come before
+    the matches they feed, which lets a single forward pass settle chains of
+    byes (common in the losers bracket).
+    """
+    # incoming[i][slot] -> ("player", id) | ("winner", j) | ("loser", j)
+    incoming: List[Dict[int, Tuple[str, int]]] = [{} for _ in plan]
+    for index, match in enumerate(plan):
+        if match.player1_id is not None:
+            incoming[index][1] = ("player", match.player1_id)
+        if match.player2_id is not None:
+            incoming[index][2] = ("player", match.player2_id)
+        if match.next_match is not None:
+            target, slot = match.next_match
+            incoming[target][slot] = ("winner", index)
+        if match.loser_next_match is not None:
+            target, slot = match.loser_next_match
+            incoming[target][slot] = ("loser", index)
+
+    dropped = set()
+    for index, match in enumerate(plan):
+        feeds = incoming[index]
+        if len(feeds) == 2:
+            continue
+
+        dropped.add(index)
+        # A match without two entrants never produces a loser
+        if match.loser_next_match is not None:
+            target, slot = match.loser_next_match
+            incoming[target].pop(slot, None)
+            match.loser_next_match = None
+        if match.next_match is None:
+            continue
+        target, slot = match.next_match
+        if not feeds:
+            incoming[target].pop(slot, None)
+            continue
+
+        kind, value = next(iter(feeds.values()))
+        if kind == "player":
+            if slot == 1:
+                plan[target].player1_id = value
+            else:
+                plan[target].player2_id = value
+        elif kind == "winner":
+            plan[value].next_match = (target, slot)
+        else:
+            plan[value].loser_next_match = (target, slot)
+        incoming[target][slot] = (kind, value)
+
+    # Compact the plan and rewrite successor indices
+    remap = {}
+    for index in range(len(plan)):
+        if index not in dropped:
+            remap[index] = len(remap)
+    kept = []
+    for index, match in enumerate(plan):
+        if index in dropped:
+            continue
+        if match.next_match is not None:
+            match.next_match = (remap[match.next_match[0]], match.next_match[1])
+        if match.loser_next_match is not None:
+            match.loser_next_match = (
+                remap[match.loser_next_match[0]],
+                match.loser_next_match[1],
+            )
+        kept.append(match)
+    return kept
+
+
+def single_elimination(participant_ids: Sequence[int]) -> List[PlannedMatch]:
+    """Plan a single-elimination bracket; participant_ids are in seed order."""
+    plan, _ = _winners_bracket(participant_ids, _bracket_size(len(participant_ids)))
+    return _resolve_byes(plan)
+
+
+def double_elimination(participant_ids: Sequence[int]) -> List[PlannedMatch]:
+    """
+    Plan a double-elimination bracket; participant_ids are in seed order.
+
+    The winners-bracket champion meets the losers-bracket champion once in
+    the grand final.
+    """
+    plan, winners_rounds = _winners_bracket(
+        participant_ids, _bracket_size(len(participant_ids))
+    )
+    winners_final = winners_rounds[-1][0]
+
+    if len(winners_rounds) > 1:
+        losers_final = _losers_bracket(plan, winners_rounds)[0]
+    else:
+        losers_final = None
+
+    grand_final = len(plan)
+    plan.append(PlannedMatch(MatchBracket.GRAND_FINAL, 1, 1))
+    plan[winners_final].next_match = (grand_final, 1)
+    if losers_final is None:
+        # Two players: the loser of the only match gets a second chance directly
+        plan[winners_final].loser_next_match = (grand_final, 2)
+    else:
+        plan[losers_final].next_match = (grand_final, 2)
+
+    return _resolve_byes(plan)
+
+
+def round_robin(participant_ids: Sequence[int]) -> List[PlannedMatch]:
+    """
+    Plan a round robin with the circle method.
+
+    The first player stays fixed while the others rotate one place per round,
+    giving n - 1 rounds (n rounds for an odd field, where one player sits out
+    each round).
+    """
+    players: List[Optional[int]] = list(participant_ids)
+    if len(players) % 2:
+        players.append(None)
+
+    count = len(players)
+    half = count // 2
+    plan = []
+    for round_index in range(count - 1):
+        number = 0
+        for i in range(half):
+            home, away = players[i], players[count - 1 - i]
+            if home is None or away is None:
+                continue
+            number += 1
+            # Alternate sides for the fixed player so it doesn't always play first
+            if i == 0 and round_index % 2:
+                home, away = away, home
+            plan.append(
+                PlannedMatch(MatchBracket.MAIN, round_index + 1, number, home, away)
+            )
+        players = [players[0], players[-1]] + players[1:-1]
+    return plan
+
+
+GENERATORS = {
+    TournamentFormat.SINGLE_ELIMINATION: single_elimination,
+    TournamentFormat.DOUBLE_ELIMINATION: double_elimination,
+    TournamentFormat.ROUND_ROBIN: round_robin,
+}
+
+
+def generate(
+    tournament_format: TournamentFormat, participant_ids: Sequence[int]
+) -> List[PlannedMatch]:
+    """Plan every match for `tournament_format`; needs at least two participants."""
+    if len(participant_ids) < 2:
+        raise ValueError("At least two participants are needed to build a bracket")
+    return GENERATORS[tournament_format](participant_ids)
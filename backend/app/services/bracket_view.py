@@ -0,0 +1,138 @@
+"""
+Read side of the bracket: the full round-by-round tree of a tournament,
+built from one joined query and cached as serialized JSON.
+
+Entries are keyed by tournament and version. Every write to a tournament,
+its matches or its participants bumps the version (services/versioning.py),
+so a write never has to invalidate anything: the next read looks up the new
+version, misses, and rebuilds, in every worker. Entries of old versions are
+never read again and age out of the LRU.
+"""
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.match import Match, MatchBracket
+from app.models.participant import Participant
+from app.models.tournament import Tournament
+from app.models.user import User
+from app.schemas.bracket import BracketMatch, BracketPlayer, BracketResponse, BracketRound
+from app.utils.cache import LRUCache
+
+BRACKET_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Rounds are listed winners side first, then losers, then the grand final
+BRACKET_ORDER = {
+    MatchBracket.MAIN: 0,
+    MatchBracket.LOSERS: 1,
+    MatchBracket.GRAND_FINAL: 2,
+}
+
+bracket_cache = LRUCache(max_bytes=BRACKET_CACHE_MAX_BYTES)
+
+
+async def build_bracket(db: AsyncSession, tournament: Tournament) -> BracketResponse:
+    """Load every match of the tournament with both players' names in one query."""
+    participant1, participant2 = aliased(Participant), aliased(Participant)
+    user1, user2 = aliased(User), aliased(User)
+
+    result = await db.execute(
+        select(
+            Match.id,
+            Match.bracket,
+            Match.round,
+            Match.match_number,
+            Match.status,
+            Match.player1_id,
+            Match.player2_id,
+            Match.player1_score,
+            Match.player2_score,
+            Match.winner_id,
+            Match.next_match_id,
+            Match.loser_next_match_id,
+            participant1.user_id.label("player1_user_id"),
+            participant1.seed.label("player1_seed"),
+            user1.display_name.label("player1_name"),
+            participant2.user_id.label("player2_user_id"),
+            participant2.seed.label("player2_seed"),
+            user2.display_name.label("player2_name"),
+        )
+        .outerjoin(participant1, participant1.id == Match.player1_id)
+        .outerjoin(user1, user1.id == participant1.user_id)
+        .outerjoin(participant2, participant2.id == Match.player2_id)
+        .outerjoin(user2, user2.id == participant2.user_id)
+        .where(Match.tournament_id == tournament.id)
+    )
+    rows = result.all()
+    rows.sort(key=lambda row: (BRACKET_ORDER[row.bracket], row.round, row.match_number))
+
+    rounds = []
+    for row in rows:
+        if not rounds or (rounds[-1].bracket, rounds[-1].round) != (row.bracket, row.round):
+            rounds.append(BracketRound(bracket=row.bracket, round=row.round, matches=[]))
+
+        player1 = player2 = None
+        if row.player1_id is not None:
+            player1 = BracketPlayer(
+                participant_id=row.player1_id,
+                user_id=row.player1_user_id,
+                display_name=row.player1_name,
+                seed=row.player1_seed,
+            )
+        if row.player2_id is not None:
+            player2 = BracketPlayer(
+                participant_id=row.player2_id,
+                user_id=row.player2_user_id,
+                display_name=row.player2_name,
+                seed=row.player2_seed,
+            )
+
+        rounds[-1].matches.append(
+            BracketMatch(
+                id=row.id,
+                match_number=row.match_number,
+                status=row.status,
+                player1=player1,
+                player2=player2,
+                player1_score=row.player1_score,
+                player2_score=row.player2_score,
+                winner_id=row.winner_id,
+                next_match_id=row.next_match_id,
+                loser_next_match_id=row.loser_next_match_id,
+            )
+        )
+
+    return BracketResponse(
+        tournament_id=tournament.id,
+        format=tournament.format,
+        status=tournament.status,
+        rounds=rounds,
+    )
+
+
+async def get_bracket_json(db: AsyncSession, tournament_id: int) -> Optional[bytes]:
+    """
+    Serialized bracket for the tournament, or None if it does not exist.
+
+    A cache hit costs one primary-key lookup of the tournament's version.
+    """
+    version = await db.scalar(select(Tournament.version).where(Tournament.id == tournament_id))
+    if version is None:
+        return None
+
+    # Built from data at least as new as `version`, so never stale for it
+    key = (tournament_id, version)
+    cached = bracket_cache.get(key)
+    if cached is not None:
+        return cached
+
+    tournament = await db.get(Tournament, tournament_id)
+    if tournament is None:
+        return None
+
+    body = (await build_bracket(db, tournament)).model_dump_json().encode()
+    bracket_cache.set(key, body)
+    return body
@@ -0,0 +1,159 @@
+"""
+Deadline-driven state changes, run by the scheduler (services/scheduler.py).
+
+- At its registration deadline an open tournament stops taking
+  registrations (status registration_closed).
+- At its start date an open or closed tournament is started with manual
+  seeding, or cancelled if fewer than two players registered.
+- A pending match with both players is flagged overdue once its scheduled
+  time plus a grace period has passed.
+
+Every job re-checks its condition in the database as part of the write,
+so running one twice, late, or after another worker already has is
+harmless. due_timers() lists what will fall due within a horizon, straight
+from the indexed deadline columns.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import utc_timestamp
+from app.models.match import Match, MatchStatus
+from app.models.participant import Participant
+from app.models.tournament import Tournament, TournamentStatus
+from app.schemas.tournament import SeedingMethod
+from app.services.live import publish_bracket_created, publish_match_changes
+from app.services.tournament_start import start_tournament
+from app.services.versioning import bump_version, version_bump
+
+CLOSE_REGISTRATION = "close_registration"
+START_TOURNAMENT = "start_tournament"
+FLAG_OVERDUE = "flag_overdue"
+
+# Tournaments that have not started yet
+NOT_STARTED = (TournamentStatus.OPEN, TournamentStatus.REGISTRATION_CLOSED)
+
+# (when, job, tournament or match id); when is a UTC timestamp
+Timer = Tuple[float, str, int]
+
+
+def due_timers(db: Session, horizon: datetime, overdue_grace: timedelta) -> List[Timer]:
+    """Every job due before `horizon`, including those already overdue."""
+    timers: List[Timer] = []
+
+    for tournament_id, deadline in db.execute(
+        select(Tournament.id, Tournament.registration_deadline).where(
+            Tournament.status == TournamentStatus.OPEN,
+            Tournament.registration_deadline <= horizon,
+        )
+    ):
+        timers.append((utc_timestamp(deadline), CLOSE_REGISTRATION, tournament_id))
+
+    for tournament_id, start_date in db.execute(
+        select(Tournament.id, Tournament.start_date).where(
+            Tournament.status.in_(NOT_STARTED), Tournament.start_date <= horizon
+        )
+    ):
+        timers.append((utc_timestamp(start_date), START_TOURNAMENT, tournament_id))
+
+    grace = overdue_grace.total_seconds()
+    for match_id, scheduled_at in db.execute(
+        select(Match.id, Match.scheduled_at).where(
+            Match.status == MatchStatus.PENDING,
+            Match.overdue.is_(False),
+            Match.scheduled_at <= horizon - overdue_grace,
+            Match.player1_id.is_not(None),
+            Match.player2_id.is_not(None),
+        )
+    ):
+        timers.append((utc_timestamp(scheduled_at) + grace, FLAG_OVERDUE, match_id))
+
+    return timers
+
+
+def close_registrations(db: Session, tournament_ids: Iterable[int], now: datetime) -> int:
+    """Close registration of the open tournaments past their deadline. Commits."""
+    closed = db.execute(
+        update(Tournament)
+        .where(
+            Tournament.id.in_(list(tournament_ids)),
+            Tournament.status == TournamentStatus.OPEN,
+            Tournament.registration_deadline <= now,
+        )
+        .values(status=TournamentStatus.REGISTRATION_CLOSED, **version_bump())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return closed
+
+
+def start_due_tournament(db: Session, tournament_id: int, now: datetime) -> bool:
+    """
+    Start the tournament if it is past its start date and not started yet,
+    or cancel it when it has fewer than two players. Commits. Returns
+    whether anything changed.
+    """
+    tournament = db.get(Tournament, tournament_id, with_for_update=True)
+    if (
+        tournament is None
+        or tournament.status not in NOT_STARTED
+        or utc_timestamp(tournament.start_date) > now.timestamp()
+    ):
+        db.rollback()
+        return False
+
+    second_player = db.scalar(
+        select(Participant.id)
+        .where(Participant.tournament_id == tournament_id)
+        .offset(1)
+        .limit(1)
+    )
+    if second_player is None:
+        tournament.status = TournamentStatus.CANCELLED
+        bump_version(db, tournament_id)
+        db.commit()
+        return True
+
+    start_tournament(db, tournament, SeedingMethod.MANUAL)
+    db.commit()
+    publish_bracket_created(tournament_id)
+    return True
+
+
+def flag_overdue_matches(
+    db: Session, match_ids: Iterable[int], now: datetime, overdue_grace: timedelta
+) -> int:
+    """Flag the given matches that are still pending past their time. Commits."""
+    flagged = db.execute(
+        update(Match)
+        .where(
+            Match.id.in_(list(match_ids)),
+            Match.status == MatchStatus.PENDING,
+            Match.overdue.is_(False),
+            Match.scheduled_at <= now - overdue_grace,
+        )
+        .values(overdue=True)
+        .returning(Match.id, Match.tournament_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    by_tournament: Dict[int, List[int]] = {}
+    for match_id, tournament_id in flagged:
+        by_tournament.setdefault(tournament_id, []).append(match_id)
+    if by_tournament:
+        db.execute(
+            update(Tournament)
+            .where(Tournament.id.in_(list(by_tournament)))
+            .values(**version_bump())
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+    for tournament_id, ids in by_tournament.items():
+        publish_match_changes(
+            tournament_id, [{"id": match_id, "overdue": True} for match_id in sorted(ids)]
+        )
+    return len(flagged)
@@ -0,0 +1,63 @@
+"""
+Live tournament updates.
+
+Handlers call these after committing; each change is published as one
+compact JSON message on the tournament's channel, and the WebSocket
+endpoint in routers/live.py forwards it to spectators. Match messages only
+carry the fields that changed, keyed by match id.
+"""
+
+import json
+from typing import Any, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.participant import Participant
+from app.schemas.participant import ParticipantResponse
+from app.utils.broker import create_broker
+
+broker = create_broker()
+
+
+def tournament_channel(tournament_id: int) -> str:
+    return f"tournament:{tournament_id}"
+
+
+def _publish(tournament_id: int, message: Dict[str, Any]) -> None:
+    body = json.dumps(jsonable_encoder(message), separators=(",", ":"))
+    broker.publish(tournament_channel(tournament_id), body)
+
+
+def publish_match_changes(tournament_id: int, changes: List[Dict[str, Any]]) -> None:
+    """Publish changed match fields; each change is {"id": match id, field: value, ...}."""
+    if changes:
+        _publish(tournament_id, {"type": "matches", "changes": changes})
+
+
+def publish_participant_joined(participant: Participant) -> None:
+    _publish(
+        participant.tournament_id,
+        {
+            "type": "participant_joined",
+            "participant": ParticipantResponse.model_validate(participant),
+        },
+    )
+
+
+def publish_participants_imported(tournament_id: int, added: int) -> None:
+    """Participants were imported in bulk; clients should refetch the list."""
+    _publish(tournament_id, {"type": "participants_imported", "added": added})
+
+
+def publish_participant_left(tournament_id: int, user_id: int) -> None:
+    _publish(tournament_id, {"type": "participant_left", "user_id": user_id})
+
+
+def publish_round_paired(tournament_id: int, round_number: int) -> None:
+    """A new Swiss round was added; clients should fetch its matches."""
+    _publish(tournament_id, {"type": "round_paired", "round": round_number})
+
+
+def publish_bracket_created(tournament_id: int) -> None:
+    """The whole bracket was (re)generated; clients should refetch it."""
+    _publish(tournament_id, {"type": "bracket_created"})
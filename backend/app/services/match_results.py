@@ -0,0 +1,170 @@
+"""
+Reporting many match results at once.
+
+Every targeted match (and every successor a result feeds) is read in one
+IN query, the results are applied in order to plain in-memory copies, and
+all changed rows are written back with a single executemany UPDATE. A
+batch costs about the same number of round-trips as one result.
+"""
+
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.models.match import Match, MatchStatus
+from app.models.participant import Participant
+from app.models.user import User
+from app.models.tournament import Tournament
+from app.schemas.match import MatchBatchItem, MatchBatchResult, MatchResponse
+from app.services.advancement import AdvancementError, placements, schedule_if_ready
+from app.services.ratings import record_ratings
+from app.services.standings import record_results
+from app.services.versioning import bump_version
+
+# Columns a result may change, directly or by advancing a player
+WRITABLE_COLUMNS = (
+    "status",
+    "scheduled_at",
+    "completed_at",
+    "player1_score",
+    "player2_score",
+    "player1_id",
+    "player2_id",
+    "winner_id",
+    "overdue",
+)
+
+
+def _load(db: Session, tournament_id: int, ids: Iterable[int]) -> Dict[int, SimpleNamespace]:
+    rows = db.execute(
+        select(*Match.__table__.columns).where(
+            Match.tournament_id == tournament_id, Match.id.in_(set(ids))
+        )
+    )
+    return {row.id: SimpleNamespace(**row._mapping) for row in rows}
+
+
+def apply_results(
+    db: Session, tournament: Tournament, items: List[MatchBatchItem]
+) -> Tuple[List[MatchBatchResult], List[Dict[str, Any]]]:
+    """
+    Apply match updates in order, returning one result per item and the
+    changed fields of every changed match ({"id": match id, field: value}).
+
+    Items that fail validation are reported and skipped; the others are
+    written. Later items see the effect of earlier ones, so a batch may
+    complete a match and then the match its winner moved into. The match
+    returned with each result is its state after the whole batch. Does not
+    commit.
+    """
+    tournament_id = tournament.id
+    matches = _load(db, tournament_id, (item.id for item in items))
+    # Successors of the targeted matches, for the "already played" check
+    successor_ids = {
+        match_id
+        for match in matches.values()
+        for match_id in (match.next_match_id, match.loser_next_match_id)
+        if match_id is not None and match_id not in matches
+    }
+    if successor_ids:
+        matches.update(_load(db, tournament_id, successor_ids))
+    original = {match_id: vars(match).copy() for match_id, match in matches.items()}
+
+    now = datetime.now(timezone.utc)
+    results = []
+    changed = set()
+    for item in items:
+        match = matches.get(item.id)
+        if match is None:
+            results.append(MatchBatchResult(id=item.id, ok=False, error="Match not found"))
+            continue
+
+        updated = SimpleNamespace(**vars(match))
+        fields = item.model_dump(exclude_unset=True, exclude={"id"})
+        for field, value in fields.items():
+            setattr(updated, field, value)
+        if "scheduled_at" in fields:
+            updated.overdue = False
+
+        try:
+            moves = placements(updated)
+            for match_id, slot, _ in moves:
+                successor = matches.get(match_id)
+                if successor is not None and successor.status == MatchStatus.COMPLETED:
+                    raise AdvancementError("The next match has already been played")
+        except AdvancementError as exc:
+            results.append(MatchBatchResult(id=item.id, ok=False, error=str(exc)))
+            continue
+
+        matches[item.id] = updated
+        changed.add(item.id)
+        for match_id, slot, participant_id in moves:
+            successor = matches.get(match_id)
+            if successor is not None:
+                setattr(successor, f"player{slot}_id", participant_id)
+                schedule_if_ready(successor, now)
+                changed.add(match_id)
+        results.append(MatchBatchResult(id=item.id, ok=True))
+
+    if changed:
+        db.execute(
+            update(Match.__table__).where(Match.id == bindparam("match_id")),
+            [
+                {
+                    "match_id": match_id,
+                    **{column: getattr(matches[match_id], column) for column in WRITABLE_COLUMNS},
+                }
+                for match_id in sorted(changed)
+            ],
+        )
+        # Id order puts every match after the matches feeding it, so ratings
+        # are applied in the order the matches were played
+        outcomes = [
+            (SimpleNamespace(**original[match_id]), matches[match_id])
+            for match_id in sorted(changed)
+        ]
+        record_results(db, tournament, outcomes)
+        record_ratings(db, tournament, outcomes)
+        bump_version(db, tournament_id)
+
+    # The players' display names, for every returned match, in one query
+    returned = [matches[result.id] for result in results if result.ok]
+    player_ids = {
+        player_id
+        for match in returned
+        for player_id in (match.player1_id, match.player2_id)
+        if player_id is not None
+    }
+    names = {}
+    if player_ids:
+        names = dict(
+            db.execute(
+                select(Participant.id, User.display_name)
+                .join(User, User.id == Participant.user_id)
+                .where(Participant.id.in_(player_ids))
+            ).all()
+        )
+    for result in results:
+        if result.ok:
+            match = matches[result.id]
+            result.match = MatchResponse.model_validate(
+                {
+                    **vars(match),
+                    "player1_name": names.get(match.player1_id),
+                    "player2_name": names.get(match.player2_id),
+                }
+            )
+
+    changes = []
+    for match_id in sorted(changed):
+        diff = {
+            column: getattr(matches[match_id], column)
+            for column in WRITABLE_COLUMNS
+            if getattr(matches[match_id], column) != original[match_id][column]
+        }
+        if diff:
+            changes.append({"id": match_id, **diff})
+    return results, changes
@@ -0,0 +1,277 @@
+"""
+Bulk participant import for organizer-managed events.
+
+An organizer uploads rows naming a user by id or email, optionally with a
+seed. import_participants() resolves every row with chunked IN queries,
+compares the result against the tournament's existing participants in one
+query, then inserts the new participants with a single executemany and sets
+the seeds of the ones already registered. All of it happens in the caller's
+transaction. Rows that cannot be imported are reported by row number
+instead of failing the whole upload.
+
+Capacity is claimed with the same conditional UPDATE as a single join
+(services/registration.py), so an import never overfills a tournament
+that players are joining at the same time.
+"""
+
+import csv
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import bulk_insert
+from app.models.participant import Participant
+from app.models.tournament import Tournament
+from app.models.user import User
+from app.services.registration import NOT_STARTED, RegistrationError, TournamentNotFoundError
+from app.services.versioning import version_bump
+
+# Bound parameters per IN query, well under every backend's limit
+RESOLVE_CHUNK_SIZE = 500
+
+# Participants can be imported until the tournament starts
+IMPORTABLE = NOT_STARTED
+
+
+class ImportConflictError(RegistrationError):
+    """The tournament changed while the import ran; retrying is safe."""
+
+
+@dataclass
+class ImportRow:
+    row: int
+    user_id: Optional[int] = None
+    email: Optional[str] = None
+    seed: Optional[int] = None
+
+
+@dataclass
+class ImportResult:
+    added: int = 0
+    seeded: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def fail(self, row: int, error: str) -> None:
+        self.errors.append({"row": row, "error": error})
+
+
+def _optional_int(value: Any, name: str, minimum: int) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be an integer")
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if number < minimum or (isinstance(value, float) and number != value):
+        raise ValueError(f"{name} must be an integer of at least {minimum}")
+    return number
+
+
+def parse_record(
+    row: int, record: Mapping[str, Any], result: ImportResult
+) -> Optional[ImportRow]:
+    """One uploaded record as an ImportRow, or None with the error added to `result`."""
+    try:
+        user_id = _optional_int(record.get("user_id"), "user_id", 1)
+        seed = _optional_int(record.get("seed"), "seed", 1)
+    except ValueError as exc:
+        result.fail(row, str(exc))
+        return None
+
+    email = record.get("email")
+    if email is not None and not isinstance(email, str):
+        result.fail(row, "email must be a string")
+        return None
+    email = email.strip() if email else None
+
+    if (user_id is None) == (email is None):
+        result.fail(row, "Give either user_id or email")
+        return None
+    return ImportRow(row, user_id, email, seed)
+
+
+class CsvRecords:
+    """
+    Parse CSV text fed in pieces as it is uploaded. The first line is the
+    header and must name user_id or email, and may name seed. Quoted values
+    cannot span lines.
+    """
+
+    def __init__(self, result: ImportResult):
+        self.result = result
+        self.rows: List[ImportRow] = []
+        self._header: Optional[List[str]] = None
+        self._pending = ""
+        self._count = 0
+
+    def feed(self, text: str) -> None:
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        self._parse(lines)
+
+    def close(self) -> List[ImportRow]:
+        if self._pending:
+            self._parse([self._pending])
+            self._pending = ""
+        if self._header is None:
+            raise ValueError("The CSV upload is empty")
+        return self.rows
+
+    def _parse(self, lines: List[str]) -> None:
+        for values in csv.reader(line.rstrip("\r") for line in lines):
+            if not any(value.strip() for value in values):
+                continue
+            if self._header is None:
+                self._header = [name.strip().lower() for name in values]
+                if "user_id" not in self._header and "email" not in self._header:
+                    raise ValueError("The CSV header must name a user_id or email column")
+                continue
+            self._count += 1
+            parsed = parse_record(self._count, dict(zip(self._header, values)), self.result)
+            if parsed is not None:
+                self.rows.append(parsed)
+
+
+def json_records(records: Any, result: ImportResult) -> List[ImportRow]:
+    """Rows from an uploaded JSON array of {"user_id" or "email", "seed"} objects."""
+    if not isinstance(records, list):
+        raise ValueError("The JSON upload must be an array of objects")
+    rows = []
+    for index, record in enumerate(records, start=1):
+        if not isinstance(record, dict):
+            result.fail(index, "Each entry must be an object")
+            continue
+        parsed = parse_record(index, record, result)
+        if parsed is not None:
+            rows.append(parsed)
+    return rows
+
+
+def _chunks(values: Sequence[Any]) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(values), RESOLVE_CHUNK_SIZE):
+        yield values[start : start + RESOLVE_CHUNK_SIZE]
+
+
+def _resolve_users(db: Session, rows: List[ImportRow], result: ImportResult) -> List[ImportRow]:
+    """Fill in user_id for rows given by email; drop rows naming no user."""
+    emails = sorted({row.email for row in rows if row.email is not None})
+    ids = sorted({row.user_id for row in rows if row.user_id is not None})
+
+    by_email: Dict[str, int] = {}
+    for chunk in _chunks(emails):
+        by_email.update(
+            db.execute(select(User.email, User.id).where(User.email.in_(chunk))).all()
+        )
+    known_ids = set()
+    for chunk in _chunks(ids):
+        known_ids.update(db.scalars(select(User.id).where(User.id.in_(chunk))))
+
+    resolved = []
+    for row in rows:
+        if row.email is not None:
+            row.user_id = by_email.get(row.email)
+            if row.user_id is None:
+                result.fail(row.row, f"No user with email {row.email}")
+                continue
+        elif row.user_id not in known_ids:
+            result.fail(row.row, f"No user with id {row.user_id}")
+            continue
+        resolved.append(row)
+    return resolved
+
+
+def import_participants(
+    db: Session, tournament_id: int, rows: List[ImportRow], result: ImportResult
+) -> ImportResult:
+    """
+    Add the users named by `rows` to the tournament, in row order until it is
+    full, and set the seeds given for users already in it. Errors go to
+    `result` by row. Does not commit; on RegistrationError the caller must
+    roll back.
+    """
+    tournament = db.execute(
+        select(
+            Tournament.status, Tournament.participant_count, Tournament.max_participants
+        ).where(Tournament.id == tournament_id)
+    ).first()
+    if tournament is None:
+        raise TournamentNotFoundError("Tournament not found")
+    if tournament.status not in IMPORTABLE:
+        raise RegistrationError("Tournament has already started")
+
+    rows = _resolve_users(db, rows, result)
+
+    # The set difference against who is already registered, in one query
+    existing = dict(
+        db.execute(
+            select(Participant.user_id, Participant.id).where(
+                Participant.tournament_id == tournament_id
+            )
+        ).all()
+    )
+    free = (
+        None
+        if tournament.max_participants is None
+        else max(tournament.max_participants - tournament.participant_count, 0)
+    )
+
+    first_row: Dict[int, int] = {}
+    new_rows: List[Dict[str, Any]] = []
+    seeds: List[Dict[str, Any]] = []
+    for row in rows:
+        if row.user_id in first_row:
+            result.fail(row.row, f"Same user as row {first_row[row.user_id]}")
+            continue
+        first_row[row.user_id] = row.row
+        if row.user_id in existing:
+            if row.seed is not None:
+                seeds.append({"participant_id": existing[row.user_id], "seed": row.seed})
+            continue
+        if free is not None and len(new_rows) >= free:
+            result.fail(row.row, "Tournament is full")
+            continue
+        new_rows.append({"user_id": row.user_id, "seed": row.seed})
+
+    if not new_rows and not seeds:
+        return result
+
+    # Claim the places, or fail if joins or another import took them meanwhile
+    claimed = db.execute(
+        update(Tournament)
+        .where(
+            Tournament.id == tournament_id,
+            Tournament.status.in_(IMPORTABLE),
+            or_(
+                Tournament.max_participants.is_(None),
+                Tournament.participant_count + len(new_rows) <= Tournament.max_participants,
+            ),
+        )
+        .values(participant_count=Tournament.participant_count + len(new_rows), **version_bump())
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount == 0:
+        raise ImportConflictError("The tournament changed during the import; try again")
+
+    try:
+        bulk_insert(db, Participant.__table__, new_rows, tournament_id=tournament_id)
+    except IntegrityError:
+        # One of the users joined by themselves since the existing rows were read
+        raise ImportConflictError("The tournament changed during the import; try again")
+
+    if seeds:
+        table = Participant.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("participant_id"))
+            .values(seed=bindparam("seed")),
+            seeds,
+        )
+
+    result.added = len(new_rows)
+    result.seeded = len(seeds)
+    return result
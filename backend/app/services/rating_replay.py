@@ -0,0 +1,239 @@
+"""
+Recompute every rating from the match history.
+
+The history is loaded into NumPy arrays once and replayed in chronological
+rating periods. Within a period every player is rated against their
+opponents' start-of-period ratings, which is what makes a period a handful
+of array operations instead of a loop over matches: sums per player are
+np.bincount calls, and the volatility equation is solved for all active
+players at once. Players who sit a period out only have their RD grow.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.database import bulk_insert, utc_timestamp
+from app.models.match import Match, MatchStatus
+from app.models.participant import Participant
+from app.models.rating import PlayerRating
+from app.models.tournament import Tournament
+from app.services.ratings import (
+    CONVERGENCE,
+    DEFAULT_RATING,
+    DEFAULT_RD,
+    DEFAULT_VOLATILITY,
+    SCALE,
+    TAU,
+)
+
+DEFAULT_PERIOD_DAYS = 7
+LOAD_BATCH_SIZE = 100_000
+# Safety net for the volatility solver; it converges in a few iterations
+MAX_ITERATIONS = 100
+
+
+def _g(phi: np.ndarray) -> np.ndarray:
+    return 1 / np.sqrt(1 + 3 * phi * phi / (np.pi * np.pi))
+
+
+def _new_volatility(
+    phi: np.ndarray, sigma: np.ndarray, delta: np.ndarray, v: np.ndarray
+) -> np.ndarray:
+    """Vectorized Illinois solve of the volatility equation (step 5)."""
+    a = np.log(sigma * sigma)
+    phi2 = phi * phi
+    delta2 = delta * delta
+
+    def f(x, i):
+        ex = np.exp(x)
+        return ex * (delta2[i] - phi2[i] - v[i] - ex) / (
+            2 * (phi2[i] + v[i] + ex) ** 2
+        ) - (x - a[i]) / (TAU * TAU)
+
+    everyone = np.arange(len(a))
+    A = a.copy()
+    B = np.empty_like(a)
+    above = delta2 > phi2 + v
+    B[above] = np.log(delta2[above] - phi2[above] - v[above])
+
+    pending = np.flatnonzero(~above)
+    k = 1
+    while len(pending):
+        x = a[pending] - k * TAU
+        found = f(x, pending) >= 0
+        B[pending[found]] = x[found]
+        pending = pending[~found]
+        k += 1
+
+    f_a = f(A, everyone)
+    f_b = f(B, everyone)
+    active = np.flatnonzero(np.abs(B - A) > CONVERGENCE)
+    for _ in range(MAX_ITERATIONS):
+        if not len(active):
+            break
+        C = A[active] + (A[active] - B[active]) * f_a[active] / (f_b[active] - f_a[active])
+        f_c = f(C, active)
+        swap = f_c * f_b[active] <= 0
+        A[active] = np.where(swap, B[active], A[active])
+        f_a[active] = np.where(swap, f_b[active], f_a[active] / 2)
+        B[active] = C
+        f_b[active] = f_c
+        active = active[np.abs(B[active] - A[active]) > CONVERGENCE]
+
+    return np.exp(A / 2)
+
+
+def replay(
+    periods: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+    score: np.ndarray,
+    player_count: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rate `player_count` players from scratch over a match history.
+
+    Matches are given by parallel arrays sorted by period: the rating
+    period of each match, its two players (indices below player_count) and
+    the first player's score. Returns (rating, rd, volatility) per player.
+    """
+    mu = np.zeros(player_count)
+    phi = np.full(player_count, DEFAULT_RD / SCALE)
+    sigma = np.full(player_count, DEFAULT_VOLATILITY)
+    max_phi = DEFAULT_RD / SCALE
+
+    starts = np.flatnonzero(np.diff(periods)) + 1
+    bounds = zip(np.concatenate(([0], starts)), np.concatenate((starts, [len(periods)])))
+    previous_period = None
+    for lo, hi in bounds:
+        # Every period passed since the last one (including empty ones) grows RDs
+        period = periods[lo]
+        idle = 0 if previous_period is None else int(period - previous_period - 1)
+        previous_period = period
+        if idle:
+            phi = np.minimum(np.sqrt(phi * phi + idle * sigma * sigma), max_phi)
+
+        players = np.concatenate((first[lo:hi], second[lo:hi]))
+        opponents = np.concatenate((second[lo:hi], first[lo:hi]))
+        scores = np.concatenate((score[lo:hi], 1 - score[lo:hi]))
+
+        active, slot = np.unique(players, return_inverse=True)
+        g = _g(phi[opponents])
+        expected = 1 / (1 + np.exp(-g * (mu[players] - mu[opponents])))
+        v = 1 / np.bincount(slot, g * g * expected * (1 - expected), len(active))
+        improvement = np.bincount(slot, g * (scores - expected), len(active))
+
+        new_sigma = _new_volatility(phi[active], sigma[active], v * improvement, v)
+        phi_star = np.sqrt(phi[active] ** 2 + new_sigma ** 2)
+        new_phi = 1 / np.sqrt(1 / (phi_star * phi_star) + 1 / v)
+        new_mu = mu[active] + new_phi * new_phi * improvement
+
+        # Players who sat this period out
+        phi = np.minimum(np.sqrt(phi * phi + sigma * sigma), max_phi)
+        mu[active], phi[active], sigma[active] = new_mu, new_phi, new_sigma
+
+    return DEFAULT_RATING + SCALE * mu, SCALE * phi, sigma
+
+
+def load_history(db: Session) -> Dict[str, np.ndarray]:
+    """Every completed match between two players, oldest first, as arrays."""
+    player1, player2 = aliased(Participant), aliased(Participant)
+    played_at = func.coalesce(Match.completed_at, Match.scheduled_at)
+    statement = (
+        select(
+            played_at,
+            player1.user_id,
+            player2.user_id,
+            case(
+                (Match.winner_id == Match.player1_id, 1.0),
+                (Match.winner_id == Match.player2_id, 0.0),
+                else_=0.5,
+            ),
+            Tournament.game,
+        )
+        .join(player1, player1.id == Match.player1_id)
+        .join(player2, player2.id == Match.player2_id)
+        .join(Tournament, Tournament.id == Match.tournament_id)
+        .where(Match.status == MatchStatus.COMPLETED, player1.user_id != player2.user_id)
+        .order_by(played_at, Match.id)
+    )
+
+    games: Dict[str, int] = {}
+    chunks = []
+    result = db.execute(statement.execution_options(yield_per=LOAD_BATCH_SIZE))
+    for partition in result.partitions():
+        times, users1, users2, scores, game_names = zip(*partition)
+        chunks.append(
+            (
+                np.fromiter((utc_timestamp(t) for t in times), float, len(times)),
+                np.array(users1, dtype=np.int64),
+                np.array(users2, dtype=np.int64),
+                np.array(scores, dtype=float),
+                np.fromiter(
+                    (games.setdefault(name, len(games)) for name in game_names),
+                    np.int64,
+                    len(game_names),
+                ),
+            )
+        )
+
+    names = ("time", "user1", "user2", "score", "game")
+    if not chunks:
+        history = {name: np.empty(0) for name in names}
+    else:
+        history = {
+            name: np.concatenate([chunk[i] for chunk in chunks])
+            for i, name in enumerate(names)
+        }
+    history["games"] = np.array(sorted(games, key=games.get), dtype=object)
+    return history
+
+
+def replay_ratings(db: Session, period_days: float = DEFAULT_PERIOD_DAYS) -> int:
+    """
+    Replace every rating with one replayed from the match history in
+    rating periods of `period_days`. Does not commit. Returns the number of
+    ratings written.
+    """
+    history = load_history(db)
+    db.execute(delete(PlayerRating))
+    if not len(history["time"]):
+        return 0
+
+    # One rating per (user, game): number the pairs densely
+    game_count = len(history["games"])
+    keys = np.concatenate(
+        (
+            history["user1"] * game_count + history["game"],
+            history["user2"] * game_count + history["game"],
+        )
+    )
+    pairs, index = np.unique(keys, return_inverse=True)
+    matches = len(history["time"])
+    first, second = index[:matches], index[matches:]
+
+    periods = (
+        (history["time"] - history["time"][0]) // (period_days * 86400)
+    ).astype(np.int64)
+    rating, rd, volatility = replay(periods, first, second, history["score"], len(pairs))
+    rated = np.bincount(index, minlength=len(pairs))
+
+    bulk_insert(
+        db,
+        PlayerRating.__table__,
+        [
+            {
+                "user_id": int(pair // game_count),
+                "game": history["games"][pair % game_count],
+                "rating": float(rating[i]),
+                "rd": float(rd[i]),
+                "volatility": float(volatility[i]),
+                "rated_matches": int(rated[i]),
+            }
+            for i, pair in enumerate(pairs)
+        ],
+    )
+    return len(pairs)
@@ -0,0 +1,175 @@
+"""
+Glicko-2 player ratings, one per user and game.
+
+Ratings are updated as matches complete: each newly completed match is
+treated as a rating period of one game for both of its players. Changing
+the result of an already completed match does not touch the ratings; run
+`python -m app.cli replay-ratings`, which recomputes them from the whole
+history in proper rating periods (services/rating_replay.py).
+
+See Glickman, "Example of the Glicko-2 system", for the formulas.
+"""
+
+import math
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert_rows
+from app.models.match import MatchStatus
+from app.models.participant import Participant
+from app.models.rating import PlayerRating
+from app.models.tournament import Tournament
+
+DEFAULT_RATING = 1500.0
+DEFAULT_RD = 350.0
+DEFAULT_VOLATILITY = 0.06
+# System constant: how fast volatility may change (Glickman suggests 0.3-1.2)
+TAU = 0.5
+# Conversion between the Glicko and Glicko-2 scales
+SCALE = 173.7178
+CONVERGENCE = 1e-6
+
+
+class Rating(NamedTuple):
+    rating: float = DEFAULT_RATING
+    rd: float = DEFAULT_RD
+    volatility: float = DEFAULT_VOLATILITY
+
+
+def _g(phi: float) -> float:
+    return 1 / math.sqrt(1 + 3 * phi * phi / (math.pi * math.pi))
+
+
+def _new_volatility(phi: float, sigma: float, delta: float, v: float) -> float:
+    """Solve for the new volatility with the Illinois algorithm (step 5)."""
+    a = math.log(sigma * sigma)
+
+    def f(x):
+        ex = math.exp(x)
+        return ex * (delta * delta - phi * phi - v - ex) / (
+            2 * (phi * phi + v + ex) ** 2
+        ) - (x - a) / (TAU * TAU)
+
+    A = a
+    if delta * delta > phi * phi + v:
+        B = math.log(delta * delta - phi * phi - v)
+    else:
+        k = 1
+        while f(a - k * TAU) < 0:
+            k += 1
+        B = a - k * TAU
+
+    f_a, f_b = f(A), f(B)
+    while abs(B - A) > CONVERGENCE:
+        C = A + (A - B) * f_a / (f_b - f_a)
+        f_c = f(C)
+        if f_c * f_b <= 0:
+            A, f_a = B, f_b
+        else:
+            f_a /= 2
+        B, f_b = C, f_c
+    return math.exp(A / 2)
+
+
+def glicko2(player: Rating, results: Sequence[Tuple[Rating, float]]) -> Rating:
+    """
+    Rate `player` after one rating period.
+
+    `results` holds (opponent's rating at the start of the period, score)
+    pairs, the score being 1 for a win, 0.5 for a draw and 0 for a loss.
+    """
+    mu = (player.rating - DEFAULT_RATING) / SCALE
+    phi = player.rd / SCALE
+    if not results:
+        phi = min(math.sqrt(phi * phi + player.volatility ** 2), DEFAULT_RD / SCALE)
+        return Rating(player.rating, phi * SCALE, player.volatility)
+
+    v_inv = 0.0
+    improvement = 0.0
+    for opponent, score in results:
+        g = _g(opponent.rd / SCALE)
+        expected = 1 / (1 + math.exp(-g * (mu - (opponent.rating - DEFAULT_RATING) / SCALE)))
+        v_inv += g * g * expected * (1 - expected)
+        improvement += g * (score - expected)
+    v = 1 / v_inv
+
+    sigma = _new_volatility(phi, player.volatility, v * improvement, v)
+    phi_star = math.sqrt(phi * phi + sigma * sigma)
+    phi = 1 / math.sqrt(1 / (phi_star * phi_star) + 1 / v)
+    mu = mu + phi * phi * improvement
+    return Rating(DEFAULT_RATING + SCALE * mu, SCALE * phi, sigma)
+
+
+def match_score(match) -> float:
+    """Score of player 1 in a completed match: 1, 0.5 for a draw, or 0."""
+    if match.winner_id is None:
+        return 0.5
+    return 1.0 if match.winner_id == match.player1_id else 0.0
+
+
+def newly_completed(before, after) -> bool:
+    return (
+        before.status != MatchStatus.COMPLETED
+        and after.status == MatchStatus.COMPLETED
+        and after.player1_id is not None
+        and after.player2_id is not None
+    )
+
+
+def record_ratings(
+    db: Session, tournament: Tournament, changes: Iterable[Tuple[object, object]]
+) -> None:
+    """
+    Rate the matches that `changes` ((before, after) match states, as for
+    standings.record_results) complete, in order. Does not commit.
+    """
+    completed = [after for before, after in changes if newly_completed(before, after)]
+    if not completed:
+        return
+
+    participant_ids = {pid for m in completed for pid in (m.player1_id, m.player2_id)}
+    user_ids = dict(
+        db.execute(
+            select(Participant.id, Participant.user_id).where(
+                Participant.id.in_(participant_ids)
+            )
+        ).all()
+    )
+    keys = {(user_id, tournament.game) for user_id in user_ids.values()}
+    ratings: Dict[Tuple[int, str], Rating] = {}
+    counts: Dict[Tuple[int, str], int] = {}
+    for row in db.execute(
+        select(PlayerRating).where(
+            tuple_(PlayerRating.user_id, PlayerRating.game).in_(list(keys))
+        )
+    ).scalars():
+        key = (row.user_id, row.game)
+        ratings[key] = Rating(row.rating, row.rd, row.volatility)
+        counts[key] = row.rated_matches
+
+    for match in completed:
+        first = (user_ids[match.player1_id], tournament.game)
+        second = (user_ids[match.player2_id], tournament.game)
+        if first == second:
+            continue
+        score = match_score(match)
+        one, two = ratings.get(first, Rating()), ratings.get(second, Rating())
+        ratings[first] = glicko2(one, [(two, score)])
+        ratings[second] = glicko2(two, [(one, 1 - score)])
+        for key in (first, second):
+            counts[key] = counts.get(key, 0) + 1
+
+    rows: List[dict] = [
+        {
+            "user_id": user_id,
+            "game": game,
+            "rating": rating.rating,
+            "rd": rating.rd,
+            "volatility": rating.volatility,
+            "rated_matches": counts[(user_id, game)],
+        }
+        for (user_id, game), rating in sorted(ratings.items())
+    ]
+    upsert_rows(db, PlayerRating.__table__, ("user_id", "game"), rows)
@@ -0,0 +1,129 @@
+"""
+Joining and leaving tournaments.
+
+The number of participants is kept on the tournament row, so capacity is
+enforced by a conditional UPDATE in the same transaction as the insert.
+The UPDATE locks the tournament row, which makes concurrent joins queue
+behind each other instead of all seeing a free place and overfilling it.
+"""
+
+from sqlalchemy import delete, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.participant import Participant
+from app.models.tournament import Tournament, TournamentStatus
+from app.services.versioning import version_bump
+
+
+class RegistrationError(ValueError):
+    """The user cannot join or leave the tournament."""
+
+
+class TournamentNotFoundError(RegistrationError):
+    pass
+
+
+class NotParticipantError(RegistrationError):
+    pass
+
+
+# Players can be added and removed until the tournament starts: after
+# that, its matches refer to them
+NOT_STARTED = (
+    TournamentStatus.DRAFT,
+    TournamentStatus.OPEN,
+    TournamentStatus.REGISTRATION_CLOSED,
+)
+
+
+def _join_failure(db: Session, tournament_id: int) -> RegistrationError:
+    # Only reached when the conditional update matched nothing
+    row = db.execute(
+        select(
+            Tournament.status, Tournament.participant_count, Tournament.max_participants
+        ).where(Tournament.id == tournament_id)
+    ).first()
+    if row is None:
+        return TournamentNotFoundError("Tournament not found")
+    if row.status != TournamentStatus.OPEN:
+        return RegistrationError("Tournament is not open for registration")
+    return RegistrationError("Tournament is full")
+
+
+def join_tournament(db: Session, tournament_id: int, user_id: int) -> Participant:
+    """
+    Add the user to an open tournament that has a free place.
+
+    Does not commit. On RegistrationError the caller must roll back, since
+    the participant count may already have been incremented.
+    """
+    claimed = db.execute(
+        update(Tournament)
+        .where(
+            Tournament.id == tournament_id,
+            Tournament.status == TournamentStatus.OPEN,
+            or_(
+                Tournament.max_participants.is_(None),
+                Tournament.participant_count < Tournament.max_participants,
+            ),
+        )
+        .values(participant_count=Tournament.participant_count + 1, **version_bump())
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount == 0:
+        raise _join_failure(db, tournament_id)
+
+    already_joined = (
+        select(Participant.id)
+        .where(
+            Participant.tournament_id == tournament_id,
+            Participant.user_id == user_id,
+        )
+        .exists()
+    )
+    try:
+        participant = db.scalar(
+            insert(Participant)
+            .from_select(
+                ["tournament_id", "user_id"],
+                select(literal(tournament_id), literal(user_id)).where(~already_joined),
+            )
+            .returning(Participant)
+        )
+    except IntegrityError:
+        # A concurrent join by the same user won the unique constraint
+        participant = None
+
+    if participant is None:
+        raise RegistrationError("Already joined this tournament")
+
+    return participant
+
+
+def leave_tournament(db: Session, tournament_id: int, user_id: int) -> None:
+    """
+    Remove the user from the tournament and free their place, unless it has
+    started. Does not commit; the caller rolls back on RegistrationError.
+    """
+    # Like a join, the conditional update locks the tournament row, so a
+    # concurrent start cannot slip in between the check and the delete
+    freed = db.execute(
+        update(Tournament)
+        .where(Tournament.id == tournament_id, Tournament.status.in_(NOT_STARTED))
+        .values(participant_count=Tournament.participant_count - 1, **version_bump())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not freed:
+        if db.get(Tournament, tournament_id) is None:
+            raise TournamentNotFoundError("Tournament not found")
+        raise RegistrationError("Tournament has already started")
+
+    removed = db.execute(
+        delete(Participant).where(
+            Participant.tournament_id == tournament_id,
+            Participant.user_id == user_id,
+        )
+    )
+    if removed.rowcount == 0:
+        raise NotParticipantError("You are not in this tournament")
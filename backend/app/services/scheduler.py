@@ -0,0 +1,189 @@
+"""
+In-process scheduler for the deadline jobs in services/deadlines.py.
+
+Started from the application lifespan in every worker, but only the
+worker holding the "deadlines" lease does anything: the others retry the
+lease every poll interval and take over once the holder stops renewing
+it. The holder reloads the timers falling due within the next two poll
+intervals from the indexed deadline columns into a heap, then sleeps
+until the earliest one, the next reload or the next lease renewal.
+Deadlines added or moved by any worker are picked up at the next reload;
+jobs are idempotent, so stale timers are harmless.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import UPSERT_INSERTS, SessionLocal
+from app.models.lease import Lease
+from app.services import deadlines
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "deadlines"
+
+
+def acquire_lease(db: Session, name: str, holder: str, duration: timedelta) -> bool:
+    """
+    Take or renew the named lease for `duration`; fails while another holder's
+    lease is unexpired. Commits.
+    """
+    now = datetime.now(timezone.utc)
+    statement = UPSERT_INSERTS[db.get_bind().dialect.name](Lease)
+    db.execute(
+        statement.values(name=name, holder=holder, expires_at=now + duration)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    claimed = db.execute(
+        update(Lease)
+        .where(Lease.name == name, or_(Lease.holder == holder, Lease.expires_at <= now))
+        .values(holder=holder, expires_at=now + duration)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return claimed == 1
+
+
+def release_lease(db: Session, name: str, holder: str) -> None:
+    """Let another worker take the lease straight away. Commits."""
+    db.execute(
+        update(Lease)
+        .where(Lease.name == name, Lease.holder == holder)
+        .values(expires_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+class DeadlineScheduler:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        poll_seconds: float = settings.scheduler_poll_seconds,
+        lease_seconds: float = settings.scheduler_lease_seconds,
+        overdue_grace_minutes: float = settings.match_overdue_grace_minutes,
+    ):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        self.overdue_grace = timedelta(minutes=overdue_grace_minutes)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self.jobs_run = 0
+        self._timers: List[deadlines.Timer] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.is_leader:
+            await asyncio.to_thread(self._with_session, release_lease, LEASE_NAME, self.holder)
+            self.is_leader = False
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "leader": self.is_leader,
+            "timers": len(self._timers),
+            "jobs_run": self.jobs_run,
+        }
+
+    def _with_session(self, function, *args):
+        db = self.session_factory()
+        try:
+            return function(db, *args)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._step()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Deadline scheduler step failed")
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _step(self) -> None:
+        self.is_leader = await asyncio.to_thread(
+            self._with_session, acquire_lease, LEASE_NAME, self.holder, self.lease
+        )
+        if not self.is_leader:
+            self._timers = []
+            await asyncio.sleep(self.poll_seconds)
+            return
+
+        # The lease is renewed on the next step, at most one poll interval away
+        renew_at = time.time() + self.poll_seconds
+        horizon = datetime.now(timezone.utc) + timedelta(seconds=2 * self.poll_seconds)
+        self._timers = await asyncio.to_thread(
+            self._with_session, deadlines.due_timers, horizon, self.overdue_grace
+        )
+        heapq.heapify(self._timers)
+
+        while True:
+            await self._run_due()
+            wake = min(self._timers[0][0], renew_at) if self._timers else renew_at
+            delay = wake - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if time.time() >= renew_at:
+                return
+
+    async def _run_due(self) -> None:
+        now = time.time()
+        due: Dict[str, List[int]] = defaultdict(list)
+        while self._timers and self._timers[0][0] <= now:
+            _, job, target = heapq.heappop(self._timers)
+            due[job].append(target)
+        if due:
+            await asyncio.to_thread(self._run_jobs, due)
+
+    def _run_jobs(self, due: Dict[str, List[int]]) -> None:
+        # Registration closes before a tournament due at the same time starts
+        now = datetime.now(timezone.utc)
+        if due[deadlines.CLOSE_REGISTRATION]:
+            self._job(
+                deadlines.close_registrations, due[deadlines.CLOSE_REGISTRATION], now
+            )
+        for tournament_id in due[deadlines.START_TOURNAMENT]:
+            self._job(deadlines.start_due_tournament, tournament_id, now)
+        if due[deadlines.FLAG_OVERDUE]:
+            self._job(
+                deadlines.flag_overdue_matches,
+                due[deadlines.FLAG_OVERDUE],
+                now,
+                self.overdue_grace,
+            )
+
+    def _job(self, function, *args) -> None:
+        # One failing job must not hold up the others
+        try:
+            self._with_session(function, *args)
+            self.jobs_run += 1
+        except Exception:
+            logger.exception("Deadline job %s failed", function.__name__)
+
+
+scheduler = DeadlineScheduler(SessionLocal)
@@ -0,0 +1,171 @@
+"""
+Ranked full-text search over tournament names, games and descriptions and
+user display names, using the index in models/search.py.
+
+Free text is turned into a query of its words, all of which must appear,
+each matching the start of a word (a single letter must match a whole
+word). Hits come in two tiers: those whose name (or display name) holds
+every word, then those matching only with the game or description, newest
+first within each tier.
+
+The tiers stand in for bm25: FTS5's bm25 reads the whole doclist of every
+word to weigh it, so a common word ("cup", a game's name) costs time in
+proportion to the table. Tiers read each doclist in document order and
+stop after a page, and search_titles being a table of its own means a word
+that is common elsewhere but absent from names is ruled out of the first
+tier straight away. Pages are keyset-paginated on (tier, document), so a
+deep page costs no more than the first.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    Integer,
+    Select,
+    and_,
+    case,
+    column,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.search import SEARCH_TABLE, TITLE_TABLE, TOURNAMENT, USER
+from app.models.tournament import Tournament
+from app.models.user import User
+from app.schemas.search import SearchKind
+
+# Words beyond this are ignored, which bounds the cost of a query
+MAX_TERMS = 8
+
+_WORD = re.compile(r"\w+")
+
+# Position of the last hit of a page: (tier, document id)
+After = Optional[Tuple[int, int]]
+
+
+def search_terms(text: str) -> List[str]:
+    """The words of a free-text query, lowercased."""
+    return _WORD.findall(text.lower())[:MAX_TERMS]
+
+
+def _sqlite_query(
+    terms: List[str], kind: Optional[SearchKind], after: After, limit: int
+) -> Select:
+    # Every word is quoted, so nothing in it is FTS5 syntax
+    words = " ".join(f'"{term}"*' if len(term) > 1 else f'"{term}"' for term in terms)
+    of_kind = f'kind : "{kind.value}" AND ' if kind is not None else ""
+    in_title = f"{of_kind}title : ({words})"
+    elsewhere = f"{of_kind}({{title game description}} : ({words}) NOT title : ({words}))"
+
+    titles = table(TITLE_TABLE, column("rowid", Integer))
+    index = table(SEARCH_TABLE, column("rowid", Integer))
+    first = select(titles.c.rowid.label("document"), literal(0).label("tier")).where(
+        literal_column(TITLE_TABLE).op("MATCH")(in_title)
+    )
+    second = select(index.c.rowid, literal(1)).where(
+        literal_column(SEARCH_TABLE).op("MATCH")(elsewhere)
+    )
+    tiers = [first, second]
+    if after is not None:
+        after_tier, after_document = after
+        if after_tier == 0:
+            tiers = [first.where(titles.c.rowid < after_document), second]
+        else:
+            tiers = [second.where(index.c.rowid < after_document)]
+
+    # Both sides come out of FTS5 in document order, so this is a merge that
+    # stops after `limit` rows
+    hits = (
+        union_all(*tiers)
+        .order_by(literal_column("tier"), literal_column("document").desc())
+        .limit(limit)
+        .subquery()
+    )
+
+    is_user = hits.c.document % 2 == USER
+    row_id = hits.c.document // 2
+    return (
+        select(
+            case((is_user, SearchKind.USER.value), else_=SearchKind.TOURNAMENT.value).label(
+                "kind"
+            ),
+            row_id.label("id"),
+            func.coalesce(Tournament.name, User.display_name).label("title"),
+            Tournament.game,
+            hits.c.tier,
+            hits.c.document,
+        )
+        .select_from(hits)
+        .outerjoin(Tournament, (Tournament.id == row_id) & ~is_user)
+        .outerjoin(User, (User.id == row_id) & is_user)
+        .order_by(hits.c.tier, hits.c.document.desc())
+    )
+
+
+def _postgresql_query(
+    terms: List[str], kind: Optional[SearchKind], after: After, limit: int
+) -> Select:
+    # Single letters must be whole words, as in SQLite; weight A is the name
+    words = [f"{term}:*" if len(term) > 1 else f"{term}:" for term in terms]
+    query = func.to_tsquery("simple", " & ".join(word.rstrip(":") for word in words))
+    in_title = func.to_tsquery("simple", " & ".join(f"{word}A" for word in words))
+
+    selects = []
+    for model, code, search_kind, title, game in (
+        (Tournament, TOURNAMENT, SearchKind.TOURNAMENT, Tournament.name, Tournament.game),
+        (User, USER, SearchKind.USER, User.display_name, literal(None)),
+    ):
+        if kind not in (None, search_kind):
+            continue
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        selects.append(
+            select(
+                literal(search_kind.value).label("kind"),
+                model.id.label("id"),
+                title.label("title"),
+                game.label("game"),
+                case((vector.op("@@")(in_title), 0), else_=1).label("tier"),
+                (model.id * 2 + code).label("document"),
+            ).where(vector.op("@@")(query))
+        )
+    hits = union_all(*selects).subquery()
+
+    statement = select(*hits.c)
+    if after is not None:
+        after_tier, after_document = after
+        statement = statement.where(
+            or_(
+                hits.c.tier > after_tier,
+                and_(hits.c.tier == after_tier, hits.c.document < after_document),
+            )
+        )
+    return statement.order_by(hits.c.tier, hits.c.document.desc()).limit(limit)
+
+
+QUERIES = {
+    "sqlite": _sqlite_query,
+    "postgresql": _postgresql_query,
+}
+
+
+async def search(
+    db: AsyncSession, text: str, kind: Optional[SearchKind], after: After, limit: int
+) -> List[Dict[str, Any]]:
+    """
+    Up to `limit` hits for `text` following the hit at `after`, best first.
+    Each has the kind, id, title and game, and the tier and document that
+    place it for the next page's `after`. Empty if `text` has no words.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+    build = QUERIES[db.get_bind().dialect.name]
+    result = await db.execute(build(terms, kind, after, limit))
+    return [row._asdict() for row in result]
@@ -0,0 +1,236 @@
+"""
+Standings and player statistics.
+
+Every match result contributes a record (played, wins, losses, draws,
+points, scores) to both of its participants. The standings and
+player_stats tables hold the sums of those records and are kept current
+incrementally: when results change, the difference between each match's
+old and new contribution is added in the same transaction, with one
+executemany upsert per table. rebuild_aggregates() recomputes both tables
+from the match history with two INSERT ... SELECT statements.
+"""
+
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import case, delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.database import increment_rows
+from app.models.match import Match, MatchStatus
+from app.models.participant import Participant
+from app.models.stats import PlayerStats, Standing
+from app.models.tournament import Tournament
+
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+# Match columns a result depends on
+OUTCOME_FIELDS = (
+    "status",
+    "player1_id",
+    "player2_id",
+    "winner_id",
+    "player1_score",
+    "player2_score",
+)
+# What a bye adds on top of an empty record
+BYE_RECORD = {"played": 1, "wins": 1, "points": WIN_POINTS}
+COUNTERS = (
+    "played",
+    "wins",
+    "losses",
+    "draws",
+    "points",
+    "score_for",
+    "score_against",
+    "score_diff",
+)
+
+
+def snapshot(match) -> SimpleNamespace:
+    """Copy of the fields of a match that decide its contribution."""
+    return SimpleNamespace(**{field: getattr(match, field) for field in OUTCOME_FIELDS})
+
+
+def _contribution(match) -> Dict[int, Dict[str, int]]:
+    """What a match adds to each participant's record; completed matches only."""
+    if match.status != MatchStatus.COMPLETED or match.player1_id is None:
+        return {}
+    if match.player2_id is None:
+        # A bye (Swiss) counts as a win without scores
+        if match.winner_id != match.player1_id:
+            return {}
+        return {match.player1_id: {**dict.fromkeys(COUNTERS, 0), **BYE_RECORD}}
+
+    records = {}
+    sides = (
+        (match.player1_id, match.player1_score, match.player2_id, match.player2_score),
+        (match.player2_id, match.player2_score, match.player1_id, match.player1_score),
+    )
+    for participant_id, own, opponent_id, theirs in sides:
+        win = int(match.winner_id == participant_id)
+        draw = int(match.winner_id is None)
+        own, theirs = own or 0, theirs or 0
+        records[participant_id] = {
+            "played": 1,
+            "wins": win,
+            "losses": int(match.winner_id == opponent_id),
+            "draws": draw,
+            "points": WIN_POINTS * win + DRAW_POINTS * draw,
+            "score_for": own,
+            "score_against": theirs,
+            "score_diff": own - theirs,
+        }
+    return records
+
+
+def record_results(
+    db: Session, tournament: Tournament, changes: Iterable[Tuple[object, object]]
+) -> None:
+    """
+    Apply changed match results to standings and player_stats.
+
+    `changes` holds (before, after) states of each changed match, as Match
+    objects or snapshot()s. Does not commit.
+    """
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+    for before, after in changes:
+        for participant_id, record in _contribution(after).items():
+            deltas[participant_id].update(record)
+        for participant_id, record in _contribution(before).items():
+            deltas[participant_id].subtract(record)
+
+    deltas = {pid: delta for pid, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+
+    user_ids = dict(
+        db.execute(
+            select(Participant.id, Participant.user_id).where(Participant.id.in_(deltas))
+        ).all()
+    )
+
+    increment_rows(
+        db,
+        Standing.__table__,
+        ("tournament_id", "participant_id"),
+        [
+            {
+                "tournament_id": tournament.id,
+                "participant_id": participant_id,
+                **{name: delta[name] for name in COUNTERS},
+            }
+            for participant_id, delta in sorted(deltas.items())
+        ],
+    )
+
+    per_user: Dict[int, Counter] = defaultdict(Counter)
+    for participant_id, delta in deltas.items():
+        per_user[user_ids[participant_id]].update(delta)
+    increment_rows(
+        db,
+        PlayerStats.__table__,
+        ("user_id", "game"),
+        [
+            {
+                "user_id": user_id,
+                "game": tournament.game,
+                **{name: delta[name] for name in COUNTERS},
+            }
+            for user_id, delta in sorted(per_user.items())
+        ],
+    )
+
+
+def _sides():
+    """
+    Every completed match twice, once from each player's side, and every
+    bye once.
+    """
+    completed = (
+        Match.status == MatchStatus.COMPLETED,
+        Match.player1_id.is_not(None),
+        Match.player2_id.is_not(None),
+    )
+
+    def side(own_id, own_score, other_id, other_score):
+        return select(
+            Match.tournament_id.label("tournament_id"),
+            own_id.label("participant_id"),
+            func.coalesce(own_score, 0).label("score_for"),
+            func.coalesce(other_score, 0).label("score_against"),
+            case((Match.winner_id == own_id, 1), else_=0).label("win"),
+            case((Match.winner_id == other_id, 1), else_=0).label("loss"),
+            case((Match.winner_id.is_(None), 1), else_=0).label("draw"),
+        ).where(*completed)
+
+    byes = select(
+        Match.tournament_id,
+        Match.player1_id,
+        literal(0),
+        literal(0),
+        literal(1),
+        literal(0),
+        literal(0),
+    ).where(
+        Match.status == MatchStatus.COMPLETED,
+        Match.player2_id.is_(None),
+        Match.winner_id == Match.player1_id,
+    )
+
+    return union_all(
+        side(Match.player1_id, Match.player1_score, Match.player2_id, Match.player2_score),
+        side(Match.player2_id, Match.player2_score, Match.player1_id, Match.player1_score),
+        byes,
+    ).subquery()
+
+
+def _record_sums(sides):
+    """Aggregates matching the COUNTERS, in order."""
+    wins, draws = func.sum(sides.c.win), func.sum(sides.c.draw)
+    score_for, score_against = func.sum(sides.c.score_for), func.sum(sides.c.score_against)
+    return (
+        func.count(),
+        wins,
+        func.sum(sides.c.loss),
+        draws,
+        WIN_POINTS * wins + DRAW_POINTS * draws,
+        score_for,
+        score_against,
+        score_for - score_against,
+    )
+
+
+def rebuild_aggregates(db: Session) -> Tuple[int, int]:
+    """
+    Recompute standings and player_stats from every completed match.
+    Does not commit. Returns the number of standings and player_stats rows.
+    """
+    db.execute(delete(Standing))
+    db.execute(delete(PlayerStats))
+
+    sides = _sides()
+    db.execute(
+        insert(Standing).from_select(
+            ["tournament_id", "participant_id", *COUNTERS],
+            select(sides.c.tournament_id, sides.c.participant_id, *_record_sums(sides))
+            .group_by(sides.c.tournament_id, sides.c.participant_id),
+        )
+    )
+    db.execute(
+        insert(PlayerStats).from_select(
+            ["user_id", "game", *COUNTERS],
+            select(Participant.user_id, Tournament.game, *_record_sums(sides))
+            .select_from(sides)
+            .join(Participant, Participant.id == sides.c.participant_id)
+            .join(Tournament, Tournament.id == sides.c.tournament_id)
+            .group_by(Participant.user_id, Tournament.game),
+        )
+    )
+
+    return (
+        db.scalar(select(func.count()).select_from(Standing)),
+        db.scalar(select(func.count()).select_from(PlayerStats)),
+    )
@@ -0,0 +1,186 @@
+"""
+Running a Swiss tournament round by round.
+
+Only the first round exists when the tournament starts. Whenever a result
+completes the current round, the next one is paired from the standings
+(scores) and the pairing history stored in swiss_states, then written
+with one bulk insert. Byes are written as completed matches won by their
+only player, so they score like a win.
+
+NumPy and the pairing engine are imported when a round is paired: every
+match endpoint imports this module for advance_round(), and most matches
+are not Swiss.
+"""
+
+import math
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Optional, Sequence
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import bulk_insert
+from app.models.match import Match, MatchBracket, MatchStatus
+from app.models.stats import Standing
+from app.models.swiss import SwissState
+from app.models.tournament import Tournament, TournamentFormat, TournamentStatus
+from app.services.standings import record_results
+
+
+def default_rounds(player_count: int) -> int:
+    """Enough rounds to leave a single player with a perfect score."""
+    return max(1, math.ceil(math.log2(player_count)))
+
+
+def start(db: Session, tournament: Tournament, participant_ids: Sequence[int]) -> int:
+    """
+    Create the pairing state and pair round one; participant_ids are in
+    seed order. Does not commit. Returns the number of matches created.
+    """
+    import numpy as np
+
+    from app.services.swiss_pairing import BYE
+
+    count = len(participant_ids)
+    if count < 2:
+        raise ValueError("At least two participants are needed to build a bracket")
+    rounds = tournament.rounds or default_rounds(count)
+    if not 1 <= rounds < count:
+        raise ValueError(
+            f"A Swiss tournament of {count} players can have 1 to {count - 1} rounds"
+        )
+
+    state = SwissState(
+        tournament_id=tournament.id,
+        round=0,
+        rounds=rounds,
+        participant_ids=np.asarray(participant_ids, dtype=np.int32).tobytes(),
+        opponents=np.full((count, rounds), BYE, dtype=np.int32).tobytes(),
+        sides=np.zeros((count, rounds), dtype=np.int8).tobytes(),
+    )
+    db.add(state)
+    db.flush()
+    return _pair_next_round(db, tournament, state)
+
+
+def advance_round(db: Session, tournament: Tournament) -> Optional[int]:
+    """
+    Pair the next round once every match of the current one is completed,
+    or complete the tournament after its last round. Call after applying
+    results; does nothing for other formats. Does not commit. Returns the
+    number of the round paired, if any.
+    """
+    if tournament.format != TournamentFormat.SWISS:
+        return None
+
+    state = db.get(SwissState, tournament.id)
+    if state is None:
+        return None
+
+    unfinished = db.scalar(
+        select(func.count())
+        .select_from(Match)
+        .where(
+            Match.tournament_id == tournament.id,
+            Match.round == state.round,
+            Match.status != MatchStatus.COMPLETED,
+        )
+    )
+    if unfinished:
+        return None
+
+    if state.round == state.rounds:
+        tournament.status = TournamentStatus.COMPLETED
+        return None
+
+    round_number = state.round + 1
+    return round_number if _pair_next_round(db, tournament, state) else None
+
+
+def _pair_next_round(db: Session, tournament: Tournament, state: SwissState) -> int:
+    import numpy as np
+
+    from app.services.swiss_pairing import pair_round
+
+    # Claim the round, so concurrent reports closing it pair it only once
+    round_number = state.round + 1
+    claimed = db.execute(
+        update(SwissState)
+        .where(SwissState.tournament_id == tournament.id, SwissState.round == state.round)
+        .values(round=round_number)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        return 0
+
+    participant_ids = np.frombuffer(state.participant_ids, dtype=np.int32)
+    count = len(participant_ids)
+    opponents = np.frombuffer(state.opponents, dtype=np.int32).reshape(count, state.rounds).copy()
+    sides = np.frombuffer(state.sides, dtype=np.int8).reshape(count, state.rounds).copy()
+
+    index = {int(participant_id): i for i, participant_id in enumerate(participant_ids)}
+    scores = np.zeros(count, dtype=np.int64)
+    for participant_id, points in db.execute(
+        select(Standing.participant_id, Standing.points).where(
+            Standing.tournament_id == tournament.id
+        )
+    ):
+        if participant_id in index:
+            scores[index[participant_id]] = points
+
+    played = round_number - 1
+    pairs, bye = pair_round(scores, opponents[:, :played], sides[:, :played])
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    for board, (first, second) in enumerate(pairs, start=1):
+        opponents[first, played], opponents[second, played] = second, first
+        sides[first, played], sides[second, played] = 1, -1
+        rows.append(
+            {
+                "match_number": board,
+                "player1_id": int(participant_ids[first]),
+                "player2_id": int(participant_ids[second]),
+                "status": MatchStatus.PENDING,
+                "completed_at": None,
+                "winner_id": None,
+            }
+        )
+    if bye is not None:
+        bye_id = int(participant_ids[bye])
+        rows.append(
+            {
+                "match_number": len(pairs) + 1,
+                "player1_id": bye_id,
+                "player2_id": None,
+                "status": MatchStatus.COMPLETED,
+                "completed_at": now,
+                "winner_id": bye_id,
+            }
+        )
+
+    bulk_insert(
+        db,
+        Match.__table__,
+        rows,
+        tournament_id=tournament.id,
+        bracket=MatchBracket.MAIN,
+        round=round_number,
+        # Later rounds are playable from the moment they are paired, and the
+        # scheduler's overdue check counts from there
+        scheduled_at=tournament.start_date if played == 0 else now,
+    )
+    db.execute(
+        update(SwissState)
+        .where(SwissState.tournament_id == tournament.id)
+        .values(opponents=opponents.tobytes(), sides=sides.tobytes())
+        .execution_options(synchronize_session=False)
+    )
+    db.expire(state)
+
+    if bye is not None:
+        # The bye scores like a win from the moment it is paired
+        won = SimpleNamespace(**rows[-1], player1_score=None, player2_score=None)
+        record_results(db, tournament, [(SimpleNamespace(status=MatchStatus.PENDING), won)])
+    return len(rows)
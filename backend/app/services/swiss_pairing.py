@@ -0,0 +1,232 @@
+"""
+Swiss-system pairing engine.
+
+Pure Python and numpy, like services/bracket.py: pair_round() takes each
+player's score and pairing history as arrays indexed by seed and returns
+the next round's pairings, so callers decide how to store them.
+
+Pairing follows the Dutch system. Players are ranked by score, then seed,
+and paired one score group at a time from the top: the upper half of a
+group plays the lower half, each player ideally meeting the one in the
+same position. The choice between alternatives is a minimum-cost
+assignment where rematches are forbidden, a deviation from the ideal
+opponent costs its distance, and giving both players the side they are
+not due costs a penalty. Players left unpaired float down into the next
+group. In the usual case almost every player gets their ideal opponent
+straight away and only the few conflicts need searching, so a round costs
+about linear time in the field size.
+"""
+
+import heapq
+from typing import List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Opponent of a player who had a bye, or of a round not played yet
+BYE = -1
+
+# A player's candidate opponents are those at most this many places away
+# from the ideal one within the score group
+WINDOW = 16
+# Both players are due the same side
+COLOR_PENALTY = 8
+# ... and both have already played that side at least twice more than the other
+ABSOLUTE_COLOR_PENALTY = 4 * WINDOW
+# Only paid when every alternative is exhausted
+REMATCH_PENALTY = 1000 * WINDOW
+
+Pairing = Tuple[int, int]
+
+
+def min_cost_assignment(
+    edges: Sequence[Sequence[Tuple[int, int]]], columns: int
+) -> List[Optional[int]]:
+    """
+    Assign rows to distinct columns at minimum total cost.
+
+    `edges[row]` lists the (column, cost) pairs allowed for that row, with
+    integer costs. Returns the column of each row, None where a row cannot
+    be assigned. As many rows as possible are assigned, earlier rows taking
+    precedence, and the assignment of those rows has the lowest total cost.
+
+    Successive shortest paths on the sparse graph, in row order, keeping
+    Dijkstra potentials so reduced costs stay non-negative. A row whose
+    cheapest column is still free takes it directly (free columns always
+    have potential zero); any other row costs one Dijkstra search that
+    stops at the first free column, which is usually nearby.
+    """
+    row_potential = [min((cost for _, cost in row), default=0) for row in edges]
+    column_potential = [0] * columns
+    row_of: List[int] = [-1] * columns
+    column_of: List[Optional[int]] = [None] * len(edges)
+
+    for root, candidates in enumerate(edges):
+        cheapest = next(
+            (
+                column
+                for column, cost in candidates
+                if cost == row_potential[root] and row_of[column] < 0
+            ),
+            None,
+        )
+        if cheapest is not None:
+            row_of[cheapest] = root
+            column_of[root] = cheapest
+            continue
+
+        # Settled columns and their distances, and the row each column was reached from
+        settled = {}
+        distance = {}
+        reached_from = {}
+        heap: List[Tuple[int, int]] = []
+
+        def scan(row, base):
+            for column, cost in edges[row]:
+                if column in settled:
+                    continue
+                reduced = base + cost - row_potential[row] - column_potential[column]
+                if reduced < distance.get(column, reduced + 1):
+                    distance[column] = reduced
+                    reached_from[column] = row
+                    heapq.heappush(heap, (reduced, column))
+
+        scan(root, 0)
+        while heap:
+            length, column = heapq.heappop(heap)
+            if column in settled:
+                continue
+            settled[column] = length
+            if row_of[column] >= 0:
+                scan(row_of[column], length)
+                continue
+
+            # Free column found: shift potentials so the path is tight...
+            row_potential[root] += length
+            for other, other_length in settled.items():
+                column_potential[other] -= length - other_length
+                if row_of[other] >= 0:
+                    row_potential[row_of[other]] += length - other_length
+            # ... and flip it
+            while True:
+                row = reached_from[column]
+                previous = column_of[row]
+                column_of[row] = column
+                row_of[column] = row
+                if row == root:
+                    break
+                column = previous
+            break
+
+    return column_of
+
+
+def _played_pairs(opponents: np.ndarray) -> Set[int]:
+    """Every pair that has already played, as a * n + b with a < b."""
+    n = len(opponents)
+    players = np.repeat(np.arange(n), opponents.shape[1])
+    others = opponents.ravel()
+    played = others >= 0
+    players, others = players[played], others[played]
+    return set((np.minimum(players, others) * n + np.maximum(players, others)).tolist())
+
+
+def _last_sides(sides: np.ndarray) -> np.ndarray:
+    last = np.zeros(len(sides), dtype=np.int8)
+    for column in sides.T:
+        last = np.where(column != 0, column, last)
+    return last
+
+
+def pair_round(
+    scores: np.ndarray, opponents: np.ndarray, sides: np.ndarray
+) -> Tuple[List[Pairing], Optional[int]]:
+    """
+    Pair the next round.
+
+    `scores` holds each player's score; `opponents` and `sides` are
+    (players, rounds so far) arrays of opponent indices (BYE for none) and
+    sides played (1 = player1, -1 = player2, 0 = none). Returns the
+    (player1, player2) pairings, top boards first, and the player given a
+    bye (None when the field is even). Rematches are only allowed for the
+    players left over after every score group has been paired.
+    """
+    n = len(scores)
+    order = np.lexsort((np.arange(n), -scores)).tolist()
+
+    bye = None
+    if n % 2:
+        # The lowest ranked player who has not had a bye yet
+        had_bye = (opponents == BYE).any(axis=1)
+        bye = next((player for player in reversed(order) if not had_bye[player]), order[-1])
+        order.remove(bye)
+
+    played = _played_pairs(opponents)
+    balance = sides.sum(axis=1, dtype=np.int64)
+    last = _last_sides(sides)
+    # Side each player is due: 1 = player1, -1 = player2, 0 = either
+    due = np.where(balance < 0, 1, np.where(balance > 0, -1, -last)).tolist()
+    absolute = (np.abs(balance) >= 2).tolist()
+    balance, last = balance.tolist(), last.tolist()
+    rank = {player: position for position, player in enumerate(order)}
+
+    def cost(a, b, distance, allow_rematch):
+        key = min(a, b) * n + max(a, b)
+        total = distance
+        if key in played:
+            if not allow_rematch:
+                return None
+            total += REMATCH_PENALTY
+        if due[a] == due[b] != 0:
+            total += COLOR_PENALTY
+            if absolute[a] and absolute[b]:
+                total += ABSOLUTE_COLOR_PENALTY
+        return total
+
+    def pair_group(players, allow_rematch=False):
+        half = len(players) // 2
+        upper, lower = players[:half], players[half:]
+        edges = []
+        for i, a in enumerate(upper):
+            candidates = []
+            for j in range(max(0, i - WINDOW), min(len(lower), i + WINDOW + 1)):
+                total = cost(a, lower[j], abs(i - j), allow_rematch)
+                if total is not None:
+                    candidates.append((j, total))
+            edges.append(candidates)
+
+        assigned = min_cost_assignment(edges, len(lower))
+        pairs = [(a, lower[j]) for a, j in zip(upper, assigned) if j is not None]
+        taken = {j for j in assigned if j is not None}
+        left = [a for a, j in zip(upper, assigned) if j is None]
+        left += [b for j, b in enumerate(lower) if j not in taken]
+        return pairs, sorted(left, key=rank.__getitem__)
+
+    pairs: List[Pairing] = []
+    floaters: List[int] = []
+    start = 0
+    while start < len(order):
+        end = start
+        while end < len(order) and scores[order[end]] == scores[order[start]]:
+            end += 1
+        group_pairs, floaters = pair_group(floaters + order[start:end])
+        pairs += group_pairs
+        start = end
+    if floaters:
+        # The bottom of the field cannot be paired without a rematch
+        group_pairs, floaters = pair_group(floaters, allow_rematch=True)
+        pairs += group_pairs
+
+    pairs.sort(key=lambda pair: min(rank[pair[0]], rank[pair[1]]))
+    result = []
+    for board, (a, b) in enumerate(pairs):
+        if rank[a] > rank[b]:
+            a, b = b, a
+        # Fewer player1 games first, then whoever played player2 last; with
+        # identical histories the higher ranked player alternates, and in
+        # the first round alternates by board
+        if (balance[a], last[a]) != (balance[b], last[b]):
+            first = (balance[a], last[a]) < (balance[b], last[b])
+        else:
+            first = last[a] == -1 or (last[a] == 0 and board % 2 == 0)
+        result.append((a, b) if first else (b, a))
+    return result, bye
@@ -0,0 +1,166 @@
+"""
+Starting a tournament: seed the participants, plan the bracket and write it.
+
+Kept separate from the pure bracket engine so both the router and background
+jobs can start a tournament inside their own transaction.
+"""
+
+import random
+from typing import List
+
+from sqlalchemy import and_, bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import bulk_insert
+from app.models.match import Match, MatchStatus
+from app.models.participant import Participant
+from app.models.rating import PlayerRating
+from app.models.tournament import Tournament, TournamentFormat, TournamentStatus
+from app.schemas.tournament import SeedingMethod
+from app.services import bracket, swiss
+from app.services.ratings import DEFAULT_RATING
+from app.services.versioning import bump_version
+
+
+def seeded_participant_ids(
+    db: Session, tournament_id: int, seeding: SeedingMethod
+) -> List[int]:
+    """
+    Participant ids in seed order: manual seeds first, then by join order;
+    shuffled; or by rating in the tournament's game, best first (unrated
+    players count as DEFAULT_RATING).
+    """
+    query = db.query(Participant.id).filter(Participant.tournament_id == tournament_id)
+
+    if seeding == SeedingMethod.RATING:
+        game = select(Tournament.game).where(Tournament.id == tournament_id)
+        query = query.outerjoin(
+            PlayerRating,
+            and_(
+                PlayerRating.user_id == Participant.user_id,
+                PlayerRating.game == game.scalar_subquery(),
+            ),
+        ).order_by(
+            func.coalesce(PlayerRating.rating, DEFAULT_RATING).desc(), Participant.id
+        )
+        return [row.id for row in query]
+
+    if seeding == SeedingMethod.RANDOM:
+        ids = [row.id for row in query]
+        random.shuffle(ids)
+        return ids
+
+    query = query.order_by(
+        Participant.seed.is_(None), Participant.seed, Participant.id
+    )
+    return [row.id for row in query]
+
+
+def start_tournament(
+    db: Session, tournament: Tournament, seeding: SeedingMethod = SeedingMethod.MANUAL
+) -> int:
+    """
+    Generate and insert every match of the bracket (the first round of a
+    Swiss tournament), and mark the tournament in progress. Does not
+    commit; raises ValueError if the tournament cannot be started. Returns
+    the number of matches created.
+    """
+    if tournament.status not in (
+        TournamentStatus.DRAFT,
+        TournamentStatus.OPEN,
+        TournamentStatus.REGISTRATION_CLOSED,
+    ):
+        raise ValueError("Tournament has already started")
+
+    participant_ids = seeded_participant_ids(db, tournament.id, seeding)
+    if tournament.format == TournamentFormat.SWISS:
+        # Swiss rounds are paired one at a time as results come in
+        created = swiss.start(db, tournament, participant_ids)
+        tournament.status = TournamentStatus.IN_PROGRESS
+        bump_version(db, tournament.id)
+        return created
+
+    plan = bracket.generate(tournament.format, participant_ids)
+
+    # One executemany for the whole bracket; the columns shared by every
+    # match are converted once instead of per row.
+    bulk_insert(
+        db,
+        Match.__table__,
+        [
+            {
+                "bracket": planned.bracket,
+                "round": planned.round,
+                "match_number": planned.match_number,
+                "player1_id": planned.player1_id,
+                "player2_id": planned.player2_id,
+            }
+            for planned in plan
+        ],
+        tournament_id=tournament.id,
+        status=MatchStatus.PENDING,
+        scheduled_at=tournament.start_date,
+    )
+
+    _link_successors(db, tournament.id, plan)
+
+    tournament.status = TournamentStatus.IN_PROGRESS
+    bump_version(db, tournament.id)
+    return len(plan)
+
+
+def _link_successors(db: Session, tournament_id: int, plan: List[bracket.PlannedMatch]):
+    """
+    Store each match's winner/loser successor as ids, so advancing a result
+    later is a primary-key update that never has to look at the bracket.
+    """
+    linked = [
+        planned
+        for planned in plan
+        if planned.next_match is not None or planned.loser_next_match is not None
+    ]
+    if not linked:
+        return
+
+    # (bracket, round, match_number) is unique within a tournament
+    ids = {
+        (row.bracket, row.round, row.match_number): row.id
+        for row in db.query(
+            Match.id, Match.bracket, Match.round, Match.match_number
+        ).filter(Match.tournament_id == tournament_id)
+    }
+
+    def match_id(planned):
+        return ids[(planned.bracket, planned.round, planned.match_number)]
+
+    def pointer(ref):
+        if ref is None:
+            return None, None
+        index, slot = ref
+        return match_id(plan[index]), slot
+
+    rows = []
+    for planned in linked:
+        next_id, next_slot = pointer(planned.next_match)
+        loser_id, loser_slot = pointer(planned.loser_next_match)
+        rows.append(
+            {
+                "match_id": match_id(planned),
+                "next_id": next_id,
+                "next_slot": next_slot,
+                "loser_id": loser_id,
+                "loser_slot": loser_slot,
+            }
+        )
+
+    db.connection().execute(
+        update(Match.__table__)
+        .where(Match.__table__.c.id == bindparam("match_id"))
+        .values(
+            next_match_id=bindparam("next_id"),
+            next_match_slot=bindparam("next_slot"),
+            loser_next_match_id=bindparam("loser_id"),
+            loser_next_match_slot=bindparam("loser_slot"),
+        ),
+        rows,
+    )
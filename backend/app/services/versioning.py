@@ -0,0 +1,68 @@
+"""
+Tournament version counters.
+
+Every write to a tournament, its matches or its participants increments
+tournaments.version in the same transaction. Read endpoints derive their
+ETag from it (see utils/conditional.py), so they must stay in step.
+Participant and match responses embed player names, so renaming a user
+bumps every tournament they play in too.
+"""
+
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.participant import Participant
+from app.models.tournament import Tournament
+from app.utils.conditional import Validators
+
+
+def version_bump() -> dict:
+    """Column values that bump the version; merge into an UPDATE of tournaments."""
+    return {"version": Tournament.version + 1, "updated_at": func.now()}
+
+
+def bump_version(db: Session, tournament_id: int) -> None:
+    """Increment the tournament's version. Does not commit."""
+    db.execute(
+        update(Tournament)
+        .where(Tournament.id == tournament_id)
+        .values(**version_bump())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_player_versions(db: Session, user_id: int) -> None:
+    """
+    Increment the version of every tournament the user plays in, whose
+    brackets, participants and matches show the user's name. Does not commit.
+    """
+    db.execute(
+        update(Tournament)
+        .where(
+            Tournament.id.in_(
+                select(Participant.tournament_id).where(Participant.user_id == user_id)
+            )
+        )
+        .values(**version_bump())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def tournament_validators(
+    db: AsyncSession, tournament_id: int
+) -> Optional[Validators]:
+    """Validators of the tournament's current version, or None if it does not exist."""
+    row = (
+        await db.execute(
+            select(Tournament.version, Tournament.updated_at).where(
+                Tournament.id == tournament_id
+            )
+        )
+    ).first()
+    if row is None:
+        return None
+    return Validators.for_version("t", tournament_id, row.version, row.updated_at)
+
@@ -0,0 +1,141 @@
+"""
+Publish/subscribe for live updates.
+
+Publishers are request handlers, often sync ones running in the threadpool,
+and subscribers are WebSocket connections on the event loop. Each
+subscriber has a bounded queue; a subscriber that falls that far behind is
+dropped rather than allowed to hold messages (and memory) for everyone.
+Its client is expected to reconnect and refetch the current state.
+
+InProcessBroker only reaches subscribers in the same worker process. A
+multi-worker deployment implements Broker over a shared transport (a local
+socket, a message bus) and registers it in BROKERS.
+"""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+from app.core.config import settings
+
+
+class Subscription:
+    """Messages for one subscriber; iterate to receive them until dropped."""
+
+    def __init__(self, queue_size: int):
+        self.dropped = False
+        self._queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(queue_size)
+
+    def offer(self, message: str) -> bool:
+        """Queue a message; returns False if the subscriber is too far behind."""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def drop(self) -> None:
+        # Discard the backlog and wake the reader with the end marker
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> str:
+        message = await self._queue.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+class Broker(ABC):
+    """Interface of a live-update broker."""
+
+    @abstractmethod
+    def publish(self, channel: str, message: str) -> None:
+        """Send a message to every subscriber of `channel`. Safe from any thread."""
+
+    @abstractmethod
+    def subscribe(self, channel: str):
+        """Async context manager yielding a Subscription to `channel`."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Counters reported by /metrics."""
+
+
+class InProcessBroker(Broker):
+    """Fans messages out to subscribers in this process."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._channels: Dict[str, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message: str) -> None:
+        loop = self._loop
+        if loop is None or not self._channels.get(channel):
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(channel, message)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, channel, message)
+
+    def _deliver(self, channel: str, message: str) -> None:
+        # Runs on the event loop, the only thread touching the queues
+        for subscription in list(self._channels.get(channel, ())):
+            if not subscription.offer(message):
+                self._remove(channel, subscription)
+                subscription.drop()
+                self.dropped += 1
+
+    def _remove(self, channel: str, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._channels.get(channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[channel]
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._remove(channel, subscription)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "channels": len(self._channels),
+                "subscribers": sum(len(s) for s in self._channels.values()),
+                "dropped": self.dropped,
+            }
+
+
+BROKERS = {"memory": InProcessBroker}
+
+
+def create_broker(name: str = settings.event_broker) -> Broker:
+    try:
+        broker_class = BROKERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown event broker: {name}")
+    return broker_class(settings.event_queue_size)
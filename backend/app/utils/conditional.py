@@ -0,0 +1,62 @@
+"""
+HTTP conditional requests.
+
+Read endpoints build a Validators from a row's version counter (and its
+modification time) with one indexed lookup, and answer a matching
+If-None-Match / If-Modified-Since with 304 before loading anything else.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+
+@dataclass
+class Validators:
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def for_version(
+        cls, kind: str, row_id: int, version: int, last_modified: Optional[datetime] = None
+    ) -> "Validators":
+        # Weak: the representation differs between endpoints sharing a version
+        if last_modified is not None and last_modified.tzinfo is None:
+            # SQLite returns naive datetimes; they are stored in UTC
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return cls(f'W/"{kind}{row_id}-{version}"', last_modified)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def is_fresh(self, request: Request) -> bool:
+        """True if the client's cached copy is current (RFC 9110 section 13.2.2)."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag.removeprefix("W/") in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have whole-second precision
+        return self.last_modified.replace(microsecond=0) <= since
+
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers())
+
+    def apply(self, response: Response) -> Response:
+        response.headers.update(self.headers())
+        return response
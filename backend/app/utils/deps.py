@@ -1,21 +1,80 @@
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.instrumentation import JWT, timed
+from app.utils.revocation import RevocationStore
 from app.utils.security import SECRET_KEY, ALGORITHM
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# Column values of recently authenticated users, keyed by user id
+user_cache = TTLCache(
+    max_entries=settings.user_cache_max_entries, ttl=settings.user_cache_ttl_seconds
+)
+
+# Ids of access tokens revoked by logout, loaded from the database at startup
+# and refreshed by the lifespan's poll_revocations task
+revocation_store = RevocationStore(settings.revocation_filter_capacity)
+
+USER_SNAPSHOT_FIELDS = (
+    "id",
+    "email",
+    "display_name",
+    "avatar_url",
+    "bio",
+    "created_at",
+)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user's cached snapshot; call after changing the user."""
+    user_cache.invalidate(user_id)
+
+
+def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    Dependency that decodes the JWT access token and rejects revoked ones.
+
+    Revocation is checked against the in-memory revocation_store, never the
+    database.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    # Imported here for the same reason as in create_access_token
+    from jose import jwt
+
+    try:
+        with timed(JWT):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+
+    if revocation_store.is_revoked(payload.get("jti")):
+        raise credentials_exception
+
+    return payload
+
 
 def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    payload: dict = Depends(get_token_payload), db: Session = Depends(get_db)
 ) -> User:
     """
-    Dependency that extracts and validates the JWT token,
-    then returns the current user from the data base
+    Dependency that returns the user the validated JWT token belongs to.
+
+    The token's `sub` is the user id. Recently seen users come from an
+    in-memory cache, so most requests never query the database here. The
+    returned User is not attached to the session: to change it, load it
+    with `db.get(User, current_user.id)` and call invalidate_cached_user.
     """
 
     # Creating a HTTPException variable that will be returned
@@ -27,16 +86,18 @@ def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_email: str = payload.get("sub")
-        if user_email is None:
-            raise credentials_exception
-    except JWTError:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == user_email).first()
-
-    if user is None:
-        raise credentials_exception
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        db_user = db.get(User, user_id)
+        if db_user is None:
+            raise credentials_exception
+        snapshot = {field: getattr(db_user, field) for field in USER_SNAPSHOT_FIELDS}
+        user_cache.set(user_id, snapshot)
+        # The request's own session may keep using the loaded instance
+        return db_user
 
-    return user
+    return User(**snapshot)
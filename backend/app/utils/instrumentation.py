@@ -0,0 +1,145 @@
+"""
+Per-request instrumentation.
+
+InstrumentationMiddleware times every HTTP request and makes a
+RequestMetrics current for it through a context variable. The SQLAlchemy
+cursor hooks installed by instrument_engines() add each statement and its
+duration to it, and timed() adds the time spent in named phases such as
+password hashing, JWT handling or serialization. Context variables are
+copied into the threadpool running sync endpoints and dependencies and into
+the async engine's greenlets, so work done there counts toward the request
+that started it. Once the response is sent the totals are observed into the
+histograms below, labelled with the route template, and served at /metrics.
+
+Outside a request (the scheduler, the CLI) no RequestMetrics is current and
+the hooks do nothing but read the context variable.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import COUNT_BUCKETS, Histogram
+
+PASSWORD_HASH = "password_hash"
+JWT = "jwt"
+SERIALIZATION = "serialization"
+
+
+class RequestMetrics:
+    __slots__ = ("queries", "db_seconds", "phases")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.phases: Dict[str, float] = {}
+
+
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_request", default=None
+)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving the request to sending the last of the response.",
+    ("method", "route", "status"),
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    ("method", "route"),
+    COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements per request.",
+    ("method", "route"),
+)
+REQUEST_PHASE_TIME = Histogram(
+    "http_request_phase_seconds",
+    "Time spent in an instrumented phase per request, for requests that entered it.",
+    ("method", "route", "phase"),
+)
+HISTOGRAMS = (REQUEST_DURATION, REQUEST_QUERIES, REQUEST_DB_TIME, REQUEST_PHASE_TIME)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to the current request's `phase`."""
+    metrics = current_request.get()
+    if metrics is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] = metrics.phases.get(phase, 0.0) + perf_counter() - started
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request.get() is not None:
+        context._instrumentation_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = current_request.get()
+    started = getattr(context, "_instrumentation_started", None)
+    if metrics is not None and started is not None:
+        metrics.queries += 1
+        metrics.db_seconds += perf_counter() - started
+
+
+def instrument_engines(*engines: Engine) -> None:
+    """Count statements on these engines (pass an AsyncEngine's sync_engine)."""
+    for engine in engines:
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route(scope) -> str:
+    # The router leaves the matched route in the scope; its path template
+    # (without the prefix its router is included under) keeps the label
+    # count bounded, unlike the raw path
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware, so streamed responses are not buffered."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = current_request.set(metrics)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started
+            current_request.reset(token)
+            method, route = scope["method"], _route(scope)
+            REQUEST_DURATION.observe(elapsed, method, route, str(status))
+            REQUEST_QUERIES.observe(metrics.queries, method, route)
+            REQUEST_DB_TIME.observe(metrics.db_seconds, method, route)
+            for phase, seconds in metrics.phases.items():
+                REQUEST_PHASE_TIME.observe(seconds, method, route, phase)
@@ -0,0 +1,107 @@
+"""
+Metrics in the Prometheus text exposition format.
+
+Just the histogram and gauge output /metrics needs, kept in process
+memory; each worker reports its own, so scrape every worker (or sum them
+in Prometheus). See utils/instrumentation.py for what is recorded.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+# Seconds; covers a cached lookup up to a slow bcrypt round
+DURATION_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, bool):
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Observations bucketed per label combination. observe() is thread-safe
+    and costs a dict lookup and a bisect.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = sorted(
+                (labels, (list(counts), total)) for labels, (counts, total) in self._series.items()
+            )
+        bounds = self.buckets + (math.inf,)
+        for values, (counts, total) in series:
+            labels = _labels(self.labelnames, values)
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield f'{self.name}_bucket{{{prefix}le="{_number(bound)}"}} {cumulative}'
+            yield f"{self.name}_sum{{{labels}}} {_number(total)}"
+            yield f"{self.name}_count{{{labels}}} {cumulative}"
+
+
+def gauges(
+    prefix: str, documentation: str, label: str, stats: Mapping[str, Mapping[str, float]]
+) -> Iterator[str]:
+    """
+    One gauge per key of the stats() dicts in `stats`, labelled with the
+    name they are keyed by: {"users": {"hits": 3}} -> prefix_hits{label="users"} 3.
+    """
+    by_metric: Dict[str, List[Tuple[str, float]]] = {}
+    for name, values in stats.items():
+        for key, value in values.items():
+            by_metric.setdefault(key, []).append((name, value))
+    for key, samples in by_metric.items():
+        metric = f"{prefix}_{key}"
+        yield f"# HELP {metric} {documentation} ({key})"
+        yield f"# TYPE {metric} gauge"
+        for name, value in samples:
+            yield f"{metric}{{{_labels((label,), (name,))}}} {_number(value)}"
+
+
+def render(sections: Iterable[Iterable[str]]) -> bytes:
+    return ("\n".join(line for section in sections for line in section) + "\n").encode()
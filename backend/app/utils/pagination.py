@@ -0,0 +1,57 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> str:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode()
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode the (sort value, id) of the last row on a page into an opaque cursor."""
+    return _encode(f"{sort_value.isoformat()}|{row_id}")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed."""
+    if cursor is None:
+        return None
+
+    try:
+        sort_value, row_id = _decode(cursor).rsplit("|", 1)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise _invalid_cursor()
+
+
+def encode_int_cursor(*values: int) -> str:
+    """Encode the integer sort key of the last row on a page into an opaque cursor."""
+    return _encode("|".join(str(value) for value in values))
+
+
+def decode_int_cursor(cursor: Optional[str], size: int) -> Optional[Tuple[int, ...]]:
+    """Decode a cursor of `size` integers from encode_int_cursor, raising 400 if malformed."""
+    if cursor is None:
+        return None
+
+    try:
+        values = tuple(int(value) for value in _decode(cursor).split("|"))
+    except (ValueError, UnicodeDecodeError):
+        raise _invalid_cursor()
+    if len(values) != size:
+        raise _invalid_cursor()
+    return values
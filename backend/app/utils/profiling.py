@@ -0,0 +1,116 @@
+"""
+Opt-in sampling profiler for single requests.
+
+With PROFILING_ENABLED set, a request carrying the PROFILE_HEADER header is
+profiled while it runs: a background thread samples the Python stack of
+every other thread each PROFILE_INTERVAL_MS, and the samples are written to
+PROFILE_DIR as folded stacks ("frame;frame;frame count" per line), which
+speedscope and flamegraph.pl read. The response names the file in the same
+header.
+
+cProfile and pyinstrument only follow the thread they are started on, which
+misses the sync endpoints and dependencies FastAPI runs on its threadpool.
+Sampling every thread covers those, at the price of also catching anything
+else the worker runs meanwhile, so profile on a quiet instance. Threads
+idle in a selector, queue or lock wait are left out. One request is
+profiled at a time. With PROFILING_ENABLED off the middleware is not
+installed, so it costs nothing.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+
+from app.core.config import settings
+
+# A thread whose innermost frame is in one of these is waiting, not working
+IDLE_FILES = ("selectors.py", "threading.py", "queue.py")
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or frame.f_code.co_filename.endswith(IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def write_folded(path: str, samples: Counter) -> None:
+    with open(path, "w") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app,
+        header: str = settings.profile_header,
+        directory: str = settings.profile_dir,
+        interval_ms: float = settings.profile_interval_ms,
+    ):
+        self.app = app
+        self.header = header.lower().encode()
+        self.directory = directory
+        self.interval = interval_ms / 1000
+        self._active: Optional[StackSampler] = None
+
+    def _requested(self, scope) -> bool:
+        return any(name == self.header for name, _ in scope["headers"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active is not None or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        name = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}"
+            f"-{uuid.uuid4().hex[:6]}.folded"
+        )
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (self.header, name.encode())]
+            await send(message)
+
+        sampler = self._active = StackSampler(self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            samples = sampler.stop()
+            self._active = None
+            os.makedirs(self.directory, exist_ok=True)
+            write_folded(os.path.join(self.directory, name), samples)
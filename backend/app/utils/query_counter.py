@@ -0,0 +1,40 @@
+"""
+Counting the SQL statements a block of code sends to the database.
+
+Used by tests/test_query_counts.py (through the query_counter fixture) and
+benchmarks/query_counts.py to check that endpoints issue a fixed number of
+queries however many rows they return (no N+1 lazy loads).
+"""
+
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    Context manager recording every statement executed on the given engines
+    (pass an AsyncEngine's sync_engine) while it is active, from any thread.
+    """
+
+    def __init__(self, *engines: Engine):
+        self.engines = engines
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._record)
@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import utc_timestamp
+from app.models.token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings.
+
+    Membership tests can return false positives (at roughly `error_rate`
+    once `capacity` items are added) but never false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(
+            8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationStore:
+    """
+    In-process set of revoked access-token ids (jti claims).
+
+    The bloom filter answers the common case, a token that was never
+    revoked, without touching the exact set; only filter hits are confirmed
+    against it. Entries are kept until the token would have expired anyway.
+
+    The store is loaded from the revoked_tokens table at startup and then
+    refreshed with the rows added since, every revocation_refresh_seconds
+    (poll_revocations). A revocation made by another worker is therefore
+    honoured here at most one refresh interval later, or two if it committed
+    after a revocation with a higher id had been read (PostgreSQL assigns
+    ids before commit).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._revoked: Dict[str, float] = {}
+        self._filter = BloomFilter(capacity)
+        self._lock = threading.Lock()
+        # revoked_tokens ids: a refresh reads every row above read_from, the
+        # highest id of the refresh before last. Rereading one refresh's rows
+        # catches ids that committed out of order.
+        self.read_from = 0
+        self._newest_id = 0
+
+    def _rebuild(self) -> None:
+        # Bloom filters cannot forget, so expired ids are dropped by rebuilding
+        now = time.time()
+        self._revoked = {
+            jti: expires for jti, expires in self._revoked.items() if expires > now
+        }
+        self.capacity = max(self.capacity, len(self._revoked) * 2)
+        self._filter = BloomFilter(self.capacity)
+        for jti in self._revoked:
+            self._filter.add(jti)
+
+    def add(self, jti: str, expires: float) -> None:
+        """Mark `jti` revoked until the unix timestamp `expires`."""
+        with self._lock:
+            self._revoked[jti] = expires
+            if len(self._revoked) > self.capacity:
+                self._rebuild()
+            else:
+                self._filter.add(jti)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if jti is None or jti not in self._filter:
+            return False
+        with self._lock:
+            expires = self._revoked.get(jti)
+        return expires is not None and expires > time.time()
+
+    def load(self, entries: Iterable[Tuple[str, float]], newest_id: int = 0) -> None:
+        """Replace the contents with (jti, expires) pairs, read up to row `newest_id`."""
+        with self._lock:
+            self._revoked = dict(entries)
+            self._rebuild()
+            self.read_from = self._newest_id = newest_id
+
+    def mark_read(self, newest_id: int) -> None:
+        """Record that a refresh read every row up to `newest_id`."""
+        with self._lock:
+            self.read_from = self._newest_id
+            self._newest_id = max(self._newest_id, newest_id)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+def load_revocations(db: Session, store: RevocationStore) -> None:
+    """Purge expired rows from revoked_tokens and load the rest into `store`."""
+    now = datetime.now(timezone.utc)
+    db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+    db.commit()
+    newest_id = db.scalar(select(func.max(RevokedToken.id))) or 0
+    rows = db.execute(
+        select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.id <= newest_id)
+    ).all()
+    store.load(((jti, utc_timestamp(expires_at)) for jti, expires_at in rows), newest_id)
+
+
+def refresh_revocations(db: Session, store: RevocationStore) -> int:
+    """Add the revoked_tokens rows written since the last reads to `store`; returns how many."""
+    rows = db.execute(
+        select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.id > store.read_from
+        )
+    ).all()
+    for _, jti, expires_at in rows:
+        store.add(jti, utc_timestamp(expires_at))
+    store.mark_read(max((row.id for row in rows), default=0))
+    return len(rows)
+
+
+async def poll_revocations(
+    session_factory: Callable[[], Session], store: RevocationStore, interval: float
+) -> None:
+    """Refresh `store` every `interval` seconds until cancelled."""
+
+    def refresh() -> int:
+        with session_factory() as db:
+            return refresh_revocations(db, store)
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(refresh)
+        except Exception:
+            logger.exception("Refreshing revoked tokens failed")
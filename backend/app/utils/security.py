@@ -1,29 +1,114 @@
+import asyncio
+import hashlib
+import multiprocessing
+import secrets
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.utils.instrumentation import JWT, PASSWORD_HASH, timed
 
 # Secret key for JWT - in production, use enviroment variable!
 SECRET_KEY = "your-secret-key-change-this-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def password_context():
+    """
+    Password hashing context. passlib and its hash backends are imported on
+    first use rather than when a worker boots.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=settings.password_schemes,
+        deprecated="auto",
+        bcrypt__rounds=settings.bcrypt_rounds,
+    )
+
+
+# Hashing runs in its own processes so a login burst uses every core and
+# never blocks the event loop or the request threadpool. Created lazily.
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_slots: Optional[asyncio.Semaphore] = None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Check if a plain password matches the hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password for storing"""
-    return pwd_context.hash(password)
+    return password_context().hash(password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password and, if its hash uses outdated parameters, rehash it.
+
+    Returns (valid, new_hash); new_hash is None when no upgrade is needed.
+    """
+    return password_context().verify_and_update(plain_password, hashed_password)
+
+
+def _get_hash_executor() -> Optional[ProcessPoolExecutor]:
+    global _hash_executor
+    if _hash_executor is None and settings.password_hash_workers > 0:
+        # spawn: forking a process that runs threads and an event loop is unsafe
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_executor
+
+
+async def _run_hashing(fn, *args):
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(settings.password_hash_max_pending)
+
+    # Timed from the request's point of view, waiting for a slot included
+    with timed(PASSWORD_HASH):
+        async with _hash_slots:
+            loop = asyncio.get_running_loop()
+            # No process pool configured: fall back to the default thread pool
+            return await loop.run_in_executor(_get_hash_executor(), fn, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """get_password_hash, run off the event loop."""
+    return await _run_hashing(get_password_hash, password)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password, run off the event loop."""
+    return await _run_hashing(verify_and_update_password, plain_password, hashed_password)
+
+
+def shutdown_password_hashing() -> None:
+    """Stop the hashing processes; they are recreated on next use."""
+    global _hash_executor, _hash_slots
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True, cancel_futures=True)
+    _hash_executor = None
+    _hash_slots = None
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
+    # jose.jwt loads the crypto backends of every algorithm; only on first use
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -31,7 +116,23 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # jti lets a single token be revoked before it expires
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    with timed(JWT):
+        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     return encoded_jwt
+
+
+def hash_refresh_token(token: str) -> str:
+    """Digest under which a refresh token is stored; tokens are random, so no salt is needed."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def create_refresh_token() -> Tuple[str, str, datetime]:
+    """Create an opaque refresh token, returning (token, stored hash, expiry)."""
+    token = secrets.token_urlsafe(32)
+    expires_at = datetime.now(timezone.utc) + timedelta(
+        days=settings.refresh_token_expire_days
+    )
+    return token, hash_refresh_token(token), expires_at
@@ -0,0 +1,39 @@
+from typing import Iterator
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from app.core.database import SessionLocal
+from app.utils.serialization import RowSerializer
+
+STREAM_BATCH_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_ndjson(
+    statement: Select, serializer: RowSerializer, batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield one JSON line per row of a select built from serializer.select().
+
+    Rows are fetched `batch_size` at a time and never become ORM objects, so
+    nothing accumulates in an identity map and memory stays bounded by the
+    batch size rather than the result size. The generator owns its session
+    because it keeps running after the request's dependencies are torn down.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield b"".join(serializer.dumps_line(row) for row in partition)
+    finally:
+        db.close()
+
+
+def ndjson_response(
+    statement: Select, serializer: RowSerializer, batch_size: int = STREAM_BATCH_SIZE
+) -> StreamingResponse:
+    """Wrap iter_ndjson in a StreamingResponse."""
+    return StreamingResponse(
+        iter_ndjson(statement, serializer, batch_size), media_type=NDJSON_MEDIA_TYPE
+    )
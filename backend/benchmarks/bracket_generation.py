@@ -0,0 +1,99 @@
+"""
+Benchmark for bracket generation and the bulk match insert.
+
+Times the pure planning step and the full start (plan + insert + status
+change in one transaction) for large fields of each format.
+
+Run from the backend directory:
+
+    python -m benchmarks.bracket_generation
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Participant, Tournament, TournamentFormat, User
+from app.services import bracket
+from app.services.tournament_start import start_tournament
+
+CASES = [
+    (TournamentFormat.SINGLE_ELIMINATION, 4096),
+    (TournamentFormat.DOUBLE_ELIMINATION, 1024),
+    (TournamentFormat.ROUND_ROBIN, 256),
+]
+# Swiss rounds are paired one at a time; see benchmarks/swiss_pairing.py
+
+
+def run(tournament_format: TournamentFormat, players: int) -> dict:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"email": f"bench{i}@example.com", "password_hash": "x", "display_name": "bench"}
+                for i in range(players)
+            ],
+        )
+        conn.execute(
+            insert(Tournament),
+            [
+                {
+                    "name": "Bench Cup",
+                    "game": "Chess",
+                    "format": tournament_format,
+                    "max_participants": players,
+                    "organizer_id": 1,
+                    "registration_deadline": datetime(2026, 1, 1),
+                    "start_date": datetime(2026, 1, 2),
+                }
+            ],
+        )
+        conn.execute(
+            insert(Participant),
+            [{"tournament_id": 1, "user_id": i + 1} for i in range(players)],
+        )
+
+    started = time.perf_counter()
+    plan = bracket.generate(tournament_format, list(range(1, players + 1)))
+    plan_ms = (time.perf_counter() - started) * 1000
+
+    db = sessionmaker(bind=engine)()
+    try:
+        tournament = db.get(Tournament, 1)
+        started = time.perf_counter()
+        start_tournament(db, tournament)
+        db.commit()
+        start_ms = (time.perf_counter() - started) * 1000
+    finally:
+        db.close()
+        engine.dispose()
+
+    return {
+        "format": tournament_format.value,
+        "players": players,
+        "matches": len(plan),
+        "plan_ms": plan_ms,
+        "start_ms": start_ms,
+    }
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__.splitlines()[1]).parse_args()
+
+    print(f"{'format':>20} {'players':>8} {'matches':>8} {'plan (ms)':>10} {'start (ms)':>11}")
+    for tournament_format, players in CASES:
+        r = run(tournament_format, players)
+        print(
+            f"{r['format']:>20} {r['players']:>8} {r['matches']:>8} "
+            f"{r['plan_ms']:>10.1f} {r['start_ms']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
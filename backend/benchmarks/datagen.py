@@ -0,0 +1,241 @@
+"""
+Synthetic data for benchmarks and load tests.
+
+Fills a database with users, tournaments, participants and matches drawn
+from fixed-seed distributions, so two runs with the same arguments build the
+same data:
+
+- every user has the password PASSWORD (hashed once and shared, so
+  generating is not bound by bcrypt);
+- a few users organize every tournament, and players are picked by a Zipf
+  popularity, so some players are in many tournaments and most in few;
+- games, formats, sizes and statuses follow the weights below; open
+  tournaments are partly full, later ones nearly full;
+- in-progress tournaments are started through services/tournament_start.py,
+  so their brackets are exactly what the app builds, every match pending.
+
+Rows go in with executemany batches. The search index triggers run as in
+production, so the time reported includes indexing.
+
+Run from the backend directory:
+
+    python -m benchmarks.datagen --url sqlite:///./bench.db --users 100000 --tournaments 5000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+PASSWORD = "hunter22"
+BATCH = 50_000
+
+# Choices and their weights
+GAMES = {
+    "Valorant": 0.25,
+    "League of Legends": 0.2,
+    "Chess": 0.15,
+    "Rocket League": 0.12,
+    "Tekken 8": 0.1,
+    "StarCraft II": 0.08,
+    "Go": 0.05,
+    "Apex Legends": 0.05,
+}
+SIZES = {8: 0.25, 16: 0.3, 32: 0.2, 64: 0.15, 128: 0.07, 256: 0.03}
+FORMATS = {
+    "SINGLE_ELIMINATION": 0.55,
+    "DOUBLE_ELIMINATION": 0.25,
+    "ROUND_ROBIN": 0.1,
+    "SWISS": 0.1,
+}
+STATUSES = {
+    "DRAFT": 0.05,
+    "OPEN": 0.4,
+    "REGISTRATION_CLOSED": 0.1,
+    "IN_PROGRESS": 0.35,
+    "CANCELLED": 0.1,
+}
+# A round robin of n players has n(n-1)/2 matches; keep them organizer-sized
+ROUND_ROBIN_MAX = 16
+ORGANIZER_SHARE = 0.02
+ZIPF_EXPONENT = 0.8
+EPOCH = datetime(2030, 1, 1)
+
+WORDS = (
+    "summer winter spring autumn open cup clash masters league series invitational "
+    "regional national grand prix showdown arena legends rising stars weekly monthly"
+).split()
+NAMES = (
+    "alex sam jordan taylor morgan casey riley jamie avery quinn kai noah emma liam "
+    "olivia mia lucas zoe leo nina omar yuki ivan sofia"
+).split()
+
+
+def _pick(rng: np.random.Generator, weights: Dict, size: int) -> list:
+    keys = list(weights)
+    p = np.array(list(weights.values()))
+    return [keys[i] for i in rng.choice(len(keys), size=size, p=p / p.sum())]
+
+
+def _batches(rows: List[dict]):
+    for start in range(0, len(rows), BATCH):
+        yield rows[start : start + BATCH]
+
+
+def _players(rng: np.random.Generator, cumulative: np.ndarray, count: int) -> List[int]:
+    """`count` distinct user indices drawn by popularity (its cumulative sum)."""
+    drawn = np.searchsorted(cumulative, rng.random(count * 2) * cumulative[-1])
+    chosen = list(dict.fromkeys(drawn.tolist()))[:count]
+    while len(chosen) < count:
+        extra = int(rng.integers(len(cumulative)))
+        if extra not in chosen:
+            chosen.append(extra)
+    return chosen
+
+
+def generate(engine, users: int, tournaments: int, seed: int = 1) -> Dict[str, int]:
+    """
+    Insert the data into the empty schema behind `engine` and return the
+    number of rows of each kind.
+    """
+    from app.models import (
+        Participant,
+        Tournament,
+        TournamentFormat,
+        TournamentStatus,
+        User,
+    )
+    from app.services.tournament_start import start_tournament
+    from app.utils.security import get_password_hash
+
+    rng = np.random.default_rng(seed)
+    password_hash = get_password_hash(PASSWORD)
+
+    with engine.begin() as conn:
+        names = rng.integers(0, len(NAMES), size=(users, 2)).tolist()
+        for batch in _batches(
+            [
+                {
+                    "email": f"user{i}@example.com",
+                    "password_hash": password_hash,
+                    "display_name": f"{NAMES[a].title()} {NAMES[b].title()} {i}",
+                }
+                for i, (a, b) in enumerate(names)
+            ]
+        ):
+            conn.execute(insert(User), batch)
+        user_ids = conn.scalars(select(User.id).order_by(User.id)).all()
+
+    organizers = max(1, int(users * ORGANIZER_SHARE))
+    ranks = np.arange(1, users + 1, dtype=float)
+    # Organizers are not the most popular players
+    popularity = np.cumsum(np.roll(ranks**-ZIPF_EXPONENT, organizers))
+
+    formats = [TournamentFormat[name] for name in _pick(rng, FORMATS, tournaments)]
+    statuses = [TournamentStatus[name] for name in _pick(rng, STATUSES, tournaments)]
+    sizes = _pick(rng, SIZES, tournaments)
+    games = _pick(rng, GAMES, tournaments)
+    words = rng.integers(0, len(WORDS), size=(tournaments, 2)).tolist()
+    offsets = rng.integers(-30 * 24, 90 * 24, size=tournaments).tolist()
+
+    tournament_rows = []
+    participant_counts = []
+    for i in range(tournaments):
+        size = sizes[i]
+        if formats[i] == TournamentFormat.ROUND_ROBIN:
+            size = min(size, ROUND_ROBIN_MAX)
+        if statuses[i] == TournamentStatus.OPEN:
+            count = int(size * rng.beta(2, 2))
+        elif statuses[i] == TournamentStatus.DRAFT:
+            count = 0
+        else:
+            count = max(2, int(round(size * rng.beta(5, 1.5))))
+        count = min(count, size, users)
+        participant_counts.append(count)
+        start = EPOCH + timedelta(hours=offsets[i])
+        tournament_rows.append(
+            {
+                "name": f"{WORDS[words[i][0]].title()} {WORDS[words[i][1]].title()} {i}",
+                "description": f"A {games[i]} {formats[i].value.replace('_', ' ')} event",
+                "game": games[i],
+                "format": formats[i],
+                # In-progress ones are started below, once they have players
+                "status": (
+                    TournamentStatus.REGISTRATION_CLOSED
+                    if statuses[i] == TournamentStatus.IN_PROGRESS
+                    else statuses[i]
+                ),
+                "max_participants": size,
+                "participant_count": count,
+                "organizer_id": user_ids[int(rng.integers(organizers))],
+                "registration_deadline": start - timedelta(days=1),
+                "start_date": start,
+            }
+        )
+
+    with engine.begin() as conn:
+        for batch in _batches(tournament_rows):
+            conn.execute(insert(Tournament), batch)
+        tournament_ids = conn.scalars(select(Tournament.id).order_by(Tournament.id)).all()
+
+        participant_rows = []
+        for tournament_id, count in zip(tournament_ids, participant_counts):
+            for seed_number, index in enumerate(_players(rng, popularity, count), start=1):
+                participant_rows.append(
+                    {
+                        "tournament_id": tournament_id,
+                        "user_id": user_ids[index],
+                        "seed": seed_number,
+                    }
+                )
+        for batch in _batches(participant_rows):
+            conn.execute(insert(Participant), batch)
+
+    # Brackets are built by the app's own code; they stay in progress
+    started = [
+        tournament_id
+        for tournament_id, status in zip(tournament_ids, statuses)
+        if status == TournamentStatus.IN_PROGRESS
+    ]
+    matches = 0
+    with Session(engine) as db:
+        for tournament in db.scalars(select(Tournament).where(Tournament.id.in_(started))):
+            matches += start_tournament(db, tournament)
+        db.commit()
+
+    return {
+        "users": users,
+        "tournaments": tournaments,
+        "participants": len(participant_rows),
+        "matches": matches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", required=True, help="database to fill; its tables are created")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--tournaments", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from app.core.database import Base, create_db_engine
+    import app.models  # noqa: F401  (registers the tables and the search index)
+
+    engine = create_db_engine(args.url)
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    counts = generate(engine, args.users, args.tournaments, args.seed)
+    engine.dispose()
+    print(
+        ", ".join(f"{count} {name}" for name, count in counts.items())
+        + f" in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
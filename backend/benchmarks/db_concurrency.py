@@ -0,0 +1,134 @@
+"""
+Concurrency benchmark for the sync and async database stacks.
+
+Serves the same indexed tournament lookup from two in-process apps: one
+with a sync `def` handler on a sync Session (each request holds a
+threadpool worker), and one with an `async def` handler on an
+AsyncSession. Both are driven through httpx's ASGITransport with an
+increasing number of requests in flight.
+
+Run from the backend directory:
+
+    python -m benchmarks.db_concurrency --concurrency 1 10 50 200
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.database import Base, to_async_url
+from app.models import Tournament, User
+
+TOURNAMENTS = 1_000
+
+
+def populate(url: str) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"email": "bench@example.com", "password_hash": "x", "display_name": "bench"}],
+        )
+        conn.execute(
+            insert(Tournament),
+            [
+                {
+                    "name": f"Cup {i}",
+                    "game": "Chess",
+                    "organizer_id": 1,
+                    "registration_deadline": datetime(2026, 1, 1),
+                    "start_date": datetime(2026, 1, 2),
+                }
+                for i in range(TOURNAMENTS)
+            ],
+        )
+    engine.dispose()
+
+
+def sync_app(url: str) -> FastAPI:
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Local = sessionmaker(bind=engine)
+    app = FastAPI()
+
+    def get_db():
+        db = Local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/tournaments/{tournament_id}")
+    def read(tournament_id: int, db: Session = Depends(get_db)):
+        return {"name": db.get(Tournament, tournament_id).name}
+
+    return app
+
+
+def async_app(url: str) -> FastAPI:
+    engine = create_async_engine(to_async_url(url))
+    Local = async_sessionmaker(bind=engine)
+    app = FastAPI()
+
+    async def get_db():
+        async with Local() as db:
+            yield db
+
+    @app.get("/tournaments/{tournament_id}")
+    async def read(tournament_id: int, db: AsyncSession = Depends(get_db)):
+        return {"name": (await db.get(Tournament, tournament_id)).name}
+
+    return app
+
+
+async def drive(app: FastAPI, concurrency: int, requests: int) -> float:
+    """Issue `requests` GETs with `concurrency` in flight; return requests/sec."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(requests))
+
+        async def worker():
+            for i in counter:
+                response = await client.get(f"/tournaments/{i % TOURNAMENTS + 1}")
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def compare(url: str, levels, requests: int) -> None:
+    # Both apps live on one event loop; the async engine's pool is bound to it
+    apps = {"sync": sync_app(url), "async": async_app(url)}
+
+    print(f"{'in flight':>10} {'sync (req/s)':>14} {'async (req/s)':>14}")
+    for concurrency in levels:
+        rates = {
+            name: await drive(app, concurrency, requests) for name, app in apps.items()
+        }
+        print(f"{concurrency:>10} {rates['sync']:>14.0f} {rates['async']:>14.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        populate(url)
+        asyncio.run(compare(url, args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
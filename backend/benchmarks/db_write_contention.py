@@ -0,0 +1,116 @@
+"""
+Write-contention benchmark for the database engine settings.
+
+Simulates a check-in rush: many threads each run short write transactions
+against the same database. Reports throughput and how many transactions
+failed with "database is locked", once with SQLite's defaults and once with
+the tuned engine from core/database.py. Pass --url to run the tuned
+configuration against another database (e.g. a local PostgreSQL).
+
+Run from the backend directory:
+
+    python -m benchmarks.db_write_contention --threads 32
+    python -m benchmarks.db_write_contention --url postgresql://localhost/tournament_bench
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import Base, create_db_engine, is_sqlite
+from app.models import Participant, Tournament, User
+
+
+def populate(engine, threads: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"email": f"p{i}@example.com", "password_hash": "x", "display_name": f"p{i}"}
+                for i in range(threads)
+            ],
+        )
+        conn.execute(
+            insert(Tournament),
+            [
+                {
+                    "name": "Check-in Cup",
+                    "game": "Chess",
+                    "organizer_id": 1,
+                    "registration_deadline": datetime(2026, 1, 1),
+                    "start_date": datetime(2026, 1, 2),
+                }
+            ],
+        )
+        conn.execute(
+            insert(Participant),
+            [{"tournament_id": 1, "user_id": i + 1} for i in range(threads)],
+        )
+
+
+def hammer(engine, threads: int, writes: int) -> dict:
+    locked = 0
+    lock = threading.Lock()
+
+    def worker(participant_id: int):
+        nonlocal locked
+        for _ in range(writes):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        update(Participant)
+                        .where(Participant.id == participant_id)
+                        .values(checked_in=True)
+                    )
+            except OperationalError:
+                with lock:
+                    locked += 1
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i + 1,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = threads * writes
+    return {"tx_per_sec": (total - locked) / elapsed, "failed": locked, "total": total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--url", help="database to test instead of a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engines = {"tuned": create_db_engine(url)}
+        if is_sqlite(url):
+            # SQLite's defaults: rollback journal, no busy timeout
+            engines["default"] = create_engine(
+                url,
+                connect_args={"check_same_thread": False, "timeout": 0},
+                pool_size=args.threads,
+            )
+
+        print(f"{'engine':>8} {'tx/s':>10} {'failed':>8} {'total':>8}")
+        for name, engine in sorted(engines.items()):
+            populate(engine, args.threads)
+            r = hammer(engine, args.threads, args.writes)
+            print(f"{name:>8} {r['tx_per_sec']:>10.0f} {r['failed']:>8} {r['total']:>8}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
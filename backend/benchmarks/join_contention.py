@@ -0,0 +1,144 @@
+"""
+Concurrent-join stress test for tournament registration.
+
+Thousands of users try to join one tournament at the same time, through
+the old read-count-then-insert sequence and through
+services/registration.py. Reports joins per second and whether the
+tournament ended up overfilled or with a participant_count that disagrees
+with its participant rows. Every user also sends a duplicate join; for the
+old sequence those only fail on the unique constraint (counted as errors).
+
+Run from the backend directory:
+
+    python -m benchmarks.join_contention --users 2000 --capacity 256
+    python -m benchmarks.join_contention --url postgresql://localhost/tournament_bench
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models import Participant, Tournament, TournamentStatus, User
+from app.services.registration import RegistrationError, join_tournament
+
+
+def populate(engine, users: int, capacity: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"email": f"p{i}@example.com", "password_hash": "x", "display_name": f"p{i}"}
+                for i in range(users)
+            ],
+        )
+        conn.execute(
+            insert(Tournament),
+            [
+                {
+                    "name": "Rush Cup",
+                    "game": "Chess",
+                    "organizer_id": 1,
+                    "max_participants": capacity,
+                    "status": TournamentStatus.OPEN,
+                    "registration_deadline": datetime(2026, 1, 1),
+                    "start_date": datetime(2026, 1, 2),
+                }
+            ],
+        )
+
+
+def naive_join(db, user_id: int) -> None:
+    """The original four-query join from routers/tournament.py."""
+    tournament = db.get(Tournament, 1)
+    count = db.query(Participant).filter(Participant.tournament_id == 1).count()
+    if count >= tournament.max_participants:
+        raise RegistrationError("Tournament is full")
+    existing = (
+        db.query(Participant)
+        .filter(Participant.tournament_id == 1, Participant.user_id == user_id)
+        .first()
+    )
+    if existing:
+        raise RegistrationError("Already joined this tournament")
+    db.add(Participant(tournament_id=1, user_id=user_id))
+    db.flush()
+
+
+def atomic_join(db, user_id: int) -> None:
+    join_tournament(db, 1, user_id)
+
+
+JOINS = {"naive": naive_join, "atomic": atomic_join}
+
+
+def rush(engine, join, users: int, workers: int) -> dict:
+    Session = sessionmaker(bind=engine)
+    outcomes = {"joined": 0, "rejected": 0, "errors": 0}
+
+    def attempt(user_id: int) -> str:
+        db = Session()
+        try:
+            join(db, user_id)
+            db.commit()
+            return "joined"
+        except RegistrationError:
+            db.rollback()
+            return "rejected"
+        except (IntegrityError, OperationalError):
+            db.rollback()
+            return "errors"
+        finally:
+            db.close()
+
+    # Each user sends two joins, so duplicates race each other too
+    requests = [user_id for user_id in range(1, users + 1) for _ in range(2)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for outcome in pool.map(attempt, requests):
+            outcomes[outcome] += 1
+    elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        rows = conn.scalar(select(func.count()).select_from(Participant))
+        counter = conn.scalar(select(Tournament.participant_count))
+    return {**outcomes, "rows": rows, "counter": counter, "per_sec": len(requests) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--capacity", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--url", help="database to test instead of a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+
+        print(
+            f"{'join':>7} {'req/s':>8} {'joined':>7} {'rejected':>9} {'errors':>7}"
+            f" {'rows':>6} {'counter':>8}  capacity={args.capacity}"
+        )
+        for name, join in JOINS.items():
+            engine = create_db_engine(url)
+            populate(engine, args.users, args.capacity)
+            r = rush(engine, join, args.users, args.workers)
+            print(
+                f"{name:>7} {r['per_sec']:>8.0f} {r['joined']:>7} {r['rejected']:>9}"
+                f" {r['errors']:>7} {r['rows']:>6} {r['counter']:>8}"
+            )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Reproducible in-process load test of the API.
+
+Generates a scratch SQLite database with benchmarks/datagen.py, then drives
+the real app through httpx's ASGITransport (lifespan included, scheduler
+off) with concurrent clients, one scenario after the other:
+
+    login         POST /api/auth/login, random users (bcrypt bound)
+    list          GET /api/tournaments/, unfiltered or by game or status
+    join          POST /api/tournaments/{id}/join, free places of open tournaments
+    match_update  PUT /api/matches/{id}, completing pending matches as organizer
+    match_list    GET /api/tournaments/{id}/matches of in-progress tournaments
+
+Each scenario reports requests/sec and p50/p95/p99 latency, printed and
+written as JSON with --out. Everything random is seeded, so two runs of
+the same arguments send the same requests against the same data. With
+--baseline, the run is compared against an earlier report and the script
+exits non-zero if any scenario got slower or less successful than the
+tolerance allows.
+
+Run from the backend directory:
+
+    python -m benchmarks.load --out baseline.json
+    python -m benchmarks.load --baseline baseline.json --out current.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import httpx
+import numpy as np
+
+from benchmarks.datagen import GAMES, PASSWORD
+
+# Requests per scenario unless --requests is given; logins cost a bcrypt each
+DEFAULT_REQUESTS = {
+    "login": 100,
+    "list": 1000,
+    "join": 1000,
+    "match_update": 1000,
+    "match_list": 1000,
+}
+WARMUP = 10
+# A metric this much worse than the baseline is a regression
+DEFAULT_TOLERANCE = 0.2
+
+Request = Tuple[str, str, dict]
+
+
+@dataclass
+class Fixtures:
+    """What the scenarios draw their requests from, read back from the data."""
+
+    users: int
+    open_places: List[Tuple[int, int]] = field(default_factory=list)
+    pending_matches: List[Tuple[int, int, int]] = field(default_factory=list)
+    in_progress: List[int] = field(default_factory=list)
+    tokens: Dict[int, str] = field(default_factory=dict)
+
+    def headers(self, user_id: int) -> dict:
+        from app.utils.security import create_access_token
+
+        if user_id not in self.tokens:
+            self.tokens[user_id] = create_access_token(data={"sub": str(user_id)})
+        return {"Authorization": f"Bearer {self.tokens[user_id]}"}
+
+
+def load_fixtures(engine, users: int, rng: random.Random) -> Fixtures:
+    from sqlalchemy import select
+
+    from app.models import (
+        Match,
+        MatchStatus,
+        Participant,
+        Tournament,
+        TournamentStatus,
+        User,
+    )
+
+    fixtures = Fixtures(users=users)
+    with engine.connect() as conn:
+        user_ids = conn.scalars(select(User.id).order_by(User.id)).all()
+        joined = set(conn.execute(select(Participant.tournament_id, Participant.user_id)))
+        # Free places of open tournaments, each given to a user not yet in it
+        for tournament_id, free in conn.execute(
+            select(
+                Tournament.id, Tournament.max_participants - Tournament.participant_count
+            ).where(Tournament.status == TournamentStatus.OPEN)
+        ):
+            for _ in range(free):
+                user_id = rng.choice(user_ids)
+                if (tournament_id, user_id) not in joined:
+                    joined.add((tournament_id, user_id))
+                    fixtures.open_places.append((tournament_id, user_id))
+        fixtures.pending_matches = [
+            tuple(row)
+            for row in conn.execute(
+                select(Match.id, Match.player1_id, Tournament.organizer_id)
+                .join(Tournament, Tournament.id == Match.tournament_id)
+                .where(
+                    Match.status == MatchStatus.PENDING,
+                    Match.player1_id.is_not(None),
+                    Match.player2_id.is_not(None),
+                )
+                .order_by(Match.id)
+            )
+        ]
+        fixtures.in_progress = conn.scalars(
+            select(Tournament.id).where(Tournament.status == TournamentStatus.IN_PROGRESS)
+        ).all()
+    rng.shuffle(fixtures.open_places)
+    rng.shuffle(fixtures.pending_matches)
+    return fixtures
+
+
+def login_requests(fixtures: Fixtures, rng: random.Random) -> Iterator[Request]:
+    while True:
+        email = f"user{rng.randrange(fixtures.users)}@example.com"
+        yield "POST", "/api/auth/login", {"data": {"username": email, "password": PASSWORD}}
+
+
+def list_requests(fixtures: Fixtures, rng: random.Random) -> Iterator[Request]:
+    games = list(GAMES)
+    while True:
+        params = rng.choice([{}, {"game": rng.choice(games)}, {"status": "open"}])
+        yield "GET", "/api/tournaments/", {"params": params}
+
+
+def join_requests(fixtures: Fixtures, rng: random.Random) -> Iterator[Request]:
+    # Each place is used once: a repeated join would only measure the 400
+    for tournament_id, user_id in fixtures.open_places:
+        yield "POST", f"/api/tournaments/{tournament_id}/join", {
+            "headers": fixtures.headers(user_id)
+        }
+
+
+def match_update_requests(fixtures: Fixtures, rng: random.Random) -> Iterator[Request]:
+    for match_id, winner_id, organizer_id in fixtures.pending_matches:
+        yield "PUT", f"/api/matches/{match_id}", {
+            "json": {
+                "status": "completed",
+                "winner_id": winner_id,
+                "player1_score": 2,
+                "player2_score": rng.randrange(2),
+            },
+            "headers": fixtures.headers(organizer_id),
+        }
+
+
+def match_list_requests(fixtures: Fixtures, rng: random.Random) -> Iterator[Request]:
+    while True:
+        yield "GET", f"/api/tournaments/{rng.choice(fixtures.in_progress)}/matches", {}
+
+
+SCENARIOS: Dict[str, Callable[[Fixtures, random.Random], Iterator[Request]]] = {
+    "login": login_requests,
+    "list": list_requests,
+    "join": join_requests,
+    "match_update": match_update_requests,
+    "match_list": match_list_requests,
+}
+
+
+async def drive(client, requests: Iterator[Request], count: int, concurrency: int) -> dict:
+    """Send `count` requests from `requests` over `concurrency` clients."""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    pending = iter(range(count))
+
+    async def worker():
+        for _ in pending:
+            try:
+                method, url, kwargs = next(requests)
+            except StopIteration:
+                return
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                key = str(response.status_code)
+                errors[key] = errors.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    if len(latencies) < count:
+        raise SystemExit(
+            f"Only {len(latencies)} of {count} requests could be built; generate more data"
+        )
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]).tolist()
+    return {
+        "requests": count,
+        "errors": sum(errors.values()),
+        "error_statuses": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(count / elapsed, 1),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "max_ms": round(max(latencies), 3),
+    }
+
+
+async def run_scenarios(app, fixtures: Fixtures, args) -> Dict[str, dict]:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in args.scenarios:
+                rng = random.Random(f"{args.seed}-{name}")
+                requests = SCENARIOS[name](fixtures, rng)
+                count = args.requests or DEFAULT_REQUESTS[name]
+                await drive(client, requests, min(WARMUP, count), args.concurrency)
+                results[name] = await drive(client, requests, count, args.concurrency)
+                print_result(name, results[name])
+    return results
+
+
+def print_result(name: str, result: dict) -> None:
+    print(
+        f"{name:>13} {result['requests']:>6} {result['errors']:>6} {result['rps']:>9.1f} "
+        f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+    )
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> List[str]:
+    """The regressions of `current` against `baseline`, as readable lines."""
+    regressions = []
+    if baseline["config"] != current["config"]:
+        print("warning: the baseline was taken with a different configuration")
+    for name, now in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if now[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {metric}: {before[metric]:.2f} -> {now[metric]:.2f} "
+                    f"(+{now[metric] / before[metric] - 1:.0%})"
+                )
+        if now["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name} rps: {before['rps']:.1f} -> {now['rps']:.1f} "
+                f"({now['rps'] / before['rps'] - 1:.0%})"
+            )
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{name} errors: {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--tournaments", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--requests", type=int, default=None, help="per scenario (default: per-scenario counts)"
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--out", help="write the report to this JSON file")
+    parser.add_argument("--baseline", help="a report to compare this run against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import, so point the app at a scratch database first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'load.db')}"
+        os.environ["SCHEDULER_ENABLED"] = "false"
+
+        from app.core.database import init_engines
+        from app.core.migrations import upgrade_database
+        from app.main import app
+        from benchmarks.datagen import generate
+
+        # The lifespan reuses these engines
+        engine, _ = init_engines()
+        upgrade_database(engine)
+        started = time.perf_counter()
+        counts = generate(engine, args.users, args.tournaments, args.seed)
+        print(
+            ", ".join(f"{count} {name}" for name, count in counts.items())
+            + f" generated in {time.perf_counter() - started:.1f}s"
+        )
+        fixtures = load_fixtures(engine, args.users, random.Random(args.seed))
+
+        print(
+            f"{'scenario':>13} {'reqs':>6} {'errors':>6} {'req/s':>9} "
+            f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}"
+        )
+        scenarios = asyncio.run(run_scenarios(app, fixtures, args))
+        engine.dispose()
+
+    report = {
+        "config": {
+            "users": args.users,
+            "tournaments": args.tournaments,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "scenarios": scenarios,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
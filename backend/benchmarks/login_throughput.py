@@ -0,0 +1,115 @@
+"""
+Login throughput benchmark for the password hashing pool.
+
+Registers a set of users, then fires concurrent logins at the real app
+through httpx's ASGITransport while a second client keeps polling /health.
+Runs once with hashing on threads (PASSWORD_HASH_WORKERS=0) and once per
+requested process count, reporting logins/sec and the /health p95 latency
+seen during the burst.
+
+Run from the backend directory:
+
+    python -m benchmarks.login_throughput --workers 2 4 --logins 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+USERS = 20
+
+
+async def burst(app, logins: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(logins))
+        done = asyncio.Event()
+        health_ms = []
+
+        async def login_worker():
+            for i in counter:
+                response = await client.post(
+                    "/api/auth/login",
+                    data={"username": f"user{i % USERS}@example.com", "password": "hunter22"},
+                )
+                response.raise_for_status()
+
+        async def health_probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                health_ms.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.005)
+
+        probe = asyncio.create_task(health_probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe
+
+    return {
+        "logins_per_sec": logins / elapsed,
+        "health_p95_ms": statistics.quantiles(health_ms, n=20)[-1]
+        if len(health_ms) > 1
+        else float("nan"),
+    }
+
+
+async def register_users(app) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(USERS):
+            response = await client.post(
+                "/api/auth/register",
+                json={
+                    "email": f"user{i}@example.com",
+                    "display_name": f"user{i}",
+                    "password": "hunter22",
+                },
+            )
+            response.raise_for_status()
+
+
+async def compare(worker_counts, logins: int, concurrency: int) -> None:
+    # One event loop for everything: the async engine's pool is bound to it
+    from app.core.config import settings
+    from app.core.database import init_engines
+    from app.core.migrations import upgrade_database
+    from app.main import app
+    from app.utils.security import shutdown_password_hashing
+
+    upgrade_database(init_engines()[0])
+    async with app.router.lifespan_context(app):
+        await register_users(app)
+
+        print(f"{'hash workers':>14} {'logins/s':>10} {'/health p95 (ms)':>17}")
+        for workers in worker_counts:
+            settings.password_hash_workers = workers
+            shutdown_password_hashing()
+            r = await burst(app, logins, concurrency)
+            label = "threads" if workers == 0 else f"{workers} procs"
+            print(f"{label:>14} {r['logins_per_sec']:>10.1f} {r['health_p95_ms']:>17.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import, so point the app at a scratch database first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("SCHEDULER_ENABLED", "false")
+        asyncio.run(compare([0, *args.workers], args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
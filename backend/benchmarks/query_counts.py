@@ -0,0 +1,176 @@
+"""
+Query counts of the endpoints that embed related names.
+
+Builds tournaments of different sizes in a scratch SQLite database and
+counts the SQL statements each endpoint issues through the real app. A
+count that grows with the tournament means an N+1 lazy load crept in; the
+script prints every count and exits non-zero if any endpoint's count
+differs between sizes.
+
+Run from the backend directory:
+
+    python -m benchmarks.query_counts --sizes 8 256
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from sqlalchemy import insert, select
+
+PASSWORD = "hunter22"
+
+
+def build(client, headers, session_factory, size: int, status: str) -> int:
+    """A tournament with `size` participants (users bulk-inserted), in `status`."""
+    from app.models import Participant, User
+
+    tournament_id = client.post(
+        "/api/tournaments/",
+        json={
+            "name": f"Cup {size}",
+            "game": "Chess",
+            "max_participants": size + 1,
+            "registration_deadline": "2030-01-01T00:00:00Z",
+            "start_date": "2030-01-02T00:00:00Z",
+        },
+        headers=headers,
+    ).json()["id"]
+    client.put(f"/api/tournaments/{tournament_id}", json={"status": status}, headers=headers)
+
+    with session_factory() as db:
+        first = db.scalar(select(User.id).order_by(User.id.desc()).limit(1)) + 1
+        db.execute(
+            insert(User),
+            [
+                {
+                    "email": f"player{tournament_id}-{i}@example.com",
+                    "password_hash": "x",
+                    "display_name": f"Player {i}",
+                }
+                for i in range(size)
+            ],
+        )
+        db.execute(
+            insert(Participant),
+            [{"tournament_id": tournament_id, "user_id": first + i} for i in range(size)],
+        )
+        db.commit()
+    return tournament_id
+
+
+def measure(client, headers, counter_factory, session_factory, size: int) -> dict:
+    counts = {}
+
+    def count(label, method, url, **kwargs):
+        with counter_factory() as counter:
+            response = client.request(method, url, headers=headers, **kwargs)
+        assert response.status_code < 400, (label, response.status_code, response.text)
+        counts[label] = counter.count
+        return response
+
+    # Joining goes through an open tournament of the same size
+    open_id = build(client, headers, session_factory, size, "open")
+    joiner = register(client, f"joiner{size}@example.com")
+    with counter_factory() as counter:
+        response = client.post(f"/api/tournaments/{open_id}/join", headers=joiner)
+    assert response.status_code == 201, response.text
+    counts["POST /tournaments/{id}/join"] = counter.count
+
+    tournament_id = build(client, headers, session_factory, size, "open")
+    client.post(f"/api/tournaments/{tournament_id}/start", headers=headers)
+    base = f"/api/tournaments/{tournament_id}"
+
+    count("GET /tournaments/{id}/participants", "GET", f"{base}/participants")
+    matches = count("GET /tournaments/{id}/matches", "GET", f"{base}/matches").json()
+    count("GET /tournaments/{id}/matches?stream", "GET", f"{base}/matches?stream=true")
+    count("GET /tournaments/{id}/bracket", "GET", f"{base}/bracket")
+
+    playable = [m for m in matches if m["player1_id"] and m["player2_id"]]
+    first, rest = playable[0], playable[1:]
+    count("GET /matches/{id}", "GET", f"/api/matches/{first['id']}")
+    count(
+        "PUT /matches/{id}",
+        "PUT",
+        f"/api/matches/{first['id']}",
+        json={"status": "completed", "winner_id": first["player1_id"]},
+    )
+    count(
+        "PATCH /tournaments/{id}/matches",
+        "PATCH",
+        f"{base}/matches",
+        json=[
+            {"id": m["id"], "status": "completed", "winner_id": m["player2_id"]}
+            for m in rest
+        ],
+    )
+    count("GET /tournaments/{id}/standings", "GET", f"{base}/standings")
+    return counts
+
+
+def register(client, email: str) -> dict:
+    response = client.post(
+        "/api/auth/register",
+        json={"email": email, "display_name": email.split("@")[0], "password": PASSWORD},
+    )
+    response.raise_for_status()
+    token = client.post(
+        "/api/auth/login", data={"username": email, "password": PASSWORD}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    # Warm the user cache so every counted request resolves the token the same way
+    client.get("/api/users/me", headers=headers)
+    return headers
+
+
+def run(sizes) -> bool:
+    from fastapi.testclient import TestClient
+
+    from app.core.database import SessionLocal, init_engines
+    from app.core.migrations import upgrade_database
+    from app.main import app
+    from app.utils.query_counter import QueryCounter
+
+    # The lifespan reuses these engines, so the counter sees the app's queries
+    engine, async_engine = init_engines()
+    upgrade_database(engine)
+
+    def counter_factory():
+        return QueryCounter(engine, async_engine.sync_engine)
+
+    with TestClient(app) as client:
+        organizer = register(client, "organizer@example.com")
+        results = {
+            size: measure(client, organizer, counter_factory, SessionLocal, size)
+            for size in sizes
+        }
+
+    labels = list(results[sizes[0]])
+    width = max(len(label) for label in labels)
+    print(f"{'endpoint':<{width}} " + " ".join(f"{size:>8}" for size in sizes))
+    stable = True
+    for label in labels:
+        row = [results[size][label] for size in sizes]
+        flag = "" if len(set(row)) == 1 else "  <-- grows with size"
+        stable = stable and not flag
+        print(f"{label:<{width}} " + " ".join(f"{value:>8}" for value in row) + flag)
+    return stable
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 256])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import, so point the app at a scratch database first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+        os.environ.setdefault("SCHEDULER_ENABLED", "false")
+        stable = run(args.sizes)
+    sys.exit(0 if stable else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Throughput of the vectorized rating replay.
+
+Generates a synthetic history (players of hidden strength playing random
+opponents over many rating periods) and times services.rating_replay.replay
+on it, reporting matches per second and the projected time for 10M
+matches. A small history is also replayed with the scalar Glicko-2 code
+used for live updates, and the largest rating difference is reported.
+
+Run from the backend directory:
+
+    python -m benchmarks.rating_replay --matches 1000000 --players 50000
+"""
+
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from app.services.rating_replay import replay
+from app.services.ratings import Rating, glicko2
+
+
+def synthetic_history(matches: int, players: int, periods: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    strength = rng.normal(0, 1, players)
+    first = rng.integers(0, players, matches)
+    second = (first + rng.integers(1, players, matches)) % players
+    win_chance = 1 / (1 + np.exp(strength[second] - strength[first]))
+    outcome = rng.random(matches)
+    score = np.where(outcome < win_chance, 1.0, 0.0)
+    score[np.abs(outcome - win_chance) < 0.03] = 0.5
+    period = np.sort(rng.integers(0, periods, matches))
+    return period, first, second, score
+
+
+def scalar_replay(period, first, second, score, players):
+    """Reference: the same periods, one player at a time with ratings.glicko2."""
+    ratings = [Rating() for _ in range(players)]
+    for current in range(int(period[-1]) + 1):
+        results = defaultdict(list)
+        for i in np.flatnonzero(period == current):
+            a, b, s = int(first[i]), int(second[i]), float(score[i])
+            results[a].append((ratings[b], s))
+            results[b].append((ratings[a], 1 - s))
+        ratings = [glicko2(ratings[p], results.get(p, [])) for p in range(players)]
+    return np.array([r.rating for r in ratings]), np.array([r.rd for r in ratings])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=1_000_000)
+    parser.add_argument("--players", type=int, default=50_000)
+    parser.add_argument("--periods", type=int, default=520)
+    args = parser.parse_args()
+
+    history = synthetic_history(args.matches, args.players, args.periods)
+    started = time.perf_counter()
+    replay(*history, args.players)
+    elapsed = time.perf_counter() - started
+    rate = args.matches / elapsed
+    print(
+        f"{args.matches} matches, {args.players} players, {args.periods} periods: "
+        f"{elapsed:.2f}s ({rate:,.0f} matches/s, ~{10_000_000 / rate / 60:.1f} min for 10M)"
+    )
+
+    small = synthetic_history(3_000, 200, 30, seed=1)
+    rating, rd, _ = replay(*small, 200)
+    expected_rating, expected_rd = scalar_replay(*small, 200)
+    print(
+        "max difference from scalar Glicko-2: "
+        f"rating {np.abs(rating - expected_rating).max():.2e}, "
+        f"rd {np.abs(rd - expected_rd).max():.2e}"
+    )
+
+
+if __name__ == "__main__":
+    main()
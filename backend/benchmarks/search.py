@@ -0,0 +1,129 @@
+"""
+Benchmark for full-text search.
+
+Fills a scratch SQLite database with generated tournaments and users
+(indexed by the triggers as they are inserted), then times search queries
+of different selectivity through services/search.py.
+
+Run from the backend directory:
+
+    python -m benchmarks.search --rows 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import insert
+
+WORDS = (
+    "summer winter spring autumn open cup clash masters league series invitational "
+    "regional national grand prix showdown arena legends rising stars weekly monthly "
+    "night blitz rapid classic championship qualifier finals major minor"
+).split()
+GAMES = ("Chess", "Go", "Valorant", "Dota 2", "League of Legends", "StarCraft II", "Tekken 8")
+NAMES = (
+    "alex sam jordan taylor morgan casey riley jamie avery quinn kai noah emma liam "
+    "olivia mia lucas zoe leo nina omar yuki ivan sofia"
+).split()
+
+QUERIES = [
+    "summer cup",  # common words
+    "grand prix tekken",  # name and game
+    "legends 4242",  # rare number
+    "ri",  # two-letter prefix, many matches
+    "yuki 77",  # a player
+]
+
+BATCH = 50_000
+
+
+def fill(engine, rows: int, seed: int) -> float:
+    from app.models import Tournament, User
+
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for start in range(0, rows, BATCH):
+            count = min(BATCH, rows - start)
+            users = rng.integers(0, len(NAMES), size=(count, 2))
+            conn.execute(
+                insert(User),
+                [
+                    {
+                        "email": f"player{start + i}@example.com",
+                        "password_hash": "x",
+                        "display_name": f"{NAMES[a]} {NAMES[b]} {start + i}",
+                    }
+                    for i, (a, b) in enumerate(users.tolist())
+                ],
+            )
+            words = rng.integers(0, len(WORDS), size=(count, 3))
+            games = rng.integers(0, len(GAMES), size=count)
+            conn.execute(
+                insert(Tournament),
+                [
+                    {
+                        "name": f"{WORDS[a].title()} {WORDS[b].title()} {start + i}",
+                        "description": f"A {WORDS[c]} event",
+                        "game": GAMES[g],
+                        "organizer_id": 1,
+                        "registration_deadline": datetime(2030, 1, 1),
+                        "start_date": datetime(2030, 1, 2),
+                    }
+                    for i, ((a, b, c), g) in enumerate(zip(words.tolist(), games.tolist()))
+                ],
+            )
+    return time.perf_counter() - started
+
+
+async def time_queries(url: str, repeat: int) -> None:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.core.database import to_async_url
+    from app.services.search import search
+
+    engine = create_async_engine(to_async_url(url))
+    session_factory = async_sessionmaker(engine)
+    print(f"{'query':>20} {'hits':>5} {'median (ms)':>12} {'max (ms)':>9}")
+    async with session_factory() as db:
+        for query in QUERIES:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                hits = await search(db, query, None, None, 20)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(
+                f"{query:>20} {len(hits):>5} {statistics.median(timings):>12.2f} "
+                f"{max(timings):>9.2f}"
+            )
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="tournaments and users each")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from app.core.database import Base, create_db_engine
+    import app.models  # noqa: F401  (registers the tables and the search index)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'search.db')}"
+        engine = create_db_engine(url)
+        Base.metadata.create_all(bind=engine)
+        elapsed = fill(engine, args.rows, args.seed)
+        print(f"Inserted and indexed {args.rows} tournaments and users in {elapsed:.1f}s")
+        engine.dispose()
+        asyncio.run(time_queries(url, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
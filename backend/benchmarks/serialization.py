@@ -0,0 +1,137 @@
+"""
+Per-row cost of the match list before and after the orjson fast path.
+
+Loads N matches into a throwaway SQLite database and times the two halves
+of GET /tournaments/{id}/matches: fetching the rows and encoding them.
+"before" loads ORM objects and runs them through the response_model
+(validation from attributes, then Pydantic's JSON dump); "after" fetches
+column tuples and encodes them with the router's RowSerializer. Also checks
+that both produce the same bytes.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization --matches 10000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Match, MatchStatus, Tournament, User
+from app.routers.tournament import match_rows
+from app.schemas.match import MatchResponse
+
+
+def populate(engine, size: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"email": "bench@example.com", "password_hash": "x", "display_name": "bench"}],
+        )
+        conn.execute(
+            insert(Tournament),
+            [
+                {
+                    "name": "Open Qualifier",
+                    "game": "Chess",
+                    "organizer_id": 1,
+                    "registration_deadline": datetime(2026, 1, 1),
+                    "start_date": datetime(2026, 1, 2),
+                }
+            ],
+        )
+        conn.execute(
+            insert(Match),
+            [
+                {
+                    "tournament_id": 1,
+                    "round": 1 + i // 1024,
+                    "match_number": i,
+                    "player1_id": i,
+                    "player2_id": i + 1,
+                    "player1_score": i % 3,
+                    "status": MatchStatus.COMPLETED if i % 2 else MatchStatus.PENDING,
+                    "scheduled_at": datetime(2026, 1, 2),
+                    "completed_at": datetime(2026, 1, 2, 12) if i % 2 else None,
+                    "next_match_id": i + 2,
+                    "next_match_slot": 1 + i % 2,
+                }
+                for i in range(size)
+            ],
+        )
+
+
+def best_of(repeat: int, fn) -> tuple:
+    """Return (fastest wall time in seconds, last result) of `repeat` calls."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(size: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine, size)
+        Session = sessionmaker(bind=engine)
+        adapter = TypeAdapter(List[MatchResponse])
+
+        with Session() as db:
+            orm_query = select(Match).where(Match.tournament_id == 1).order_by(Match.id)
+            row_query = (
+                match_rows.select().where(Match.tournament_id == 1).order_by(Match.id)
+            )
+
+            def fetch_orm():
+                db.expunge_all()
+                return db.scalars(orm_query).all()
+
+            fetch_before, matches = best_of(repeat, fetch_orm)
+            encode_before, body_before = best_of(
+                repeat,
+                lambda: adapter.dump_json(
+                    adapter.validate_python(matches, from_attributes=True)
+                ),
+            )
+            fetch_after, rows = best_of(repeat, lambda: db.execute(row_query).all())
+            encode_after, body_after = best_of(repeat, lambda: match_rows.dumps(rows))
+
+        engine.dispose()
+
+    per_row = 1e6 / size
+    return {
+        "fetch_before_us": fetch_before * per_row,
+        "encode_before_us": encode_before * per_row,
+        "fetch_after_us": fetch_after * per_row,
+        "encode_after_us": encode_after * per_row,
+        "identical": body_before == body_after,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    r = run(args.matches, args.repeat)
+    print(f"{'path':>8} {'fetch (us/row)':>15} {'encode (us/row)':>16} {'total':>8}")
+    for name in ("before", "after"):
+        fetch, encode = r[f"fetch_{name}_us"], r[f"encode_{name}_us"]
+        print(f"{name:>8} {fetch:>15.2f} {encode:>16.2f} {fetch + encode:>8.2f}")
+    print(f"identical output: {r['identical']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Cold-start benchmark for an API worker.
+
+Imports app.main in fresh interpreters under python -X importtime, as a
+worker process does when it boots, and reports the median import time of
+the app, the whole process and the top-level packages that cost the most.
+The run fails (exit status 1) when:
+
+- the median import of app.main is over --budget-ms;
+- a module that should load on first use (DEFERRED) is imported at boot;
+- importing the app touched the database, which it must leave to the
+  lifespan and to migrations.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup --runs 10 --budget-ms 800
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Loaded by the first request or command that needs them, never at boot
+DEFERRED = (
+    "numpy",  # Swiss pairing, rating replay
+    "jose.jwt",  # token encoding and decoding, with the crypto backends
+    "passlib.context",  # password hashing
+    "alembic",  # migrations, CLI only
+)
+
+
+def import_once(env: Dict[str, str]) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Wall time of one cold import of app.main, and the importtime log by module."""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr)
+
+    # "import time: self [us] | cumulative | imported package", nested by indent
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = (int(own), int(cumulative))
+    return wall, modules
+
+
+def by_package(modules: Dict[str, Tuple[int, int]]) -> Dict[str, int]:
+    """Self time in microseconds per top-level package."""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, (own, _) in modules.items():
+        totals[name.split(".")[0]] += own
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=800, help="for the app.main import")
+    parser.add_argument("--top", type=int, default=12, help="packages to list")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, "startup.db")
+        env = {
+            **{k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"},
+            "DATABASE_URL": f"sqlite:///{database}",
+            "PYTHONPATH": os.getcwd(),
+        }
+        # The first run writes the bytecode caches a deployed worker starts with
+        import_once(env)
+
+        walls, imports, packages = [], [], defaultdict(list)
+        imported = set()
+        for _ in range(args.runs):
+            wall, modules = import_once(env)
+            walls.append(wall)
+            imports.append(modules["app.main"][1] / 1000)
+            for package, total in by_package(modules).items():
+                packages[package].append(total / 1000)
+            imported.update(modules)
+
+        if os.path.exists(database):
+            failures.append("importing app.main created the database")
+
+    app_ms = statistics.median(imports)
+    print(f"import app.main: median {app_ms:.0f} ms, max {max(imports):.0f} ms")
+    print(f"whole process:   median {statistics.median(walls):.0f} ms")
+    print(f"\n{'package':<24} {'self (ms)':>10}")
+    ranked = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+    for package, times in ranked[: args.top]:
+        print(f"{package:<24} {statistics.median(times):>10.1f}")
+
+    if app_ms > args.budget_ms:
+        failures.append(
+            f"app.main imports in {app_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget"
+        )
+    for module in DEFERRED:
+        if module in imported:
+            failures.append(f"{module} is imported at boot")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
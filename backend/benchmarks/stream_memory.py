@@ -0,0 +1,115 @@
+"""
+Peak-memory comparison between the buffered and streaming match listings.
+
+Loads N matches into a throwaway SQLite database and measures the peak
+traced allocation of building the full JSON array versus draining the NDJSON
+stream. The streaming figure should stay flat as N grows.
+
+Run from the backend directory:
+
+    python -m benchmarks.stream_memory --sizes 10000 100000
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime
+from typing import List
+from unittest import mock
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Match, Tournament, User
+from app.routers.tournament import match_rows
+from app.schemas.match import MatchResponse
+from app.utils import streaming
+
+
+def populate(engine, size: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"email": "bench@example.com", "password_hash": "x", "display_name": "bench"}],
+        )
+        conn.execute(
+            insert(Tournament),
+            [
+                {
+                    "name": "Open Qualifier",
+                    "game": "Chess",
+                    "organizer_id": 1,
+                    "registration_deadline": datetime(2026, 1, 1),
+                    "start_date": datetime(2026, 1, 2),
+                }
+            ],
+        )
+        conn.execute(
+            insert(Match),
+            [
+                {
+                    "tournament_id": 1,
+                    "round": 1 + i // 1024,
+                    "match_number": i,
+                    "scheduled_at": datetime(2026, 1, 2),
+                }
+                for i in range(size)
+            ],
+        )
+
+
+def peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def run(size: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine, size)
+        Session = sessionmaker(bind=engine)
+        adapter = TypeAdapter(List[MatchResponse])
+
+        def buffered():
+            db = Session()
+            try:
+                matches = db.query(Match).filter(Match.tournament_id == 1).all()
+                adapter.dump_json(adapter.validate_python(matches, from_attributes=True))
+            finally:
+                db.close()
+
+        def streamed():
+            statement = match_rows.select().where(Match.tournament_id == 1)
+            with mock.patch.object(streaming, "SessionLocal", Session):
+                for _ in streaming.iter_ndjson(statement, match_rows):
+                    pass
+
+        result = {
+            "size": size,
+            "buffered_kib": peak_kib(buffered),
+            "streamed_kib": peak_kib(streamed),
+        }
+        engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'buffered (KiB)':>16} {'streamed (KiB)':>16}")
+    for size in args.sizes:
+        r = run(size)
+        print(f"{r['size']:>10} {r['buffered_kib']:>16.0f} {r['streamed_kib']:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark for Swiss pairing.
+
+Plays a whole Swiss tournament in memory: every round is paired with
+swiss_pairing.pair_round(), then decided at random with the better seed
+favoured. Prints the pairing time of each round, and checks that nobody
+met the same opponent twice and how far side balance drifted.
+
+Run from the backend directory:
+
+    python -m benchmarks.swiss_pairing --players 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.standings import DRAW_POINTS, WIN_POINTS
+from app.services.swiss import default_rounds
+from app.services.swiss_pairing import BYE, pair_round
+
+DRAW_RATE = 0.1
+
+
+def play(players: int, rounds: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    # Seed order is strength order, with some noise per game
+    strength = np.linspace(2400, 1200, players)
+    scores = np.zeros(players, dtype=np.int64)
+    opponents = np.full((players, rounds), BYE, dtype=np.int32)
+    sides = np.zeros((players, rounds), dtype=np.int8)
+
+    print(f"{'round':>5} {'pairs':>6} {'pair (ms)':>10} {'leader':>7}")
+    for played in range(rounds):
+        started = time.perf_counter()
+        pairs, bye = pair_round(scores, opponents[:, :played], sides[:, :played])
+        elapsed = (time.perf_counter() - started) * 1000
+
+        first, second = np.array(pairs).T
+        opponents[first, played], opponents[second, played] = second, first
+        sides[first, played], sides[second, played] = 1, -1
+
+        expected = 1 / (1 + 10 ** ((strength[second] - strength[first]) / 400))
+        roll = rng.random(len(pairs))
+        draws = np.abs(roll - expected) < DRAW_RATE / 2
+        first_wins = (roll < expected) & ~draws
+        scores[first] += np.where(draws, DRAW_POINTS, np.where(first_wins, WIN_POINTS, 0))
+        scores[second] += np.where(draws, DRAW_POINTS, np.where(first_wins, 0, WIN_POINTS))
+        if bye is not None:
+            scores[bye] += WIN_POINTS
+
+        print(f"{played + 1:>5} {len(pairs):>6} {elapsed:>10.1f} {scores.max():>7}")
+
+    met = opponents[opponents >= 0].size
+    distinct = len({(a, b) for a, row in enumerate(opponents.tolist()) for b in row if b >= 0})
+    balance = np.abs(sides.sum(axis=1))
+    print(f"rematches: {(met - distinct) // 2}")
+    print(f"side balance: max {balance.max()}, players off by 2+: {(balance >= 2).sum()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=None, help="default: ceil(log2(players))")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    play(args.players, args.rounds or default_rounds(args.players), args.seed)
+
+
+if __name__ == "__main__":
+    main()
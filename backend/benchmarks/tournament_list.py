@@ -0,0 +1,148 @@
+"""
+Benchmark for the keyset-paginated tournament listing.
+
+Builds a throwaway SQLite database per size, bulk-loads tournaments and times
+the first page, a deep page (reached through a cursor) and a filtered page.
+Latency should stay flat as the table grows.
+
+Run from the backend directory:
+
+    python -m benchmarks.tournament_list --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import Base, to_async_url
+from app.models import Tournament, TournamentFormat, TournamentStatus, User
+from app.routers.tournament import get_tournaments
+from app.utils.pagination import encode_cursor
+
+GAMES = ["Valorant", "League of Legends", "Rocket League", "Apex Legends", "Chess"]
+BATCH_SIZE = 50_000
+
+
+def populate(engine, size: int) -> None:
+    """Insert `size` tournaments with executemany batches."""
+    rng = random.Random(size)
+    base = datetime(2026, 1, 1)
+    statuses = list(TournamentStatus)
+    formats = list(TournamentFormat)
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"email": "bench@example.com", "password_hash": "x", "display_name": "bench"}],
+        )
+        for offset in range(0, size, BATCH_SIZE):
+            rows = []
+            for _ in range(min(BATCH_SIZE, size - offset)):
+                start = base + timedelta(minutes=rng.randrange(0, 60 * 24 * 365 * 3))
+                rows.append(
+                    {
+                        "name": f"Cup {offset + len(rows)}",
+                        "game": rng.choice(GAMES),
+                        "format": rng.choice(formats),
+                        "status": rng.choice(statuses),
+                        "max_participants": 16,
+                        "organizer_id": 1,
+                        "registration_deadline": start - timedelta(days=1),
+                        "start_date": start,
+                    }
+                )
+            conn.execute(insert(Tournament), rows)
+
+
+async def time_call(fn, repeat: int) -> float:
+    """Return the median wall time of awaiting `fn()` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def list_page(db, cursor=None, game=None, status=None):
+    return get_tournaments(
+        game=game,
+        tournament_status=status,
+        tournament_format=None,
+        start_from=None,
+        start_to=None,
+        cursor=cursor,
+        limit=20,
+        db=db,
+    )
+
+
+async def measure(url: str, size: int, repeat: int) -> dict:
+    async_engine = create_async_engine(to_async_url(url))
+    try:
+        async with AsyncSession(async_engine) as db:
+            # Cursor pointing at the row 90% of the way through the table
+            deep = (
+                await db.execute(
+                    select(Tournament.start_date, Tournament.id)
+                    .order_by(Tournament.start_date, Tournament.id)
+                    .offset(int(size * 0.9))
+                    .limit(1)
+                )
+            ).one()
+            deep_cursor = encode_cursor(deep.start_date, deep.id)
+
+            return {
+                "size": size,
+                "first_page_ms": await time_call(lambda: list_page(db), repeat),
+                "deep_page_ms": await time_call(
+                    lambda: list_page(db, deep_cursor), repeat
+                ),
+                "filtered_page_ms": await time_call(
+                    lambda: list_page(
+                        db, game="Chess", status=TournamentStatus.COMPLETED
+                    ),
+                    repeat,
+                ),
+            }
+    finally:
+        await async_engine.dispose()
+
+
+def run(size: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        populate(engine, size)
+        engine.dispose()
+        return asyncio.run(measure(url, size, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'first (ms)':>12} {'deep (ms)':>12} {'filtered (ms)':>14}")
+    for size in args.sizes:
+        r = run(size, args.repeat)
+        print(
+            f"{r['size']:>10} {r['first_page_ms']:>12.3f} "
+            f"{r['deep_page_ms']:>12.3f} {r['filtered_page_ms']:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Alembic environment for the app's models.
+
+The database is DATABASE_URL unless a caller (app/core/migrations.py)
+hands over a connection in config.attributes["connection"]. SQLite cannot
+alter most of a table in place, so migrations run in batch mode, which
+rebuilds the table when needed.
+
+The search index (models/search.py) is created by raw DDL rather than the
+metadata, so autogenerate is told to leave it alone (include_object).
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+
+import app.models  # noqa: F401  (registers every table)
+from app.core.config import settings
+from app.core.database import Base, create_db_engine
+from app.core.migrations import include_object
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logging", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_offline() -> None:
+    """
+    Write the SQL to stdout instead of running it (alembic upgrade --sql).
+
+    SQLite's batch table rebuilds reflect the live table, so there only
+    revisions that do not alter existing tables can be rendered.
+    """
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations(connection)
+        return
+
+    engine = create_db_engine(settings.database_url)
+    try:
+        with engine.connect() as connection:
+            run_migrations(connection)
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,246 @@
+"""tournament engine
+
+Brackets with successor links and Swiss rounds, version counters,
+participant counts, refresh and revoked tokens, standings, player stats
+and ratings, the scheduler's leases, and the registration_closed status
+and swiss format.
+
+participant_count is filled from the existing participants. Standings,
+player stats and ratings start empty; python -m app.cli
+rebuild-aggregates and replay-ratings compute them from the matches
+already played.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 17:05:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOURNAMENT_STATUSES = ('DRAFT', 'OPEN', 'REGISTRATION_CLOSED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED')
+MATCH_BRACKETS = ('MAIN', 'LOSERS', 'GRAND_FINAL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    postgresql = op.get_bind().dialect.name == "postgresql"
+
+    if postgresql:
+        # Allowed inside the migration's transaction (PostgreSQL 12+) as long
+        # as nothing uses the new values before it commits
+        op.execute("ALTER TYPE tournamentstatus ADD VALUE IF NOT EXISTS 'REGISTRATION_CLOSED' AFTER 'OPEN'")
+        op.execute("ALTER TYPE tournamentformat ADD VALUE IF NOT EXISTS 'SWISS'")
+        # add_column does not create an enum type the way create_table does
+        op.execute(f"CREATE TYPE matchbracket AS ENUM {MATCH_BRACKETS}")
+
+    op.create_table('leases',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('holder', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('revoked_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('revoked_tokens', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_revoked_tokens_expires_at'), ['expires_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_revoked_tokens_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_revoked_tokens_jti'), ['jti'], unique=True)
+
+    op.create_table('player_ratings',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('game', sa.String(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('rd', sa.Float(), nullable=False),
+    sa.Column('volatility', sa.Float(), nullable=False),
+    sa.Column('rated_matches', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'game')
+    )
+    op.create_table('player_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('game', sa.String(), nullable=False),
+    sa.Column('played', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('draws', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('score_for', sa.Integer(), nullable=False),
+    sa.Column('score_against', sa.Integer(), nullable=False),
+    sa.Column('score_diff', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'game')
+    )
+    with op.batch_alter_table('player_stats', schema=None) as batch_op:
+        batch_op.create_index('ix_player_stats_leaderboard', ['game', 'points', 'score_diff', 'user_id'], unique=False)
+
+    op.create_table('refresh_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('token_hash', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_token_hash'), ['token_hash'], unique=True)
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_user_id'), ['user_id'], unique=False)
+
+    op.create_table('swiss_states',
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('round', sa.Integer(), nullable=False),
+    sa.Column('rounds', sa.Integer(), nullable=False),
+    sa.Column('participant_ids', sa.LargeBinary(), nullable=False),
+    sa.Column('opponents', sa.LargeBinary(), nullable=False),
+    sa.Column('sides', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+    sa.PrimaryKeyConstraint('tournament_id')
+    )
+    op.create_table('standings',
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('participant_id', sa.Integer(), nullable=False),
+    sa.Column('played', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('draws', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('score_for', sa.Integer(), nullable=False),
+    sa.Column('score_against', sa.Integer(), nullable=False),
+    sa.Column('score_diff', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['participant_id'], ['participants.id'], ),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+    sa.PrimaryKeyConstraint('tournament_id', 'participant_id')
+    )
+    with op.batch_alter_table('standings', schema=None) as batch_op:
+        batch_op.create_index('ix_standings_table', ['tournament_id', 'points', 'score_diff'], unique=False)
+
+    # Every existing match is an ordinary (main bracket) match
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bracket', sa.Enum(*MATCH_BRACKETS, name='matchbracket'), server_default='MAIN', nullable=False))
+        batch_op.add_column(sa.Column('overdue', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.add_column(sa.Column('next_match_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('next_match_slot', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('loser_next_match_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('loser_next_match_slot', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_matches_status_overdue_scheduled_at', ['status', 'overdue', 'scheduled_at'], unique=False)
+        batch_op.create_foreign_key('fk_matches_loser_next_match_id', 'matches', ['loser_next_match_id'], ['id'])
+        batch_op.create_foreign_key('fk_matches_next_match_id', 'matches', ['next_match_id'], ['id'])
+
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.alter_column('bracket',
+               existing_type=sa.Enum(*MATCH_BRACKETS, name='matchbracket'),
+               server_default=None,
+               existing_nullable=False)
+
+    with op.batch_alter_table('participants', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_participants_tournament_user', ['tournament_id', 'user_id'])
+
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rounds', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('participant_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+        if not postgresql:
+            # A non-native enum is a VARCHAR as long as the longest value
+            batch_op.alter_column('status',
+                   existing_type=sa.VARCHAR(length=11),
+                   type_=sa.Enum(*TOURNAMENT_STATUSES, name='tournamentstatus'),
+                   existing_nullable=True)
+        batch_op.create_index('ix_tournaments_format_start_date_id', ['format', 'start_date', 'id'], unique=False)
+        batch_op.create_index('ix_tournaments_game_start_date_id', ['game', 'start_date', 'id'], unique=False)
+        batch_op.create_index('ix_tournaments_start_date_id', ['start_date', 'id'], unique=False)
+        batch_op.create_index('ix_tournaments_status_registration_deadline', ['status', 'registration_deadline'], unique=False)
+        batch_op.create_index('ix_tournaments_status_start_date_id', ['status', 'start_date', 'id'], unique=False)
+
+    op.execute(
+        "UPDATE tournaments SET participant_count = "
+        "(SELECT count(*) FROM participants WHERE participants.tournament_id = tournaments.id)"
+    )
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    PostgreSQL cannot drop an enum value: tournamentstatus and
+    tournamentformat keep REGISTRATION_CLOSED and SWISS.
+    """
+    postgresql = op.get_bind().dialect.name == "postgresql"
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.drop_index('ix_tournaments_status_start_date_id')
+        batch_op.drop_index('ix_tournaments_status_registration_deadline')
+        batch_op.drop_index('ix_tournaments_start_date_id')
+        batch_op.drop_index('ix_tournaments_game_start_date_id')
+        batch_op.drop_index('ix_tournaments_format_start_date_id')
+        if not postgresql:
+            batch_op.alter_column('status',
+                   existing_type=sa.Enum(*TOURNAMENT_STATUSES, name='tournamentstatus'),
+                   type_=sa.VARCHAR(length=11),
+                   existing_nullable=True)
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
+        batch_op.drop_column('participant_count')
+        batch_op.drop_column('rounds')
+
+    with op.batch_alter_table('participants', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_participants_tournament_user', type_='unique')
+
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_matches_next_match_id', type_='foreignkey')
+        batch_op.drop_constraint('fk_matches_loser_next_match_id', type_='foreignkey')
+        batch_op.drop_index('ix_matches_status_overdue_scheduled_at')
+        batch_op.drop_column('loser_next_match_slot')
+        batch_op.drop_column('loser_next_match_id')
+        batch_op.drop_column('next_match_slot')
+        batch_op.drop_column('next_match_id')
+        batch_op.drop_column('overdue')
+        batch_op.drop_column('bracket')
+
+    with op.batch_alter_table('standings', schema=None) as batch_op:
+        batch_op.drop_index('ix_standings_table')
+
+    op.drop_table('standings')
+    op.drop_table('swiss_states')
+    with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_user_id'))
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_token_hash'))
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_id'))
+
+    op.drop_table('refresh_tokens')
+    with op.batch_alter_table('player_stats', schema=None) as batch_op:
+        batch_op.drop_index('ix_player_stats_leaderboard')
+
+    op.drop_table('player_stats')
+    op.drop_table('player_ratings')
+    with op.batch_alter_table('revoked_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_revoked_tokens_jti'))
+        batch_op.drop_index(batch_op.f('ix_revoked_tokens_id'))
+        batch_op.drop_index(batch_op.f('ix_revoked_tokens_expires_at'))
+
+    op.drop_table('revoked_tokens')
+    op.drop_table('leases')
+
+    if postgresql:
+        op.execute("DROP TYPE matchbracket")
@@ -0,0 +1,35 @@
+"""search index
+
+The full-text search index of models/search.py, filled from the existing
+tournaments and users: FTS5 tables kept in step by triggers on SQLite,
+generated tsvector columns with GIN indexes on PostgreSQL.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 17:06:40.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.models.search import drop_search_index_ddl, search_index_ddl
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in search_index_ddl(op.get_bind().dialect.name):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in drop_search_index_ddl(op.get_bind().dialect.name):
+        op.execute(statement)
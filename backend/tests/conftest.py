@@ -0,0 +1,149 @@
+"""
+Fixtures shared by the tests: the app on a migrated database, a client and
+a counter of the SQL statements the app sends.
+
+The tests run against DATABASE_URL, a temporary SQLite file by default.
+To run them against PostgreSQL, point it at an empty database:
+
+    DATABASE_URL=postgresql://localhost/tournament_test python -m pytest
+
+Settings are read when app.core.config is imported, so the environment is
+set up here, before any test module imports the app.
+"""
+
+import os
+import tempfile
+import uuid
+
+import pytest
+
+_scratch = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_scratch.name, 'test.db')}")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+
+PASSWORD = "hunter22"
+
+
+@pytest.fixture(scope="session")
+def engines():
+    """The app's sync and async engines, on a migrated database."""
+    from app.core.database import init_engines
+    from app.core.migrations import upgrade_database
+
+    # The lifespan reuses these engines, so counters see the app's queries
+    engine, async_engine = init_engines()
+    upgrade_database(engine)
+    return engine, async_engine
+
+
+@pytest.fixture
+def db(engines):
+    """A session on the app's sync engine, closed after the test."""
+    from app.core.database import SessionLocal
+
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def client(engines):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def query_counter(engines):
+    """Factory of QueryCounters over both engines; use one per counted block."""
+    from app.utils.query_counter import QueryCounter
+
+    def factory():
+        return QueryCounter(engines[0], engines[1].sync_engine)
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def register(client):
+    """Register and log in a new user; returns their auth headers."""
+
+    def register(name: str = "player") -> dict:
+        # Emails and display names are unique, and the database may be reused
+        display_name = f"{name}-{uuid.uuid4().hex[:12]}"
+        email = f"{display_name}@example.com"
+        response = client.post(
+            "/api/auth/register",
+            json={"email": email, "display_name": display_name, "password": PASSWORD},
+        )
+        response.raise_for_status()
+        token = client.post(
+            "/api/auth/login", data={"username": email, "password": PASSWORD}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        # Warm the user cache so every later request resolves the token the same way
+        client.get("/api/users/me", headers=headers)
+        return headers
+
+    return register
+
+
+@pytest.fixture(scope="session")
+def create_tournament(client):
+    """Create a tournament through the API and move it to `status`; returns its id."""
+
+    def create(headers: dict, status: str = "open", **fields) -> int:
+        body = {
+            "name": "Cup",
+            "game": "Chess",
+            "max_participants": 16,
+            "registration_deadline": "2030-01-01T00:00:00Z",
+            "start_date": "2030-01-02T00:00:00Z",
+            **fields,
+        }
+        response = client.post("/api/tournaments/", json=body, headers=headers)
+        assert response.status_code == 201, response.text
+        tournament_id = response.json()["id"]
+        if status != "draft":
+            response = client.put(
+                f"/api/tournaments/{tournament_id}", json={"status": status}, headers=headers
+            )
+            assert response.status_code == 200, response.text
+        return tournament_id
+
+    return create
+
+
+@pytest.fixture(scope="session")
+def make_users(engines):
+    """Bulk-insert `count` users, skipping password hashing; returns their auth headers."""
+    from sqlalchemy import insert
+
+    from app.core.database import SessionLocal
+    from app.models import User
+    from app.utils.security import create_access_token
+
+    def make_users(count: int) -> list:
+        tag = uuid.uuid4().hex[:12]
+        with SessionLocal() as db:
+            user_ids = db.scalars(
+                insert(User).returning(User.id),
+                [
+                    {
+                        "email": f"user-{tag}-{i}@example.com",
+                        "password_hash": "x",
+                        "display_name": f"user-{tag}-{i}",
+                    }
+                    for i in range(count)
+                ],
+            ).all()
+            db.commit()
+        return [
+            {"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id)})}"}
+            for user_id in user_ids
+        ]
+
+    return make_users
@@ -0,0 +1,44 @@
+"""Tournament ETags must change whenever the responses they validate do."""
+
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def started(client, register, create_tournament):
+    """A started four-player tournament: (organizer headers, player headers, id)."""
+    organizer = register("organizer")
+    players = [register(f"player{i}") for i in range(4)]
+    tournament_id = create_tournament(organizer, max_participants=4)
+    for headers in players:
+        assert client.post(f"/api/tournaments/{tournament_id}/join", headers=headers).status_code == 201
+    response = client.post(f"/api/tournaments/{tournament_id}/start", headers=organizer)
+    assert response.status_code == 200, response.text
+    return organizer, players, tournament_id
+
+
+@pytest.mark.parametrize("view", ["participants", "matches"])
+def test_rename_changes_etag(client, started, view):
+    _, players, tournament_id = started
+    url = f"/api/tournaments/{tournament_id}/{view}"
+    etag = client.get(url).headers["etag"]
+
+    client.put("/api/users/me", json={"bio": "Plays the Sicilian"}, headers=players[0])
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    name = f"Renamed {uuid.uuid4().hex[:12]}"
+    client.put("/api/users/me", json={"display_name": name}, headers=players[0])
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert name in response.text
+
+
+def test_rename_refreshes_cached_bracket(client, started):
+    _, players, tournament_id = started
+    url = f"/api/tournaments/{tournament_id}/bracket"
+    name = f"Renamed {uuid.uuid4().hex[:12]}"
+    assert name not in client.get(url).text
+
+    client.put("/api/users/me", json={"display_name": name}, headers=players[1])
+    assert name in client.get(url).text
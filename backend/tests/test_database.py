@@ -0,0 +1,71 @@
+"""Engines built from settings (core/database.py)."""
+
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import insert, select, text, update
+
+WRITERS = 16
+WRITES = 25
+
+
+def test_sqlite_connections_are_tuned(engines):
+    from app.core.config import settings
+
+    engine = engines[0]
+    if engine.dialect.name != "sqlite":
+        pytest.skip("SQLite pragmas only")
+    with engine.connect() as conn:
+        assert conn.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert conn.scalar(text("PRAGMA busy_timeout")) == settings.sqlite_busy_timeout_ms
+
+
+def test_concurrent_writes_all_commit(engines, db, register, create_tournament):
+    """A check-in rush: writers queue for the lock instead of failing."""
+    from app.models import Participant, User
+
+    tournament_id = create_tournament(register("organizer"), max_participants=WRITERS)
+    tag = uuid.uuid4().hex[:12]
+    user_ids = db.scalars(
+        insert(User).returning(User.id),
+        [
+            {
+                "email": f"writer-{tag}-{i}@example.com",
+                "password_hash": "x",
+                "display_name": f"writer-{tag}-{i}",
+            }
+            for i in range(WRITERS)
+        ],
+    ).all()
+    participant_ids = db.scalars(
+        insert(Participant).returning(Participant.id),
+        [{"tournament_id": tournament_id, "user_id": user_id} for user_id in user_ids],
+    ).all()
+    db.commit()
+
+    failures = []
+
+    def check_in(participant_id: int):
+        for seed in range(1, WRITES + 1):
+            try:
+                with engines[0].begin() as conn:
+                    conn.execute(
+                        update(Participant)
+                        .where(Participant.id == participant_id)
+                        .values(checked_in=True, seed=seed)
+                    )
+            except Exception as exc:
+                failures.append(exc)
+
+    threads = [threading.Thread(target=check_in, args=(pid,)) for pid in participant_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert failures == []
+    seeds = db.scalars(
+        select(Participant.seed).where(Participant.tournament_id == tournament_id)
+    ).all()
+    assert seeds == [WRITES] * WRITERS
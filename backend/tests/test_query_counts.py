@@ -0,0 +1,96 @@
+"""
+Endpoints that embed related names must issue a fixed number of queries
+however large the tournament is: a count that grows with the size means an
+N+1 lazy load crept in.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import insert, select
+
+SIZES = (8, 64)
+
+ENDPOINTS = (
+    "GET /tournaments",
+    "GET /tournaments/{id}/participants",
+    "GET /tournaments/{id}/matches",
+    "GET /tournaments/{id}/bracket",
+    "GET /matches/{id}",
+    "PUT /matches/{id}",
+)
+
+
+def add_players(tournament_id: int, size: int) -> None:
+    """Bulk-insert `size` users and enter them all in the tournament."""
+    from app.core.database import SessionLocal
+    from app.models import Participant, User
+
+    tag = uuid.uuid4().hex[:12]
+    with SessionLocal() as db:
+        db.execute(
+            insert(User),
+            [
+                {
+                    "email": f"player-{tag}-{i}@example.com",
+                    "password_hash": "x",
+                    "display_name": f"Player {i}",
+                }
+                for i in range(size)
+            ],
+        )
+        user_ids = db.scalars(
+            select(User.id).where(User.email.like(f"player-{tag}-%"))
+        ).all()
+        db.execute(
+            insert(Participant),
+            [{"tournament_id": tournament_id, "user_id": user_id} for user_id in user_ids],
+        )
+        db.commit()
+
+
+def measure(client, headers, query_counter, tournament_id: int) -> dict:
+    counts = {}
+
+    def count(label, method, url, **kwargs):
+        with query_counter() as counter:
+            response = client.request(method, url, headers=headers, **kwargs)
+        assert response.status_code < 400, (label, response.status_code, response.text)
+        counts[label] = counter.count
+        return response
+
+    base = f"/api/tournaments/{tournament_id}"
+    count("GET /tournaments", "GET", "/api/tournaments/?limit=100")
+    count("GET /tournaments/{id}/participants", "GET", f"{base}/participants")
+    matches = count("GET /tournaments/{id}/matches", "GET", f"{base}/matches").json()
+    count("GET /tournaments/{id}/bracket", "GET", f"{base}/bracket")
+
+    match = next(m for m in matches if m["player1_id"] and m["player2_id"])
+    count("GET /matches/{id}", "GET", f"/api/matches/{match['id']}")
+    count(
+        "PUT /matches/{id}",
+        "PUT",
+        f"/api/matches/{match['id']}",
+        json={"status": "completed", "winner_id": match["player1_id"]},
+    )
+    return counts
+
+
+@pytest.fixture(scope="module")
+def counts(client, query_counter, register, create_tournament):
+    """Query counts of every endpoint, for a started tournament of each size."""
+    headers = register("organizer")
+    results = {}
+    for size in SIZES:
+        tournament_id = create_tournament(headers, max_participants=size)
+        add_players(tournament_id, size)
+        response = client.post(f"/api/tournaments/{tournament_id}/start", headers=headers)
+        assert response.status_code == 200, response.text
+        results[size] = measure(client, headers, query_counter, tournament_id)
+    return results
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_query_count_does_not_grow_with_tournament(counts, endpoint):
+    small, large = (counts[size][endpoint] for size in SIZES)
+    assert small == large, f"{endpoint}: {small} queries at {SIZES[0]}, {large} at {SIZES[1]}"
@@ -0,0 +1,51 @@
+"""Joining and leaving tournaments (services/registration.py)."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+
+
+def test_concurrent_joins_never_overfill(client, register, make_users, create_tournament):
+    from app.core.database import SessionLocal
+    from app.models import Participant, Tournament
+
+    capacity = 4
+    tournament_id = create_tournament(register("organizer"), max_participants=capacity)
+    players = make_users(capacity * 4)
+
+    # The join endpoint is synchronous, so the app runs these in parallel threads
+    def join(headers):
+        return client.post(f"/api/tournaments/{tournament_id}/join", headers=headers)
+
+    with ThreadPoolExecutor(max_workers=len(players)) as pool:
+        responses = list(pool.map(join, players))
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [201] * capacity + [400] * (len(players) - capacity)
+    assert all(
+        response.json()["detail"] == "Tournament is full"
+        for response in responses
+        if response.status_code == 400
+    )
+
+    with SessionLocal() as db:
+        rows = db.scalar(
+            select(func.count())
+            .select_from(Participant)
+            .where(Participant.tournament_id == tournament_id)
+        )
+        tournament = db.get(Tournament, tournament_id)
+        assert rows == tournament.participant_count == tournament.max_participants
+
+
+def test_cannot_leave_started_tournament(client, register, create_tournament):
+    organizer = register("organizer")
+    players = [register(f"player{i}") for i in range(2)]
+    tournament_id = create_tournament(organizer, max_participants=2)
+    for headers in players:
+        client.post(f"/api/tournaments/{tournament_id}/join", headers=headers)
+    client.post(f"/api/tournaments/{tournament_id}/start", headers=organizer)
+
+    response = client.delete(f"/api/tournaments/{tournament_id}/leave", headers=players[0])
+    assert response.status_code == 400
+    assert client.get(f"/api/tournaments/{tournament_id}/bracket").status_code == 200
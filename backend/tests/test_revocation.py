@@ -0,0 +1,57 @@
+"""Access-token revocation across workers (utils/revocation.py)."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from jose import jwt
+
+
+def revoke_elsewhere(db, headers: dict) -> None:
+    """Revoke the token the way another worker's logout does: a row, not this store."""
+    from app.models.token import RevokedToken
+
+    token = headers["Authorization"].removeprefix("Bearer ")
+    db.add(
+        RevokedToken(
+            jti=jwt.get_unverified_claims(token)["jti"],
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+    )
+    db.commit()
+
+
+def test_refresh_picks_up_other_workers_revocations(client, db, make_users):
+    from app.utils.deps import revocation_store
+    from app.utils.revocation import refresh_revocations
+
+    headers = make_users(1)[0]
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+
+    revoke_elsewhere(db, headers)
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+
+    assert refresh_revocations(db, revocation_store) >= 1
+    assert client.get("/api/users/me", headers=headers).status_code == 401
+
+
+def test_refresh_rereads_ids_committed_out_of_order(db):
+    from app.models.token import RevokedToken
+    from app.utils.revocation import RevocationStore, refresh_revocations
+
+    store = RevocationStore(capacity=16)
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    late, early = (RevokedToken(jti=uuid.uuid4().hex, expires_at=expires) for _ in range(2))
+    db.add_all([late, early])
+    db.flush()
+    # `late` got the lower id but its row only appears after `early` was read
+    late_row = {"jti": late.jti, "expires_at": expires}
+    db.delete(late)
+    db.commit()
+
+    refresh_revocations(db, store)
+    assert store.is_revoked(early.jti)
+    db.add(RevokedToken(id=late.id, **late_row))
+    db.commit()
+
+    refresh_revocations(db, store)
+    assert store.is_revoked(late.jti)